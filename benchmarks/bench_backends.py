@@ -0,0 +1,149 @@
+"""Benchmark of the character_stats statements on SQLite and DuckDB.
+
+Generates a synthetic roster, loads it into a SQLite database with the
+application schema, a DuckDB file and a Parquet file, then times every
+statement on SQLite, the DuckDB file and an in-memory DuckDB loaded from
+the Parquet file. Requires the duckdb extra.
+
+Usage:
+    python -m benchmarks.bench_backends [--rows N] [--repeat N] [--workdir DIR]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Engine, create_engine
+
+from hsrws.db.backends import _fact_tables_sql, create_duckdb_engine
+from hsrws.db.dimensions import refresh_dimensions
+from hsrws.db.migrations import migrate
+from hsrws.db.pragmas import install_sqlite_pragmas
+from hsrws.db.queries import character_stats
+
+BUILDERS = [
+    getattr(character_stats, name)
+    for name in sorted(dir(character_stats))
+    if name.startswith("get_") and name.endswith("_stmt")
+]
+
+PATHS = ["Destruction", "Hunt", "Erudition", "Harmony", "Nihility", "Preservation"]
+ELEMENTS = ["Physical", "Fire", "Ice", "Lightning", "Wind", "Quantum", "Imaginary"]
+
+INSERT_CHUNK_SIZE = 100_000
+
+
+def synthetic_roster(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Generate characters with random dimensions, stats and versions."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "Character": [f"Character {i}" for i in range(rows)],
+            "Path": np.array(PATHS)[rng.integers(0, len(PATHS), rows)],
+            "Element": np.array(ELEMENTS)[rng.integers(0, len(ELEMENTS), rows)],
+            "Rarity": rng.integers(4, 6, rows),
+            "ATK Lvl 80": rng.integers(400, 800, rows),
+            "DEF Lvl 80": rng.integers(300, 700, rows),
+            "HP Lvl 80": rng.integers(800, 1600, rows),
+            "SPD Lvl 80": rng.integers(90, 115, rows),
+            "Version": rng.integers(10, 40, rows) / 10,
+        }
+    )
+
+
+def load_sqlite(roster: pd.DataFrame, path: Path) -> Engine:
+    """Bulk-insert the roster into a SQLite database with the application schema.
+
+    The fact and dimension tables are filled in the same transaction, like a load.
+    """
+    engine = create_engine(f"sqlite:///{path}")
+    install_sqlite_pragmas(engine)
+    migrate(engine)
+    columns = ", ".join(f'"{column}"' for column in roster.columns)
+    placeholders = ", ".join("?" for _ in roster.columns)
+    with engine.begin() as conn:
+        cursor = conn.connection.driver_connection.cursor()
+        for start in range(0, len(roster), INSERT_CHUNK_SIZE):
+            chunk = roster.iloc[start : start + INSERT_CHUNK_SIZE]
+            cursor.executemany(
+                f'INSERT INTO "HsrCharacters" ({columns}) VALUES ({placeholders})',
+                chunk.itertuples(index=False, name=None),
+            )
+        refresh_dimensions(conn)
+    return engine
+
+
+def load_duckdb(roster: pd.DataFrame, path: Path, parquet_path: Path) -> Engine:
+    """Load the roster and its fact tables into a DuckDB file, export it to Parquet."""
+    engine = create_duckdb_engine(str(path))
+    with engine.begin() as conn:
+        duckdb_conn = conn.connection.driver_connection
+        duckdb_conn.register("roster", roster)
+        duckdb_conn.execute(
+            'CREATE OR REPLACE TABLE "HsrCharacters" AS SELECT * FROM roster'
+        )
+        duckdb_conn.unregister("roster")
+        for sql in _fact_tables_sql(engine.dialect):
+            duckdb_conn.execute(sql)
+        duckdb_conn.execute(
+            f"COPY \"HsrCharacters\" TO '{parquet_path}' (FORMAT parquet)"
+        )
+    return engine
+
+
+def time_statement(engine: Engine, stmt, repeat: int) -> float:
+    """Median seconds to execute a statement and fetch every row."""
+    timings = []
+    with engine.connect() as conn:
+        conn.execute(stmt).all()  # Warm up
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(stmt).all()
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workdir", type=Path)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.workdir) as workdir:
+        roster = synthetic_roster(args.rows)
+        start = time.perf_counter()
+        sqlite_engine = load_sqlite(roster, Path(workdir) / "hsr.db")
+        print(f"SQLite load: {time.perf_counter() - start:.1f} s")
+        start = time.perf_counter()
+        parquet_path = Path(workdir) / "characters.parquet"
+        duckdb_engine = load_duckdb(roster, Path(workdir) / "hsr.duckdb", parquet_path)
+        print(f"DuckDB load: {time.perf_counter() - start:.1f} s")
+        del roster
+        parquet_engine = create_duckdb_engine(parquet_path=str(parquet_path))
+
+        engines = {
+            "sqlite": sqlite_engine,
+            "duckdb": duckdb_engine,
+            "duckdb parquet": parquet_engine,
+        }
+        print(f"\n{args.rows:,} rows, median of {args.repeat} runs (ms)")
+        print(f"{'statement':<40}" + "".join(f"{name:>16}" for name in engines))
+        for builder in BUILDERS:
+            stmt = builder()
+            timings = [
+                time_statement(engine, stmt, args.repeat) for engine in engines.values()
+            ]
+            name = builder.__name__.removeprefix("get_").removesuffix("_stmt")
+            print(f"{name:<40}" + "".join(f"{t * 1e3:16.1f}" for t in timings))
+
+        for engine in engines.values():
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Micro-benchmark of building and compiling the character_stats statements.
+
+Compares rebuilding and compiling every statement on each call with the
+memoized builders, whose constructs and compiled cache keys are reused
+across filter values.
+
+Usage:
+    python -m benchmarks.bench_statements [--number N]
+"""
+
+import argparse
+import timeit
+
+from sqlalchemy.dialects import sqlite
+
+from hsrws.db.queries import CharacterFilter, character_stats, clear_statement_caches
+from hsrws.db.result_cache import statement_cache_key
+
+BUILDERS = [
+    getattr(character_stats, name)
+    for name in dir(character_stats)
+    if name.startswith("get_") and name.endswith("_stmt")
+]
+
+FILTERS = [
+    None,
+    CharacterFilter(min_version=1.0, max_version=2.0, element="Fire"),
+    CharacterFilter(min_version=1.2, max_version=3.0, element="Ice"),
+]
+
+
+def build_and_compile(dialect) -> None:
+    """Build and compile every statement without memoization."""
+    for builder in BUILDERS:
+        for filters in FILTERS:
+            clear_statement_caches()
+            builder(filters).compile(dialect=dialect)
+
+
+def memoized(dialect) -> None:
+    """Get every statement and its compiled key from the memoized builders."""
+    for builder in BUILDERS:
+        for filters in FILTERS:
+            statement_cache_key(builder(filters), dialect)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    dialect = sqlite.dialect()
+    statements = len(BUILDERS) * len(FILTERS)
+    for label, func in [
+        ("build + compile", build_and_compile),
+        ("memoized", memoized),
+    ]:
+        func(dialect)  # Warm up
+        seconds = timeit.timeit(lambda func=func: func(dialect), number=args.number)
+        per_stmt = seconds / (args.number * statements) * 1e6
+        print(f"{label:>16}: {per_stmt:8.2f} us per statement")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Entry point for ``python -m hsrws``."""
+
+import sys
+
+from hsrws.cli import main
+
+sys.exit(main())
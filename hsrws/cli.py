@@ -0,0 +1,114 @@
+"""Command line interface for maintenance tasks."""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+
+from hsrws.core.reprocess import reprocess_dead_letters
+from hsrws.db.backends import copy_to_duckdb, create_duckdb_engine
+from hsrws.db.database import get_engine
+from hsrws.db.diff import diff_snapshots
+from hsrws.db.export import get_export_dir, pyarrow_available, write_character_export
+from hsrws.db.history import parse_run_reference
+from hsrws.db.migrations import get_schema_version
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Builds the argument parser of the command line interface.
+
+    Returns:
+        Configured argument parser.
+    """
+    parser = argparse.ArgumentParser(prog="python -m hsrws")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    reprocess = subparsers.add_parser(
+        "reprocess", help="Re-run extraction on stored dead letters."
+    )
+    reprocess.add_argument("--run-id", help="Only reprocess entries of this run.")
+
+    subparsers.add_parser("migrate", help="Upgrade the database to the latest schema.")
+
+    diff = subparsers.add_parser(
+        "diff", help="Compare the characters of two recorded runs."
+    )
+    diff.add_argument(
+        "old",
+        nargs="?",
+        type=parse_run_reference,
+        help="Run number, run id or patch version, defaults to the previous run.",
+    )
+    diff.add_argument(
+        "new",
+        nargs="?",
+        type=parse_run_reference,
+        help="Run number, run id or patch version, defaults to the latest run.",
+    )
+
+    export = subparsers.add_parser(
+        "export", help="Write the character table to Parquet and Arrow files."
+    )
+    export.add_argument(
+        "--dir", help="Directory of the files, defaults to the export directory."
+    )
+
+    export_duckdb = subparsers.add_parser(
+        "export-duckdb", help="Copy the tables read by queries to a DuckDB file."
+    )
+    export_duckdb.add_argument("path", help="DuckDB database file to write.")
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Runs the command line interface.
+
+    Args:
+        argv: Command line arguments, defaults to sys.argv.
+
+    Returns:
+        Process exit code.
+    """
+    args = build_parser().parse_args(argv)
+
+    if args.command == "reprocess":
+        print(json.dumps(reprocess_dead_letters(args.run_id)))
+    elif args.command == "migrate":
+        # Creating the engine applies the pending migrations.
+        with get_engine().connect() as conn:
+            print(json.dumps({"schema_version": get_schema_version(conn)}))
+    elif args.command == "diff":
+        try:
+            diff = diff_snapshots(args.old, args.new)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+        print(json.dumps(diff.to_dict()))
+    elif args.command == "export":
+        directory = Path(args.dir) if args.dir else get_export_dir()
+        if directory is None or not pyarrow_available():
+            print(
+                "The export requires pyarrow and a directory: pass --dir or set "
+                "HSR_EXPORT_DIR",
+                file=sys.stderr,
+            )
+            return 1
+        with get_engine().connect() as conn:
+            export = write_character_export(conn, directory)
+        print(json.dumps(export._asdict(), default=str))
+    elif args.command == "export-duckdb":
+        try:
+            target = create_duckdb_engine(args.path)
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            return 1
+        try:
+            print(json.dumps(copy_to_duckdb(get_engine(), target)))
+        finally:
+            target.dispose()
+
+    return 0
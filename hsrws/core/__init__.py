@@ -1,6 +1,13 @@
 """Core functionality for HSR web scraper."""
 
+from hsrws.core.records import CharacterRecord, validate_character_page
 from hsrws.core.scraper import Scraper
 from hsrws.utils.payload import get_headers, get_payload
 
-__all__ = ["Scraper", "get_headers", "get_payload"]
+__all__ = [
+    "CharacterRecord",
+    "Scraper",
+    "get_headers",
+    "get_payload",
+    "validate_character_page",
+]
@@ -0,0 +1,338 @@
+"""Typed character records and bulk validation of scraped pages."""
+
+import json
+from collections import Counter
+from typing import Any, NamedTuple, Optional
+
+import pandas as pd
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
+from pydantic import field_validator
+
+STAT_FIELDS: dict[str, str] = {
+    "ATK Lvl 80": "base_atk",
+    "DEF Lvl 80": "base_def",
+    "HP Lvl 80": "base_hp",
+    "SPD Lvl 80": "base_speed",
+}
+
+TYPE_FIELDS: dict[str, str] = {
+    "Path": "character_paths",
+    "Element": "character_combat_type",
+    "Rarity": "character_rarity",
+}
+
+# Values substituted for categorical fields that fail validation. Any other
+# invalid field rejects the whole entry to the dead-letter store.
+FIELD_FALLBACKS: dict[str, Any] = {column: "Unknown" for column in TYPE_FIELDS}
+
+
+class CharacterRecord(BaseModel):
+    """
+    Validated character record, keyed by the DataFrame column names.
+
+    Attributes:
+        character: Character name.
+        path: Character's path without the 'The ' prefix.
+        element: Character's element.
+        rarity: Character's rarity without the '-Star' suffix.
+        atk_lvl_80: Base ATK at level 80, None if not published yet.
+        def_lvl_80: Base DEF at level 80, None if not published yet.
+        hp_lvl_80: Base HP at level 80, None if not published yet.
+        spd_lvl_80: Base SPD at level 80, None if not published yet.
+    """
+
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
+
+    character: str = Field(alias="Character", min_length=1)
+    path: str = Field("Unknown", alias="Path")
+    element: str = Field("Unknown", alias="Element")
+    rarity: str = Field("Unknown", alias="Rarity")
+    atk_lvl_80: Optional[int] = Field(None, alias="ATK Lvl 80", ge=0)
+    def_lvl_80: Optional[int] = Field(None, alias="DEF Lvl 80", ge=0)
+    hp_lvl_80: Optional[int] = Field(None, alias="HP Lvl 80", ge=0)
+    spd_lvl_80: Optional[int] = Field(None, alias="SPD Lvl 80", ge=0)
+
+    @field_validator("path", mode="before")
+    @classmethod
+    def _strip_path_prefix(cls, value: Any) -> Any:
+        if isinstance(value, str) and value.startswith("The "):
+            return value[4:]
+        return value
+
+    @field_validator("rarity", mode="before")
+    @classmethod
+    def _strip_rarity_suffix(cls, value: Any) -> Any:
+        if isinstance(value, int):
+            return str(value)
+        if isinstance(value, str) and value.endswith("-Star"):
+            return value.split("-")[0]
+        return value
+
+
+CHARACTER_PAGE_ADAPTER: TypeAdapter[list[CharacterRecord]] = TypeAdapter(
+    list[CharacterRecord]
+)
+
+
+class MalformedEntryError(ValueError):
+    """
+    Raised when a raw character entry does not have the API structure.
+
+    Attributes:
+        field: Path of the offending field, such as 'display_field'.
+        error_type: Kind of error, counted alongside the validation errors.
+    """
+
+    def __init__(self, field: str, error_type: str, message: str) -> None:
+        super().__init__(message)
+        self.field = field
+        self.error_type = error_type
+
+
+class RejectedEntry(NamedTuple):
+    """
+    Raw character entry that failed extraction, with the reason.
+
+    Attributes:
+        entry: Raw character entry.
+        reason: Why the entry was rejected.
+        key: Key given for the entry to validate_character_page, such as its
+            dead-letter row id, None if no keys were given.
+    """
+
+    entry: Any
+    reason: str
+    key: Any = None
+
+
+class PageValidation(NamedTuple):
+    """Outcome of validating a page of raw character entries."""
+
+    records: list[CharacterRecord]
+    error_counts: Counter[tuple[str, str]]
+    rejected: list[RejectedEntry]
+
+
+def flatten_character_entry(character_data: dict[str, Any]) -> dict[str, Any]:
+    """
+    Flattens a raw API character entry into CharacterRecord fields.
+
+    Absent values are left out so that validation reports them as missing.
+
+    Args:
+        character_data: Dictionary that represents each character data.
+
+    Returns:
+        Dictionary keyed by the CharacterRecord aliases.
+
+    Raises:
+        MalformedEntryError: If a nested field does not have the expected
+            type, or the level 80 stats are not a valid JSON object.
+    """
+    flattened: dict[str, Any] = {}
+    if "name" in character_data:
+        flattened["Character"] = character_data["name"]
+
+    filter_values = _nested(character_data, "filter_values", dict)
+    for column, key in TYPE_FIELDS.items():
+        type_field = _nested(filter_values, key, dict, "filter_values")
+        values = _nested(type_field, "values", list, f"filter_values.{key}")
+        if values:
+            flattened[column] = values[0]
+
+    display_field = _nested(character_data, "display_field", dict)
+    stats_json = display_field.get("attr_level_80")
+    stats = _parse_stats(stats_json) if stats_json else {}
+    for column, key in STAT_FIELDS.items():
+        if key in stats:
+            flattened[column] = stats[key]
+
+    return flattened
+
+
+def _nested(
+    parent: dict[str, Any], key: str, expected: type, prefix: Optional[str] = None
+) -> Any:
+    """
+    Gets a nested field of a raw entry, checking its type.
+
+    Args:
+        parent: Dictionary holding the field.
+        key: Name of the field.
+        expected: Expected type, dict or list.
+        prefix: Path of the parent, used in the error field.
+
+    Returns:
+        The field value, or an empty value of the expected type if it is
+        absent or null.
+
+    Raises:
+        MalformedEntryError: If the field has another type.
+    """
+    value = parent.get(key)
+    if value is None:
+        return expected()
+    if not isinstance(value, expected):
+        field = f"{prefix}.{key}" if prefix else key
+        raise MalformedEntryError(
+            field,
+            f"{expected.__name__}_type",
+            f"expected {expected.__name__}, got {type(value).__name__}",
+        )
+    return value
+
+
+def _parse_stats(stats_json: Any) -> dict[str, Any]:
+    """
+    Parses the level 80 stats JSON string of a character entry.
+
+    Args:
+        stats_json: JSON string, or an already decoded dictionary.
+
+    Returns:
+        Dictionary of stats.
+
+    Raises:
+        MalformedEntryError: If the value is not a JSON object.
+    """
+    if isinstance(stats_json, dict):
+        return stats_json
+    if not isinstance(stats_json, str):
+        raise MalformedEntryError(
+            "attr_level_80",
+            "string_type",
+            f"expected a JSON string, got {type(stats_json).__name__}",
+        )
+    try:
+        stats = json.loads(stats_json)
+    except ValueError as e:
+        raise MalformedEntryError("attr_level_80", "json_invalid", str(e)) from e
+    if not isinstance(stats, dict):
+        raise MalformedEntryError(
+            "attr_level_80",
+            "dict_type",
+            f"expected a JSON object, got {type(stats).__name__}",
+        )
+    return stats
+
+
+def validate_character_page(
+    char_list: list[Any], keys: Optional[list[Any]] = None
+) -> PageValidation:
+    """
+    Validates a page of raw character entries in a single adapter call.
+
+    Invalid categorical fields are replaced by their fallback value. Entries
+    with any other invalid field, such as a missing name or malformed stats,
+    are rejected with a reason instead of aborting the page. Every error is
+    counted by (field, error type) instead of being logged one by one.
+
+    Args:
+        char_list: List of raw character entries.
+        keys: Key of each entry, carried by its RejectedEntry if it is
+            rejected. Defaults to None for every entry.
+
+    Returns:
+        Validated records, per-field error counts and rejected entries.
+    """
+    if keys is None:
+        keys = [None] * len(char_list)
+    entries: list[tuple[Any, dict[str, Any]]] = []
+    flattened: list[dict[str, Any]] = []
+    error_counts: Counter[tuple[str, str]] = Counter()
+    rejected: list[RejectedEntry] = []
+    for key, entry in zip(keys, char_list, strict=True):
+        if not isinstance(entry, dict):
+            error_counts[("entry", "dict_type")] += 1
+            rejected.append(RejectedEntry(entry, "entry: not a JSON object", key))
+            continue
+        try:
+            flattened.append(flatten_character_entry(entry))
+        except MalformedEntryError as e:
+            error_counts[(e.field, e.error_type)] += 1
+            rejected.append(RejectedEntry(entry, f"{e.field}: {e}", key))
+            continue
+        entries.append((key, entry))
+
+    try:
+        records = CHARACTER_PAGE_ADAPTER.validate_python(flattened)
+    except ValidationError as exc:
+        return _repair_page(entries, flattened, exc, error_counts, rejected)
+    return PageValidation(records, error_counts, rejected)
+
+
+def _repair_page(
+    entries: list[tuple[Any, dict[str, Any]]],
+    flattened: list[dict[str, Any]],
+    exc: ValidationError,
+    error_counts: Counter[tuple[str, str]],
+    rejected: list[RejectedEntry],
+) -> PageValidation:
+    """
+    Applies fallbacks or rejects the entries a page validation error refers to.
+
+    Args:
+        entries: Keys and raw entries that were flattened.
+        flattened: Flattened entries of the page.
+        exc: Validation error raised for the page.
+        error_counts: Error counts collected so far.
+        rejected: Entries rejected so far.
+
+    Returns:
+        Validated records, per-field error counts and rejected entries.
+    """
+    invalid_fields: dict[int, dict[str, str]] = {}
+    for error in exc.errors(include_url=False, include_input=False):
+        index, field = int(error["loc"][0]), str(error["loc"][1])
+        error_counts[(field, error["type"])] += 1
+        invalid_fields.setdefault(index, {})[field] = error["msg"]
+
+    records: list[CharacterRecord] = []
+    for index, fields in enumerate(flattened):
+        invalid = invalid_fields.get(index)
+        if invalid is None:
+            records.append(CharacterRecord.model_validate(fields))
+        elif invalid.keys() <= FIELD_FALLBACKS.keys():
+            records.append(
+                CharacterRecord.model_validate(
+                    {**fields, **{field: FIELD_FALLBACKS[field] for field in invalid}}
+                )
+            )
+        else:
+            reason = "; ".join(f"{field}: {msg}" for field, msg in invalid.items())
+            key, entry = entries[index]
+            rejected.append(RejectedEntry(entry, reason, key))
+    return PageValidation(records, error_counts, rejected)
+
+
+def records_to_dataframe(records: list[CharacterRecord]) -> pd.DataFrame:
+    """
+    Converts validated records to a character DataFrame.
+
+    Args:
+        records: Validated character records.
+
+    Returns:
+        DataFrame with one column per CharacterRecord alias.
+    """
+    columns = [field.alias for field in CharacterRecord.model_fields.values()]
+    return pd.DataFrame(
+        [record.model_dump(by_alias=True) for record in records], columns=columns
+    )
+
+
+def format_error_summary(error_counts: Counter[tuple[str, str]]) -> str:
+    """
+    Formats per-field error counts as a single log line.
+
+    Args:
+        error_counts: Error counts keyed by (field, error type).
+
+    Returns:
+        Summary string.
+    """
+    details = ", ".join(
+        f"{field} [{error_type}]: {count}"
+        for (field, error_type), count in error_counts.most_common()
+    )
+    return f"{error_counts.total()} invalid fields ({details})"
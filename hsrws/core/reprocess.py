@@ -0,0 +1,53 @@
+"""Reprocessing of dead-lettered character entries."""
+
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import Engine
+
+from hsrws.core.records import records_to_dataframe, validate_character_page
+from hsrws.data.transformer import transform_character_data
+from hsrws.db.dead_letters import fetch_dead_letters, resolve_dead_letters
+from hsrws.db.sqlite import load_to_sqlite
+
+
+def reprocess_dead_letters(
+    run_id: Optional[str] = None, engine: Optional[Engine] = None
+) -> dict[str, int]:
+    """
+    Re-runs extraction on stored dead letters without a network scrape.
+
+    Entries that now validate are transformed, upserted into the character
+    table and removed from the store. The rest keep their row with an
+    updated reason.
+
+    Args:
+        run_id: Only reprocess entries of this run, all runs if None.
+        engine: SQLAlchemy engine, defaults to the application engine.
+
+    Returns:
+        Dictionary with the number of recovered and remaining entries.
+    """
+    dead_letters = fetch_dead_letters(run_id, engine)
+    if not dead_letters:
+        logger.info("No dead letters to reprocess.")
+        return {"recovered": 0, "remaining": 0}
+
+    row_ids, entries = zip(*dead_letters)
+    records, _, rejected = validate_character_page(list(entries), keys=list(row_ids))
+    failed = [(row_id, reason) for _, reason, row_id in rejected]
+    failed_ids = {row_id for row_id, _ in failed}
+    resolved_ids = [row_id for row_id, _ in dead_letters if row_id not in failed_ids]
+
+    if records:
+        load_to_sqlite(
+            transform_character_data(records_to_dataframe(records)),
+            prune=False,
+            engine=engine,
+        )
+    resolve_dead_letters(resolved_ids, failed, engine)
+
+    logger.info(
+        f"Reprocessed dead letters: {len(resolved_ids)} recovered, {len(failed)} remaining."
+    )
+    return {"recovered": len(resolved_ids), "remaining": len(failed)}
@@ -1,5 +1,7 @@
 """Core scraper functionality."""
 
+import uuid
+from collections import Counter
 from typing import Any
 
 import aiohttp
@@ -8,6 +10,7 @@ from dotenv import load_dotenv
 from loguru import logger
 from pydantic import BaseModel, Field
 
+from hsrws.core.records import RejectedEntry, format_error_summary
 from hsrws.utils.payload import get_payload, default_char_data_dict
 
 load_dotenv()
@@ -20,10 +23,16 @@ class Scraper(BaseModel):
     Attributes:
         page_num: Page number of the page that contains data.
         char_data_dict: Dictionary to store character data.
+        validation_errors: Per-field validation error counts of the run.
+        run_id: Identifier of the scrape run.
+        dead_letters: Entries that failed extraction during the run.
     """
 
     page_num: int = Field(0, ge=0)
     char_data_dict: dict[str, list[Any]] = Field(default_factory=default_char_data_dict)
+    validation_errors: Counter[tuple[str, str]] = Field(default_factory=Counter)
+    run_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    dead_letters: list[RejectedEntry] = Field(default_factory=list)
 
     async def scrape_hsr_data(self, url: str, headers: dict[str, Any]) -> pd.DataFrame:
         """
@@ -54,6 +63,13 @@ class Scraper(BaseModel):
 
             await process_character_list(self, char_list)
 
+        if self.validation_errors:
+            logger.warning(format_error_summary(self.validation_errors))
+        if self.dead_letters:
+            logger.warning(
+                f"{len(self.dead_letters)} character entries failed extraction."
+            )
+
         return pd.DataFrame(self.char_data_dict)
 
     @staticmethod
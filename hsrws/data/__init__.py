@@ -4,6 +4,22 @@ from hsrws.data.transformer import (
     transform_char_name,
     clean_path_name,
     add_char_version,
+    transform_character_data,
+)
+from hsrws.data.memo import (
+    TransformMemo,
+    transform_memo,
+    load_transform_memo,
+    save_transform_memo,
 )
 
-__all__ = ["transform_char_name", "clean_path_name", "add_char_version"]
+__all__ = [
+    "transform_char_name",
+    "clean_path_name",
+    "add_char_version",
+    "transform_character_data",
+    "TransformMemo",
+    "transform_memo",
+    "load_transform_memo",
+    "save_transform_memo",
+]
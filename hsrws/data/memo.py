@@ -0,0 +1,238 @@
+"""Memoization of data transforms across scraper runs."""
+
+import functools
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from loguru import logger
+from sqlalchemy import Engine, delete, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from hsrws.db.database import get_engine
+from hsrws.db.models import TransformMemoEntry
+
+# Bump to invalidate every memoized value regardless of fingerprints.
+TRANSFORM_VERSION = 1
+
+DEFAULT_MAX_SIZE = 4096
+
+
+def fingerprint(func: Callable[..., Any], *extra: Any) -> str:
+    """
+    Computes a fingerprint of a transform's logic.
+
+    The fingerprint covers the function's bytecode and constants, the global
+    TRANSFORM_VERSION and any extra inputs the transform depends on, so editing
+    the transform invalidates its memoized values.
+
+    Args:
+        func: Transform function.
+        extra: Additional JSON-serializable inputs of the transform.
+
+    Returns:
+        Hex digest identifying the transform logic.
+    """
+    code = func.__code__
+    digest = hashlib.sha1()
+    digest.update(str(TRANSFORM_VERSION).encode())
+    digest.update(code.co_code)
+    digest.update(repr(code.co_consts).encode())
+    digest.update(json.dumps(extra, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class TransformMemo:
+    """
+    Bounded LRU memo mapping raw values to normalized values per transform.
+
+    Attributes:
+        max_size: Maximum number of entries kept in memory and persisted.
+        hits: Number of lookups answered from the memo.
+        misses: Number of lookups that had to run the transform.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str], tuple[str, Any]] = OrderedDict()
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(
+        self,
+        transform: str,
+        transform_fingerprint: str,
+        raw: str,
+        compute: Callable[[str], Any],
+    ) -> Any:
+        """
+        Returns the memoized value for a raw input, computing it on a miss.
+
+        Args:
+            transform: Name of the transform.
+            transform_fingerprint: Fingerprint of the current transform logic.
+            raw: Raw input value.
+            compute: Function computing the normalized value from the raw one.
+
+        Returns:
+            Normalized value.
+        """
+        key = (transform, raw)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == transform_fingerprint:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+
+        self.misses += 1
+        value = compute(raw)
+        self._entries[key] = (transform_fingerprint, value)
+        self._entries.move_to_end(key)
+        self._dirty = True
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Drops every memoized value and resets the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+
+    def load(self, engine: Engine) -> int:
+        """
+        Loads persisted memo entries from the database.
+
+        Entries whose fingerprint no longer matches are discarded lazily on
+        lookup, so loading never runs any transform. The most recently used
+        entries are kept and restored in their stored recency order, so the
+        eviction order does not depend on the backend's row order.
+
+        Args:
+            engine: SQLAlchemy engine of the database holding the memo table.
+
+        Returns:
+            Number of entries loaded.
+        """
+        TransformMemoEntry.__table__.create(engine, checkfirst=True)
+        with engine.connect() as conn:
+            rows = conn.execute(
+                select(
+                    TransformMemoEntry.Transform,
+                    TransformMemoEntry.Raw,
+                    TransformMemoEntry.Fingerprint,
+                    TransformMemoEntry.Normalized,
+                )
+                .order_by(
+                    TransformMemoEntry.Position.desc(),
+                    TransformMemoEntry.Transform,
+                    TransformMemoEntry.Raw,
+                )
+                .limit(self.max_size)
+            ).all()
+
+        # Oldest first, so the least recently used entry is evicted first.
+        for transform, raw, transform_fingerprint, normalized in reversed(rows):
+            self._entries[(transform, raw)] = (
+                transform_fingerprint,
+                json.loads(normalized),
+            )
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        self._dirty = False
+        return len(rows)
+
+    def save(self, engine: Engine) -> int:
+        """
+        Persists the in-memory memo entries, replacing the stored ones.
+
+        Args:
+            engine: SQLAlchemy engine of the database holding the memo table.
+
+        Returns:
+            Number of entries written, zero if nothing changed since the last load.
+        """
+        if not self._dirty:
+            return 0
+
+        TransformMemoEntry.__table__.create(engine, checkfirst=True)
+        rows = [
+            {
+                "Transform": transform,
+                "Raw": raw,
+                "Fingerprint": transform_fingerprint,
+                "Normalized": json.dumps(value),
+                "Position": position,
+            }
+            for position, ((transform, raw), (transform_fingerprint, value)) in (
+                enumerate(self._entries.items())
+            )
+        ]
+        with engine.begin() as conn:
+            conn.execute(delete(TransformMemoEntry))
+            if rows:
+                conn.execute(insert(TransformMemoEntry), rows)
+        self._dirty = False
+        return len(rows)
+
+
+transform_memo = TransformMemo()
+
+
+def memoized_transform(func: Callable[[str], Any]) -> Callable[[str], Any]:
+    """
+    Decorates a single-argument string transform with the shared memo.
+
+    Args:
+        func: Transform taking a raw string.
+
+    Returns:
+        Memoized transform.
+    """
+    transform_fingerprint = fingerprint(func)
+
+    @functools.wraps(func)
+    def wrapper(raw: str) -> Any:
+        if not isinstance(raw, str):
+            return func(raw)
+        return transform_memo.get_or_compute(
+            func.__name__, transform_fingerprint, raw, func
+        )
+
+    return wrapper
+
+
+def load_transform_memo(engine: Optional[Engine] = None) -> None:
+    """
+    Loads the persisted transform memo, logging instead of failing on errors.
+
+    Args:
+        engine: SQLAlchemy engine, defaults to the application engine.
+    """
+    try:
+        loaded = transform_memo.load(engine or get_engine())
+        logger.info(f"Loaded {loaded} memoized transform values.")
+    except SQLAlchemyError as e:
+        logger.warning(f"Could not load transform memo: {e}")
+
+
+def save_transform_memo(engine: Optional[Engine] = None) -> None:
+    """
+    Persists the transform memo, logging instead of failing on errors.
+
+    Args:
+        engine: SQLAlchemy engine, defaults to the application engine.
+    """
+    logger.info(
+        f"Transform memo: {transform_memo.hits} hits, {transform_memo.misses} misses."
+    )
+    try:
+        transform_memo.save(engine or get_engine())
+    except SQLAlchemyError as e:
+        logger.warning(f"Could not save transform memo: {e}")
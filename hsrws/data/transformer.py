@@ -5,9 +5,11 @@ import re
 import pandas as pd
 from loguru import logger
 
+from hsrws.data.memo import fingerprint, memoized_transform, transform_memo
 from hsrws.utils.version import get_version_dict
 
 
+@memoized_transform
 def transform_char_name(char_name: str) -> str:
     """
     Transforms character name to a standard format.
@@ -38,6 +40,7 @@ def transform_char_name(char_name: str) -> str:
     return cleaned_char_name
 
 
+@memoized_transform
 def clean_path_name(path_name: str) -> str:
     """
     Cleans Path name by removing 'The ' prefix.
@@ -61,13 +64,53 @@ def add_char_version(df: pd.DataFrame) -> None:
     """
     logger.debug("Adding character version...")
     version_and_character_dict: dict[float, list[str]] = get_version_dict()
+    version_fingerprint = fingerprint(
+        _find_char_version, sorted(version_and_character_dict.items())
+    )
     df["Version"] = df["Character"].apply(  # type: ignore
-        lambda character: next(  # type: ignore
-            (
-                version
-                for version, characters in version_and_character_dict.items()
-                if character in characters
-            ),
-            1.0,
+        lambda character: transform_memo.get_or_compute(  # type: ignore
+            "add_char_version",
+            version_fingerprint,
+            character,
+            lambda char: _find_char_version(char, version_and_character_dict),
         )
     )
+
+
+def _find_char_version(
+    character: str, version_and_character_dict: dict[float, list[str]]
+) -> float:
+    """
+    Finds the version a character was released in.
+
+    Args:
+        character: Transformed character name.
+        version_and_character_dict: Dictionary mapping versions to characters.
+
+    Returns:
+        Release version, 1.0 if the character is not listed.
+    """
+    return next(
+        (
+            version
+            for version, characters in version_and_character_dict.items()
+            if character in characters
+        ),
+        1.0,
+    )
+
+
+def transform_character_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Applies every character transform to a scraped dataframe.
+
+    Args:
+        df: Character Dataframe as produced by the scraper.
+
+    Returns:
+        The same dataframe with normalized names, paths and versions.
+    """
+    df["Character"] = df["Character"].apply(transform_char_name)  # type: ignore
+    df["Path"] = df["Path"].apply(clean_path_name)  # type: ignore
+    add_char_version(df)
+    return df
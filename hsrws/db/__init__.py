@@ -1,6 +1,13 @@
 """Database functionality for HSR web scraper."""
 
-from hsrws.db.database import get_engine, get_session
+from hsrws.db.database import (
+    dispose_engine,
+    get_async_database_url,
+    get_async_engine,
+    get_database_url,
+    get_engine,
+    get_session,
+)
 from hsrws.db.models import HsrCharacter, Base
 from hsrws.db.queries import (
     get_latest_patch_stmt,
@@ -10,6 +17,10 @@ from hsrws.db.queries import (
 )
 
 __all__ = [
+    "dispose_engine",
+    "get_async_database_url",
+    "get_async_engine",
+    "get_database_url",
     "get_engine",
     "get_session",
     "HsrCharacter",
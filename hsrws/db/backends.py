@@ -0,0 +1,275 @@
+"""Query backends: the application database or an analytical DuckDB copy.
+
+The statement builders of hsrws.db.queries are SQLAlchemy Core constructs,
+so the same statements run on any engine. The DuckDB backend needs the
+optional duckdb extra (duckdb and duckdb-engine).
+"""
+
+import importlib.util
+import os
+import threading
+from typing import Any, Optional
+
+import pandas as pd
+from loguru import logger
+from sqlalchemy import Dialect, Engine, create_engine, event, func, inspect, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+
+from hsrws.db.database import get_engine, get_session
+from hsrws.db.dimensions import FACT_TABLE, KEY_COLUMNS, get_fact_rows_stmt
+from hsrws.db.export import GENERATION_METADATA_KEY
+from hsrws.db.models import DataGeneration, HsrCharacter
+
+QUERY_BACKENDS = ("sqlite", "duckdb")
+
+# Connection info key of the modification time of the Parquet file loaded.
+PARQUET_MTIME_KEY = "duckdb_parquet_mtime"
+
+# Tables the query layer reads, copied to DuckDB databases.
+QUERY_TABLES = [HsrCharacter.__table__, DataGeneration.__table__]
+
+_duckdb_engine: Optional[Engine] = None
+_duckdb_session_factory: Optional[sessionmaker[Session]] = None
+_lock = threading.Lock()
+
+
+def get_query_backend() -> str:
+    """
+    Gets the backend that serves read queries.
+
+    Returns:
+        Value of the HSR_QUERY_BACKEND environment variable, 'sqlite' if unset.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    backend = os.getenv("HSR_QUERY_BACKEND", "sqlite").lower()
+    if backend not in QUERY_BACKENDS:
+        raise ValueError(
+            f"Unknown query backend {backend!r}, expected one of {QUERY_BACKENDS}"
+        )
+    return backend
+
+
+def _fact_tables_sql(dialect: Dialect) -> list[str]:
+    """
+    Builds the statements deriving the dimension and fact tables in DuckDB.
+
+    The character cube reads the facts joined to their dimensions, so each
+    DuckDB database derives them from its HsrCharacters table. Keys are
+    numbered afresh, which statements never see as they only join them to
+    the names.
+
+    Args:
+        dialect: Dialect of the DuckDB engine.
+
+    Returns:
+        CREATE TABLE statements, in execution order.
+    """
+    statements = []
+    for name, key in KEY_COLUMNS.items():
+        column = HsrCharacter.__table__.c[name]
+        values = select(column).distinct().where(column.is_not(None)).subquery()
+        statements.append(
+            (
+                key.table.name,
+                select(
+                    func.row_number().over(order_by=values.c[name]).label(key.name),
+                    values.c[name].label("Name"),
+                ),
+            )
+        )
+    statements.append((FACT_TABLE.name, get_fact_rows_stmt()))
+    return [
+        f'CREATE OR REPLACE TABLE "{table}" AS '
+        f"{stmt.compile(dialect=dialect, compile_kwargs={'literal_binds': True})}"
+        for table, stmt in statements
+    ]
+
+
+def create_duckdb_engine(
+    path: str = ":memory:", parquet_path: Optional[str] = None
+) -> Engine:
+    """
+    Creates an engine for a DuckDB database.
+
+    With a Parquet file, every new connection loads it into an
+    HsrCharacters table, derives the fact tables from it and records the
+    data generation of its metadata. Pooled connections keep their copy
+    until the file is replaced: a connection checked out after a new export
+    loads the file again, so the result cache sees the new generation.
+
+    Args:
+        path: DuckDB database file, or ':memory:'.
+        parquet_path: Parquet file with the HsrCharacters columns to load.
+
+    Returns:
+        SQLAlchemy engine object.
+
+    Raises:
+        RuntimeError: If the duckdb extra is not installed.
+    """
+    if importlib.util.find_spec("duckdb_engine") is None:
+        raise RuntimeError(
+            "The DuckDB backend requires the duckdb extra: "
+            "pip install 'duckdb' 'duckdb-engine'"
+        )
+    engine = create_engine(f"duckdb:///{path}")
+    if parquet_path is None:
+        return engine
+
+    @event.listens_for(engine, "connect")
+    def _load_parquet(dbapi_connection: Any, connection_record: Any) -> None:
+        # Stat before reading, so a file replaced meanwhile is read again.
+        connection_record.info[PARQUET_MTIME_KEY] = os.stat(parquet_path).st_mtime_ns
+        dbapi_connection.execute(
+            f'CREATE OR REPLACE TABLE "{HsrCharacter.__tablename__}" AS '
+            "SELECT * FROM read_parquet(?)",
+            [parquet_path],
+        )
+        for sql in _fact_tables_sql(engine.dialect):
+            dbapi_connection.execute(sql)
+        dbapi_connection.execute(
+            f'CREATE OR REPLACE TABLE "{DataGeneration.__tablename__}" AS '
+            'SELECT 1 AS "Id", COALESCE(('
+            "SELECT CAST(decode(value) AS BIGINT) FROM parquet_kv_metadata(?) "
+            'WHERE key = ?), 0) AS "Generation"',
+            [parquet_path, GENERATION_METADATA_KEY],
+        )
+
+    @event.listens_for(engine, "checkout")
+    def _reload_parquet(
+        dbapi_connection: Any, connection_record: Any, _connection_proxy: Any
+    ) -> None:
+        mtime = os.stat(parquet_path).st_mtime_ns
+        if connection_record.info.get(PARQUET_MTIME_KEY) != mtime:
+            _load_parquet(dbapi_connection, connection_record)
+
+    return engine
+
+
+def copy_to_duckdb(source: Engine, target: Engine) -> dict[str, int]:
+    """
+    Copies the tables read by the query layer to a DuckDB database.
+
+    Existing tables of the target are replaced, and the fact tables are
+    derived from the copied characters.
+
+    Args:
+        source: Engine of the application database.
+        target: Engine of the DuckDB database.
+
+    Returns:
+        Number of rows copied per table.
+    """
+    copied: dict[str, int] = {}
+    with source.connect() as source_conn, target.begin() as target_conn:
+        for table in QUERY_TABLES:
+            if not inspect(source_conn).has_table(table.name):
+                continue
+            frame = pd.DataFrame(
+                source_conn.execute(select(table)).all(),
+                columns=[column.name for column in table.columns],
+            )
+            duckdb_conn = target_conn.connection.driver_connection
+            duckdb_conn.register("source_frame", frame)
+            try:
+                target_conn.exec_driver_sql(
+                    f'CREATE OR REPLACE TABLE "{table.name}" AS '
+                    "SELECT * FROM source_frame"
+                )
+            finally:
+                duckdb_conn.unregister("source_frame")
+            copied[table.name] = len(frame)
+        if HsrCharacter.__tablename__ in copied:
+            for sql in _fact_tables_sql(target_conn.dialect):
+                target_conn.exec_driver_sql(sql)
+    logger.info(f"Copied tables to DuckDB: {copied}")
+    return copied
+
+
+def refresh_duckdb_copy(source: Engine) -> Optional[dict[str, int]]:
+    """
+    Copies the query tables again to the HSR_DUCKDB_PATH file after a load.
+
+    Without a refresh the DuckDB file would keep serving the data of the
+    load it was copied from. A database loaded from HSR_DUCKDB_PARQUET
+    reloads the export itself, so it is left alone. Like the columnar
+    export, a failed copy only logs an error, since the load is already
+    committed.
+
+    Args:
+        source: Engine of the loaded database.
+
+    Returns:
+        Number of rows copied per table, or None if there is no DuckDB file
+        to refresh or the copy failed.
+    """
+    path = os.getenv("HSR_DUCKDB_PATH", ":memory:")
+    if path == ":memory:" or os.getenv("HSR_DUCKDB_PARQUET"):
+        return None
+
+    try:
+        return copy_to_duckdb(source, get_duckdb_engine())
+    except (RuntimeError, SQLAlchemyError) as e:
+        logger.error(f"Error refreshing the DuckDB copy {path}: {e}")
+        return None
+
+
+def get_duckdb_engine() -> Engine:
+    """
+    Gets the process-wide DuckDB engine, creating it on first use.
+
+    The database is the HSR_DUCKDB_PATH file, in memory if unset, loaded
+    from the HSR_DUCKDB_PARQUET file if set.
+
+    Returns:
+        SQLAlchemy engine object.
+    """
+    global _duckdb_engine, _duckdb_session_factory
+    if _duckdb_engine is None:
+        with _lock:
+            if _duckdb_engine is None:
+                _duckdb_engine = create_duckdb_engine(
+                    os.getenv("HSR_DUCKDB_PATH", ":memory:"),
+                    os.getenv("HSR_DUCKDB_PARQUET"),
+                )
+                _duckdb_session_factory = sessionmaker(bind=_duckdb_engine)
+    return _duckdb_engine
+
+
+def get_query_engine() -> Engine:
+    """
+    Gets the engine of the configured query backend.
+
+    Returns:
+        SQLAlchemy engine object.
+    """
+    if get_query_backend() == "duckdb":
+        return get_duckdb_engine()
+    return get_engine()
+
+
+def get_query_session() -> Session:
+    """
+    Gets a SQLAlchemy session on the configured query backend.
+
+    Returns:
+        SQLAlchemy session object.
+    """
+    if get_query_backend() == "duckdb":
+        get_duckdb_engine()
+        assert _duckdb_session_factory is not None
+        return _duckdb_session_factory()
+    return get_session()
+
+
+def dispose_duckdb_engine() -> None:
+    """Closes the pooled DuckDB connections and forgets the engine."""
+    global _duckdb_engine, _duckdb_session_factory
+    with _lock:
+        if _duckdb_engine is not None:
+            _duckdb_engine.dispose()
+        _duckdb_engine = None
+        _duckdb_session_factory = None
@@ -0,0 +1,174 @@
+"""Bitmap indexes over the categorical character dimensions.
+
+Every value of Path, Element, Rarity and Version holds a bitset with one bit
+per character, as a Python integer. A selection is the AND of one OR per
+filtered dimension, and its count is a popcount, so a roster of a few
+hundred characters is filtered in a handful of machine-word operations.
+"""
+
+import bisect
+from typing import Any
+
+import numpy as np
+
+from hsrws.db.queries.selection import CharacterSelection
+
+BITMAP_DIMENSIONS = ("Path", "Element", "Rarity", "Version")
+
+
+def to_bitset(mask: np.ndarray) -> int:
+    """
+    Packs a boolean array into a bitset.
+
+    Args:
+        mask: Boolean array, entry i becomes bit i.
+
+    Returns:
+        Bitset as a non-negative integer.
+    """
+    return int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+
+
+def bitset_positions(bits: int, size: int) -> np.ndarray:
+    """
+    Gets the positions of the set bits.
+
+    Args:
+        bits: Bitset.
+        size: Number of positions the bitset covers.
+
+    Returns:
+        Sorted array of the positions of the set bits.
+    """
+    packed = np.frombuffer(bits.to_bytes((size + 7) // 8, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(packed, bitorder="little")[:size])
+
+
+class BitmapIndex:
+    """
+    Bitsets of the characters holding each dimension value.
+
+    Attributes:
+        size: Number of indexed characters.
+        all_bits: Bitset of every character.
+    """
+
+    def __init__(
+        self, codes: dict[str, np.ndarray], categories: dict[str, list[Any]]
+    ) -> None:
+        """
+        Builds the bitsets from categorical codes.
+
+        Args:
+            codes: Code array per dimension, 0 for NULL.
+            categories: Values per dimension indexed by code, None first.
+        """
+        self.size = len(codes[BITMAP_DIMENSIONS[0]])
+        self.all_bits = (1 << self.size) - 1
+        self._bitsets: dict[str, dict[Any, int]] = {
+            name: {
+                value: to_bitset(codes[name] == code)
+                for code, value in enumerate(categories[name])
+                if value is not None
+            }
+            for name in BITMAP_DIMENSIONS
+        }
+
+        # Characters released up to each version, so that a version range
+        # is one AND NOT of two prefixes however many versions it spans.
+        self._versions = categories["Version"][1:]
+        self._released_by = [0]
+        for version in self._versions:
+            self._released_by.append(
+                self._released_by[-1] | self._bitsets["Version"][version]
+            )
+
+    def bitset(self, dimension: str, value: Any) -> int:
+        """
+        Gets the bitset of the characters holding a dimension value.
+
+        Args:
+            dimension: One of BITMAP_DIMENSIONS.
+            value: Dimension value.
+
+        Returns:
+            Bitset, 0 if no character holds the value.
+
+        Raises:
+            ValueError: If the dimension is not indexed.
+        """
+        if dimension not in self._bitsets:
+            raise ValueError(f"Unknown dimension {dimension!r}")
+        return self._bitsets[dimension].get(value, 0)
+
+    def version_range(self, min_version: Any = None, max_version: Any = None) -> int:
+        """
+        Gets the bitset of the characters released within a version range.
+
+        Args:
+            min_version: Lowest release version included, None for no bound.
+            max_version: Highest release version included, None for no bound.
+
+        Returns:
+            Bitset of the characters, excluding those without a version.
+        """
+        high = (
+            len(self._versions)
+            if max_version is None
+            else bisect.bisect_right(self._versions, max_version)
+        )
+        low = (
+            0
+            if min_version is None
+            else bisect.bisect_left(self._versions, min_version)
+        )
+        return self._released_by[high] & ~self._released_by[min(low, high)]
+
+    def select(self, selection: CharacterSelection) -> int:
+        """
+        Gets the bitset of the characters matching a selection.
+
+        Args:
+            selection: Character selection.
+
+        Returns:
+            Bitset of the matching characters.
+        """
+        bits = self.all_bits
+        for dimension, values in (
+            ("Path", selection.paths),
+            ("Element", selection.elements),
+            ("Rarity", selection.rarities),
+        ):
+            if values:
+                accepted = 0
+                for value in values:
+                    accepted |= self.bitset(dimension, value)
+                bits &= accepted
+        if selection.min_version is not None or selection.max_version is not None:
+            bits &= self.version_range(selection.min_version, selection.max_version)
+        return bits
+
+    def count(self, selection: CharacterSelection) -> int:
+        """
+        Counts the characters matching a selection.
+
+        Args:
+            selection: Character selection.
+
+        Returns:
+            Number of matching characters.
+        """
+        return self.select(selection).bit_count()
+
+    def positions(self, selection: CharacterSelection) -> np.ndarray:
+        """
+        Gets the positions of the characters matching a selection.
+
+        Args:
+            selection: Character selection.
+
+        Returns:
+            Sorted array of character positions.
+        """
+        return bitset_positions(self.select(selection), self.size)
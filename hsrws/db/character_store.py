@@ -0,0 +1,377 @@
+"""In-process columnar copy of the character dimensions for SQL-free reads.
+
+A roster is a few hundred characters, so every aggregate of the character
+statistics can be answered from NumPy arrays in microseconds. Each dimension
+is held as an array of categorical codes into its sorted values, with code 0
+for NULL, so grouping is a bincount over the combined codes.
+"""
+
+import math
+import os
+import threading
+import time
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Engine
+
+from hsrws.db.bitmaps import BitmapIndex
+from hsrws.db.columnar import COLUMN_DTYPES, values_to_array
+from hsrws.db.database import get_engine
+from hsrws.db.generation import get_data_generation
+from hsrws.db.queries.aggregates import DIMENSION_COLUMNS, CharacterFilter
+from hsrws.db.queries.selection import (
+    SELECTION_COLUMNS,
+    CharacterSelection,
+    get_selection_stmt,
+)
+
+DEFAULT_REFRESH_SECONDS = 1.0
+
+
+def character_store_enabled() -> bool:
+    """
+    Checks whether reads are answered from the in-process character store.
+
+    Returns:
+        Value of the HSR_CHARACTER_STORE environment variable, True if unset.
+    """
+    return os.getenv("HSR_CHARACTER_STORE", "true").lower() in ("true", "1", "t")
+
+
+def get_refresh_interval() -> float:
+    """
+    Gets how often the store checks the database for a newer load.
+
+    Returns:
+        Value of the HSR_STORE_REFRESH_SECONDS environment variable, 1 second
+        if unset. Zero checks on every read.
+    """
+    return float(os.getenv("HSR_STORE_REFRESH_SECONDS", DEFAULT_REFRESH_SECONDS))
+
+
+class CharacterStore:
+    """
+    Immutable columnar snapshot of the character dimensions.
+
+    Aggregates follow build_aggregate_stmt: NULL dimension values form their
+    own group and sort first, as in SQLite, and filters never match NULLs.
+
+    Attributes:
+        generation: Data generation the snapshot was read at.
+        bitmaps: Bitmap index of the characters, in Character order.
+    """
+
+    def __init__(self, characters: pd.DataFrame, generation: int) -> None:
+        """
+        Encodes the dimension columns of a character table.
+
+        Args:
+            characters: DataFrame with the Character key and the
+                DIMENSION_COLUMNS columns.
+            generation: Data generation of the characters.
+        """
+        characters = characters.sort_values("Character", ignore_index=True)
+        self.generation = generation
+        self._characters = characters["Character"].to_numpy(dtype=object)
+        self._size = len(characters)
+        self._categories: dict[str, list[Any]] = {}
+        self._codes: dict[str, np.ndarray] = {}
+        self._lookup: dict[str, dict[Any, int]] = {}
+        for name, column in DIMENSION_COLUMNS.items():
+            cast = column.type.python_type
+            values = [
+                None if pd.isna(value) else cast(value) for value in characters[name]
+            ]
+            categories = sorted({value for value in values if value is not None})
+            lookup = {value: code for code, value in enumerate(categories, start=1)}
+            self._categories[name] = [None, *categories]
+            self._lookup[name] = lookup
+            self._codes[name] = np.array(
+                [0 if value is None else lookup[value] for value in values],
+                dtype=np.intp,
+            )
+        self._versions = np.array(
+            [np.nan if value is None else value for value in characters["Version"]],
+            dtype=np.float64,
+        )
+        self.bitmaps = BitmapIndex(self._codes, self._categories)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def from_engine(cls, engine: Engine) -> "CharacterStore":
+        """
+        Reads the characters and their data generation.
+
+        Args:
+            engine: SQLAlchemy engine of the database.
+
+        Returns:
+            Snapshot of the characters.
+        """
+        with engine.begin() as conn:
+            generation = get_data_generation(conn)
+            characters = pd.DataFrame(
+                conn.execute(get_selection_stmt(CharacterSelection())).all(),
+                columns=list(SELECTION_COLUMNS),
+            )
+        return cls(characters.astype(object), generation)
+
+    def filter_mask(self, filters: Optional[CharacterFilter] = None) -> np.ndarray:
+        """
+        Selects the characters matching a filter.
+
+        Args:
+            filters: Character filter, None for every character.
+
+        Returns:
+            Boolean array with one entry per character.
+        """
+        mask = np.ones(self._size, dtype=bool)
+        if filters is None:
+            return mask
+        if filters.min_version is not None:
+            mask &= self._versions >= filters.min_version
+        if filters.max_version is not None:
+            mask &= self._versions <= filters.max_version
+        for name, value in (("Element", filters.element), ("Path", filters.path)):
+            if value is not None:
+                mask &= self._codes[name] == self._lookup[name].get(value, -1)
+        return mask
+
+    def latest_version(
+        self, filters: Optional[CharacterFilter] = None
+    ) -> Optional[float]:
+        """
+        Gets the latest release version, like get_latest_patch_stmt.
+
+        Args:
+            filters: Character filter, None for every character.
+
+        Returns:
+            Highest version of the filtered characters, None if there is none.
+        """
+        versions = self._versions[self.filter_mask(filters)]
+        versions = versions[~np.isnan(versions)]
+        return float(versions.max()) if versions.size else None
+
+    def aggregate(
+        self,
+        dimensions: tuple[str, ...],
+        filters: Optional[CharacterFilter] = None,
+        value_label: str = "count",
+        dimension_labels: Optional[tuple[str, ...]] = None,
+        cumulative: bool = False,
+        order_by_value: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Counts characters per combination of dimensions.
+
+        Returns the rows, columns and dtypes that reading
+        build_aggregate_stmt with the same arguments returns.
+
+        Args:
+            dimensions: Dimension columns to group by, also the output order.
+            filters: Character filter, None for every character.
+            value_label: Label of the count column.
+            dimension_labels: Labels of the dimension columns, defaults to
+                their names.
+            cumulative: Accumulate the counts over versions within the other
+                dimensions. Requires 'Version' among the dimensions.
+            order_by_value: Order by the count, largest first, instead of by
+                the dimensions.
+
+        Returns:
+            DataFrame with one column per dimension and the count column.
+
+        Raises:
+            ValueError: If a dimension is unknown or the combination of
+                arguments is not supported.
+        """
+        unknown = [name for name in dimensions if name not in DIMENSION_COLUMNS]
+        if unknown or len(set(dimensions)) != len(dimensions):
+            raise ValueError(f"Invalid dimensions {dimensions}")
+        if dimension_labels is not None and len(dimension_labels) != len(dimensions):
+            raise ValueError("dimension_labels must match dimensions")
+        if cumulative and "Version" not in dimensions:
+            raise ValueError(f"Cumulative 'count' over {dimensions} is not supported")
+
+        mask = self.filter_mask(filters)
+        if not dimensions:
+            return pd.DataFrame(
+                {value_label: np.array([np.count_nonzero(mask)], dtype=np.int64)}
+            )
+
+        counts = self._count_cells(dimensions, mask)
+        present = np.nonzero(counts)
+        if cumulative:
+            counts = np.cumsum(counts, axis=dimensions.index("Version"))
+        values = counts[present].astype(np.int64)
+
+        labels = dimension_labels or dimensions
+        frame = pd.DataFrame(
+            {
+                **{
+                    label: self._decode(name, codes)
+                    for name, label, codes in zip(dimensions, labels, present)
+                },
+                value_label: values,
+            }
+        )
+        if order_by_value:
+            order = np.argsort(-values, kind="stable")
+            return frame.take(order).reset_index(drop=True)
+        return frame
+
+    def crosstab(
+        self, index: str, columns: str, filters: Optional[CharacterFilter] = None
+    ) -> pd.DataFrame:
+        """
+        Counts characters per pair of dimension values as a table.
+
+        Equivalent to pivoting the aggregate over (index, columns), such as
+        the Element-Path heatmap, and filling the missing pairs with 0.
+
+        Args:
+            index: Dimension of the rows.
+            columns: Dimension of the columns.
+            filters: Character filter, None for every character.
+
+        Returns:
+            DataFrame indexed by the values of index with one column per
+            value of columns, holding the counts.
+
+        Raises:
+            ValueError: If a dimension is unknown or both are the same.
+        """
+        dimensions = (index, columns)
+        if any(name not in DIMENSION_COLUMNS for name in dimensions) or (
+            index == columns
+        ):
+            raise ValueError(f"Invalid dimensions {dimensions}")
+
+        counts = self._count_cells(dimensions, self.filter_mask(filters))
+        rows = np.flatnonzero(counts.any(axis=1))
+        cols = np.flatnonzero(counts.any(axis=0))
+        return pd.DataFrame(
+            counts[np.ix_(rows, cols)].astype(np.int64),
+            index=pd.Index(self._decode(index, rows), name=index),
+            columns=pd.Index(self._decode(columns, cols), name=columns),
+        )
+
+    def count_characters(self, selection: CharacterSelection) -> int:
+        """
+        Counts the characters of a selection with the bitmap index.
+
+        Args:
+            selection: Character selection.
+
+        Returns:
+            Number of matching characters.
+        """
+        return self.bitmaps.count(selection)
+
+    def select_characters(self, selection: CharacterSelection) -> pd.DataFrame:
+        """
+        Reads the characters of a selection with the bitmap index.
+
+        Args:
+            selection: Character selection.
+
+        Returns:
+            DataFrame typed like reading get_selection_stmt(selection).
+        """
+        positions = self.bitmaps.positions(selection)
+        return pd.DataFrame(
+            {
+                "Character": values_to_array(
+                    self._characters[positions].tolist(), object
+                ),
+                **{
+                    name: self._decode(name, self._codes[name][positions])
+                    for name in DIMENSION_COLUMNS
+                },
+            }
+        )
+
+    def _count_cells(self, dimensions: tuple[str, ...], mask: np.ndarray) -> Any:
+        """
+        Counts the masked characters in a dense array over the dimension codes.
+
+        Args:
+            dimensions: Dimension names, one array axis each.
+            mask: Characters to count.
+
+        Returns:
+            Array of counts, indexed by the codes of each dimension.
+        """
+        shape = tuple(len(self._categories[name]) for name in dimensions)
+        cells = np.ravel_multi_index(
+            [self._codes[name][mask] for name in dimensions], shape
+        )
+        return np.bincount(cells, minlength=math.prod(shape)).reshape(shape)
+
+    def _decode(self, name: str, codes: np.ndarray) -> Any:
+        """
+        Converts codes of a dimension back to its values.
+
+        Args:
+            name: Dimension name.
+            codes: Categorical codes.
+
+        Returns:
+            Array typed like a columnar read of the dimension.
+        """
+        categories = self._categories[name]
+        dtype = COLUMN_DTYPES[DIMENSION_COLUMNS[name].type.python_type]
+        return values_to_array([categories[code] for code in codes], dtype)
+
+
+_store: Optional[CharacterStore] = None
+_checked_at = -math.inf
+_lock = threading.Lock()
+
+
+def get_character_store(engine: Optional[Engine] = None) -> CharacterStore:
+    """
+    Gets the process-wide character store, reading it on first use.
+
+    The data generation is checked at most once per refresh interval, and
+    the store is read again when a load has bumped it. Reads in between do
+    not touch the database.
+
+    Args:
+        engine: SQLAlchemy engine, defaults to the application engine.
+
+    Returns:
+        Character store.
+    """
+    global _store, _checked_at
+    store = _store
+    if store is not None and time.monotonic() - _checked_at < get_refresh_interval():
+        return store
+
+    with _lock:
+        engine = engine or get_engine()
+        if _store is not None and time.monotonic() - _checked_at >= (
+            get_refresh_interval()
+        ):
+            with engine.connect() as conn:
+                if get_data_generation(conn) != _store.generation:
+                    _store = None
+            _checked_at = time.monotonic()
+        if _store is None:
+            _store = CharacterStore.from_engine(engine)
+            _checked_at = time.monotonic()
+        return _store
+
+
+def reset_character_store() -> None:
+    """Drops the character store, so the next read loads it again."""
+    global _store, _checked_at
+    with _lock:
+        _store = None
+        _checked_at = -math.inf
@@ -0,0 +1,267 @@
+"""Chart datasets computed from the character table and materialized at load time."""
+
+from typing import Any, NamedTuple, Optional
+
+import pandas as pd
+from sqlalchemy import Connection, delete, insert, inspect, select
+
+from hsrws.db.columnar import fetch_frame
+from hsrws.db.models import ChartAggregate
+from hsrws.db.queries.character_stats import get_character_cube_stmt
+
+CUBE_DIMENSIONS = ["Version", "Element", "Path", "Rarity"]
+
+# DataFrame columns of each materialized dataset, in output order.
+DATASET_COLUMNS: dict[str, list[str]] = {
+    "path_distribution": ["category", "count"],
+    "element_distribution": ["category", "count"],
+    "rarity_distribution": ["category", "count"],
+    "element_path_heatmap": ["Element", "Path", "count"],
+    "rarity_element_distribution": ["Rarity", "Element", "count"],
+    "version_release_timeline": ["Version", "character_count"],
+    "element_balance_evolution": ["Version", "Element", "count"],
+    "path_rarity_distribution": ["Path", "Rarity", "count"],
+    "path_balance_evolution": ["Version", "Path", "count"],
+}
+
+# Integer Rarity keys are stored in the text key columns and restored on read.
+INTEGER_KEYS = {
+    ("rarity_distribution", "category"),
+    ("rarity_element_distribution", "Rarity"),
+    ("path_rarity_distribution", "Rarity"),
+}
+
+AGGREGATE_TABLE = ChartAggregate.__table__
+
+
+class ChartDatasets(NamedTuple):
+    """
+    Every dataset of the character charts, keyed by name.
+
+    Each DataFrame has the columns and row order of the matching query in
+    hsrws.db.queries.character_stats.
+    """
+
+    latest_version: Optional[float]
+    path_distribution: pd.DataFrame
+    element_distribution: pd.DataFrame
+    rarity_distribution: pd.DataFrame
+    element_path_heatmap: pd.DataFrame
+    rarity_element_distribution: pd.DataFrame
+    version_release_timeline: pd.DataFrame
+    element_balance_evolution: pd.DataFrame
+    path_rarity_distribution: pd.DataFrame
+    path_balance_evolution: pd.DataFrame
+
+
+def compute_chart_datasets(cube: pd.DataFrame) -> ChartDatasets:
+    """
+    Computes every chart dataset from the per-dimension character counts.
+
+    The cube is small (one row per distinct Version, Element, Path and Rarity
+    combination), so the rollups run in memory instead of one GROUP BY over
+    the character table per chart.
+
+    Args:
+        cube: DataFrame with the CUBE_DIMENSIONS columns and a count column,
+            as returned by get_character_cube_stmt.
+
+    Returns:
+        Bundle of chart datasets.
+    """
+    versions = cube["Version"].dropna()
+    return ChartDatasets(
+        latest_version=float(versions.max()) if not versions.empty else None,
+        path_distribution=_distribution(cube, "Path"),
+        element_distribution=_distribution(cube, "Element"),
+        rarity_distribution=_distribution(cube, "Rarity"),
+        element_path_heatmap=_rollup(cube, ["Element", "Path"]),
+        rarity_element_distribution=_rollup(cube, ["Rarity", "Element"]),
+        version_release_timeline=_rollup(cube, ["Version"]).rename(
+            columns={"count": "character_count"}
+        ),
+        element_balance_evolution=_cumulative_evolution(cube, "Element"),
+        path_rarity_distribution=_rollup(cube, ["Path", "Rarity"]),
+        path_balance_evolution=_cumulative_evolution(cube, "Path"),
+    )
+
+
+def count_character_cube(characters: pd.DataFrame) -> pd.DataFrame:
+    """
+    Counts characters per Version, Element, Path and Rarity in memory.
+
+    Args:
+        characters: DataFrame with the HsrCharacters columns; categorical
+            columns are counted on their observed values only.
+
+    Returns:
+        DataFrame with the columns of get_character_cube_stmt.
+    """
+    cube = (
+        characters.groupby(CUBE_DIMENSIONS, dropna=False, observed=True, sort=True)
+        .size()
+        .reset_index(name="count")
+    )
+    for dimension in CUBE_DIMENSIONS:
+        if isinstance(cube[dimension].dtype, pd.CategoricalDtype):
+            values = cube[dimension].astype(object)
+            cube[dimension] = values.where(values.notna(), None)
+    return cube
+
+
+def _rollup(cube: pd.DataFrame, dimensions: list[str]) -> pd.DataFrame:
+    """
+    Sums the cube counts per combination of dimensions.
+
+    Args:
+        cube: Per-dimension character counts.
+        dimensions: Columns to group by, also the sort order.
+
+    Returns:
+        DataFrame with the dimension columns and a count column.
+    """
+    return (
+        cube.groupby(dimensions, dropna=False, sort=True)["count"]
+        .sum()
+        .reset_index()
+        .astype({"count": "int64"})
+    )
+
+
+def _distribution(cube: pd.DataFrame, dimension: str) -> pd.DataFrame:
+    """
+    Counts characters per value of one dimension, most common first.
+
+    Args:
+        cube: Per-dimension character counts.
+        dimension: Column to count.
+
+    Returns:
+        DataFrame with category and count columns.
+    """
+    return (
+        _rollup(cube, [dimension])
+        .rename(columns={dimension: "category"})
+        .sort_values("count", ascending=False, kind="stable")
+        .reset_index(drop=True)
+    )
+
+
+def _cumulative_evolution(cube: pd.DataFrame, dimension: str) -> pd.DataFrame:
+    """
+    Computes the cumulative character count per version for each dimension value.
+
+    Args:
+        cube: Per-dimension character counts.
+        dimension: Column to partition the evolution by.
+
+    Returns:
+        DataFrame with Version, dimension and count columns, sorted by
+        Version then dimension.
+    """
+    counts = _rollup(cube, [dimension, "Version"])
+    counts["count"] = counts.groupby(dimension, dropna=False)["count"].cumsum()
+    return counts[["Version", dimension, "count"]].sort_values(
+        ["Version", dimension], kind="stable", ignore_index=True
+    )
+
+
+def _storage_columns(columns: list[str]) -> dict[str, str]:
+    """
+    Maps the DataFrame columns of a dataset to ChartAggregates columns.
+
+    Args:
+        columns: DataFrame columns of the dataset.
+
+    Returns:
+        Dictionary mapping each DataFrame column to its storage column.
+    """
+    keys = iter(["Key1", "Key2"])
+    return {
+        column: (
+            "Version"
+            if column == "Version"
+            else "Count"
+            if column in ("count", "character_count")
+            else next(keys)
+        )
+        for column in columns
+    }
+
+
+def refresh_chart_aggregates(conn: Connection) -> int:
+    """
+    Rebuilds the materialized chart datasets from the character table.
+
+    Meant to run inside the character load transaction after the fact table
+    is refreshed, so readers see the aggregates of exactly the characters
+    they would read. The cube is grouped on the integer keys of the facts.
+
+    Args:
+        conn: Connection inside the load transaction.
+
+    Returns:
+        Number of aggregate rows written.
+    """
+    datasets = compute_chart_datasets(fetch_frame(conn, get_character_cube_stmt()))
+
+    rows: list[dict[str, Any]] = []
+    for name, columns in DATASET_COLUMNS.items():
+        storage = _storage_columns(columns)
+        frame = getattr(datasets, name)[columns].astype(object)
+        for position, record in enumerate(
+            frame.where(frame.notna(), None).to_dict("records")
+        ):
+            row: dict[str, Any] = {"Key1": None, "Key2": None, "Version": None}
+            row.update({storage[column]: value for column, value in record.items()})
+            rows.append({"Dataset": name, "Position": position, **row})
+
+    conn.execute(delete(AGGREGATE_TABLE))
+    if rows:
+        conn.execute(insert(AGGREGATE_TABLE), rows)
+    return len(rows)
+
+
+def read_chart_aggregates(conn: Connection) -> Optional[ChartDatasets]:
+    """
+    Reads the materialized chart datasets.
+
+    Args:
+        conn: Database connection.
+
+    Returns:
+        Bundle of chart datasets, or None if they were never materialized.
+    """
+    if not inspect(conn).has_table(AGGREGATE_TABLE.name):
+        return None
+    rows = conn.execute(
+        select(AGGREGATE_TABLE).order_by(
+            AGGREGATE_TABLE.c.Dataset, AGGREGATE_TABLE.c.Position
+        )
+    ).mappings()
+
+    records: dict[str, list[Any]] = {name: [] for name in DATASET_COLUMNS}
+    for row in rows:
+        if row["Dataset"] in records:
+            records[row["Dataset"]].append(row)
+    if not any(records.values()):
+        return None
+
+    frames: dict[str, pd.DataFrame] = {}
+    for name, columns in DATASET_COLUMNS.items():
+        storage = _storage_columns(columns)
+        frames[name] = pd.DataFrame(
+            [[row[storage[column]] for column in columns] for row in records[name]],
+            columns=columns,
+        )
+        for column in columns:
+            if (name, column) in INTEGER_KEYS:
+                frames[name][column] = pd.to_numeric(frames[name][column]).astype(
+                    "Int64"
+                )
+
+    versions = frames["version_release_timeline"]["Version"].dropna()
+    return ChartDatasets(
+        latest_version=float(versions.max()) if not versions.empty else None,
+        **frames,
+    )
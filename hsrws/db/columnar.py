@@ -0,0 +1,141 @@
+"""Columnar reads that skip SQLAlchemy row materialization."""
+
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Connection, Dialect, Select
+
+FETCH_CHUNK_SIZE = 10_000
+
+# Python types of the column types that can be read straight into NumPy.
+COLUMN_DTYPES: dict[type, Any] = {
+    int: np.int64,
+    float: np.float64,
+    bool: np.bool_,
+    str: object,
+}
+
+
+def get_column_dtypes(stmt: Any, dialect: Dialect) -> Optional[dict[str, Any]]:
+    """
+    Gets the NumPy dtype of every column a statement selects.
+
+    A column qualifies when its type has a known Python type and the dialect
+    applies no result conversion to it, so the raw DBAPI values are final.
+
+    Args:
+        stmt: SQLAlchemy statement.
+        dialect: Dialect the statement runs on.
+
+    Returns:
+        Dictionary mapping column names to dtypes, or None if any column
+        does not qualify.
+    """
+    if not isinstance(stmt, Select):
+        return None
+
+    dtypes: dict[str, Any] = {}
+    for column in stmt.selected_columns:
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return None
+        impl = column.type.dialect_impl(dialect)
+        if (
+            python_type not in COLUMN_DTYPES
+            or impl.result_processor(dialect, None) is not None
+            or column.key in dtypes
+        ):
+            return None
+        dtypes[column.key] = COLUMN_DTYPES[python_type]
+    return dtypes
+
+
+def fetch_columnar(
+    conn: Connection,
+    stmt: Select[Any],
+    dtypes: dict[str, Any],
+    chunk_size: int = FETCH_CHUNK_SIZE,
+    params: Optional[dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """
+    Executes a statement and reads its cursor in chunks into typed columns.
+
+    Args:
+        conn: Database connection.
+        stmt: SQLAlchemy SELECT statement.
+        dtypes: Column dtypes, as returned by get_column_dtypes.
+        chunk_size: Number of rows fetched from the cursor at a time.
+        params: Values of the bound parameters of the statement.
+
+    Returns:
+        DataFrame with one typed column per selected column.
+    """
+    columns: list[list[Any]] = [[] for _ in dtypes]
+    result = conn.execute(stmt, params)
+    try:
+        cursor = result.cursor
+        while chunk := cursor.fetchmany(chunk_size):
+            for values, chunk_values in zip(columns, zip(*chunk)):
+                values.extend(chunk_values)
+    finally:
+        result.close()
+
+    return pd.DataFrame(
+        {
+            name: values_to_array(values, dtype)
+            for (name, dtype), values in zip(dtypes.items(), columns)
+        },
+        columns=list(dtypes),
+    )
+
+
+def fetch_frame(
+    conn: Connection, stmt: Select[Any], params: Optional[dict[str, Any]] = None
+) -> pd.DataFrame:
+    """
+    Executes a statement into a DataFrame, column by column when possible.
+
+    Statements with a column get_column_dtypes cannot type, such as one the
+    dialect converts, are read through SQLAlchemy rows instead.
+
+    Args:
+        conn: Database connection.
+        stmt: SQLAlchemy SELECT statement.
+        params: Values of the bound parameters of the statement.
+
+    Returns:
+        DataFrame with one column per selected column.
+    """
+    dtypes = get_column_dtypes(stmt, conn.dialect)
+    if dtypes is not None:
+        return fetch_columnar(conn, stmt, dtypes, params=params)
+    return pd.DataFrame(
+        conn.execute(stmt, params).all(), columns=list(stmt.selected_columns.keys())
+    )
+
+
+def values_to_array(values: list[Any], dtype: Any) -> Any:
+    """
+    Converts the values of a column to an array of its dtype.
+
+    Integer and boolean columns holding NULLs become pandas nullable arrays,
+    and NULLs in float columns become NaN.
+
+    Args:
+        values: Raw column values.
+        dtype: NumPy dtype of the column.
+
+    Returns:
+        NumPy array or pandas extension array.
+    """
+    if dtype is object:
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        return array
+    if dtype is np.float64:
+        return np.array(values, dtype=np.float64)
+    if None in values:
+        return pd.array(values, dtype="Int64" if dtype is np.int64 else "boolean")
+    return np.array(values, dtype=dtype)
@@ -1,28 +1,182 @@
 """Database connectivity for the HSR application."""
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import asyncio
+import os
+import threading
+from typing import Any, Optional
 
-DB_PATH = "hsr.db"
+from sqlalchemy import URL, Engine, create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
+from hsrws.db.migrations import migrate
+from hsrws.db.pragmas import install_sqlite_pragmas
 
-def get_engine():
+DEFAULT_DATABASE_URL = "sqlite:///hsr.db"
+
+# Environment variables holding pool settings, mapped to create_engine options.
+POOL_SETTINGS: dict[str, tuple[str, type]] = {
+    "HSR_DB_POOL_SIZE": ("pool_size", int),
+    "HSR_DB_MAX_OVERFLOW": ("max_overflow", int),
+    "HSR_DB_POOL_TIMEOUT": ("pool_timeout", float),
+    "HSR_DB_POOL_RECYCLE": ("pool_recycle", int),
+}
+
+# Async drivers of the dialects the async engine supports.
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+_engine: Optional[Engine] = None
+_session_factory: Optional[sessionmaker[Session]] = None
+_async_engine: Optional[AsyncEngine] = None
+_lock = threading.Lock()
+
+
+def get_database_url() -> str:
+    """
+    Gets the database URL.
+
+    Returns:
+        Value of the HSR_DATABASE_URL environment variable, or the local
+        hsr.db SQLite file if it is not set.
+    """
+    return os.getenv("HSR_DATABASE_URL", DEFAULT_DATABASE_URL)
+
+
+def get_engine_options(url: str) -> dict[str, Any]:
     """
-    Gets SQLAlchemy engine for the database.
+    Gets create_engine options from the pool environment variables.
+
+    Args:
+        url: Database URL the options are meant for.
+
+    Returns:
+        Keyword arguments for create_engine.
+    """
+    options: dict[str, Any] = {}
+    if os.getenv("HSR_DB_POOL_PRE_PING", "").lower() in ("true", "1", "t"):
+        options["pool_pre_ping"] = True
+
+    # In-memory SQLite uses a single-connection pool without overflow settings.
+    if make_url(url).database in (None, "", ":memory:"):
+        return options
+
+    for env_var, (option, cast) in POOL_SETTINGS.items():
+        value = os.getenv(env_var)
+        if value:
+            options[option] = cast(value)
+    return options
+
+
+def get_engine() -> Engine:
+    """
+    Gets the process-wide SQLAlchemy engine, creating it on first use.
+
+    Creating the engine upgrades the database to the latest schema, so the
+    schema is current before the process reads or writes any data. If the
+    upgrade fails, no engine is kept and the error is raised.
 
     Returns:
         SQLAlchemy engine object.
     """
-    return create_engine(f"sqlite:///{DB_PATH}")
+    global _engine, _session_factory
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                url = get_database_url()
+                engine = create_engine(url, **get_engine_options(url))
+                install_sqlite_pragmas(engine)
+                try:
+                    migrate(engine)
+                except Exception:
+                    engine.dispose()
+                    raise
+                # Published only once migrated, so a failed upgrade is
+                # retried by the next call.
+                _session_factory = sessionmaker(bind=engine)
+                _engine = engine
+    return _engine
 
 
-def get_session():
+def get_session() -> Session:
     """
-    Gets a SQLAlchemy session.
+    Gets a SQLAlchemy session from the process-wide session factory.
 
     Returns:
         SQLAlchemy session object.
     """
-    engine = get_engine()
-    Session = sessionmaker(bind=engine)
-    return Session()
+    get_engine()
+    assert _session_factory is not None
+    return _session_factory()
+
+
+def get_async_database_url(url: Optional[str] = None) -> URL:
+    """
+    Gets the URL of a database with its async driver.
+
+    Args:
+        url: Database URL, defaults to get_database_url().
+
+    Returns:
+        URL using the async driver of its dialect.
+
+    Raises:
+        ValueError: If the dialect has no supported async driver.
+    """
+    parsed = make_url(url or get_database_url())
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver is configured for {backend!r} databases")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+async def get_async_engine() -> AsyncEngine:
+    """
+    Gets the process-wide async SQLAlchemy engine, creating it on first use.
+
+    The schema is upgraded by creating the synchronous engine, in a worker
+    thread so the event loop is not blocked. The async engine does not pool
+    connections: async driver connections belong to the event loop that
+    opened them, and each asyncio.run call starts a new loop.
+
+    Returns:
+        SQLAlchemy async engine object.
+    """
+    global _async_engine
+    if _engine is None:
+        await asyncio.to_thread(get_engine)
+    with _lock:
+        if _async_engine is None:
+            _async_engine = create_async_engine(
+                get_async_database_url(), poolclass=NullPool
+            )
+            install_sqlite_pragmas(_async_engine.sync_engine)
+        return _async_engine
+
+
+def dispose_engine() -> None:
+    """
+    Closes every pooled connection and forgets the engines.
+
+    The next get_engine or get_async_engine call creates a new engine from
+    the current settings. The async engine holds no pooled connections.
+    """
+    global _engine, _session_factory, _async_engine
+    with _lock:
+        if _engine is not None:
+            _engine.dispose()
+        _engine = None
+        _session_factory = None
+        _async_engine = None
+
+
+def _dispose_after_fork() -> None:
+    """Drops connections inherited from the parent process without closing them."""
+    if _engine is not None:
+        _engine.dispose(close=False)
+
+
+# Gunicorn workers fork from the master; pooled connections must not be shared.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_after_fork)
@@ -0,0 +1,87 @@
+"""Dead-letter store for character entries that failed extraction."""
+
+import json
+from typing import Any, Iterable, Optional
+
+from loguru import logger
+from sqlalchemy import Engine, delete, insert, select, update
+
+from hsrws.db.database import get_engine
+from hsrws.db.models import DeadLetter
+
+
+def store_dead_letters(
+    run_id: str,
+    rejected: Iterable[tuple[Any, ...]],
+    engine: Optional[Engine] = None,
+) -> int:
+    """
+    Stores rejected character entries with their reason and run id.
+
+    Args:
+        run_id: Identifier of the scrape run.
+        rejected: Raw entry and rejection reason tuples, such as
+            RejectedEntry.
+        engine: SQLAlchemy engine, defaults to the application engine.
+
+    Returns:
+        Number of entries stored.
+    """
+    rows = [
+        {"RunId": run_id, "Reason": reason, "RawJson": json.dumps(entry)}
+        for entry, reason, *_ in rejected
+    ]
+    if not rows:
+        return 0
+
+    engine = engine or get_engine()
+    DeadLetter.__table__.create(engine, checkfirst=True)
+    with engine.begin() as conn:
+        conn.execute(insert(DeadLetter), rows)
+    logger.warning(f"Stored {len(rows)} malformed character entries for run {run_id}.")
+    return len(rows)
+
+
+def fetch_dead_letters(
+    run_id: Optional[str] = None, engine: Optional[Engine] = None
+) -> list[tuple[int, Any]]:
+    """
+    Fetches stored dead letters.
+
+    Args:
+        run_id: Only fetch entries of this run, all runs if None.
+        engine: SQLAlchemy engine, defaults to the application engine.
+
+    Returns:
+        List of (id, raw entry) pairs ordered by id.
+    """
+    engine = engine or get_engine()
+    DeadLetter.__table__.create(engine, checkfirst=True)
+    stmt = select(DeadLetter.Id, DeadLetter.RawJson).order_by(DeadLetter.Id)
+    if run_id is not None:
+        stmt = stmt.where(DeadLetter.RunId == run_id)
+    with engine.connect() as conn:
+        return [(row_id, json.loads(raw)) for row_id, raw in conn.execute(stmt)]
+
+
+def resolve_dead_letters(
+    resolved_ids: list[int],
+    failed: list[tuple[int, str]],
+    engine: Optional[Engine] = None,
+) -> None:
+    """
+    Deletes reprocessed dead letters and refreshes the reason of the rest.
+
+    Args:
+        resolved_ids: Ids of entries that were reprocessed successfully.
+        failed: Pairs of id and new reason for entries that still fail.
+        engine: SQLAlchemy engine, defaults to the application engine.
+    """
+    engine = engine or get_engine()
+    with engine.begin() as conn:
+        if resolved_ids:
+            conn.execute(delete(DeadLetter).where(DeadLetter.Id.in_(resolved_ids)))
+        for row_id, reason in failed:
+            conn.execute(
+                update(DeadLetter).where(DeadLetter.Id == row_id).values(Reason=reason)
+            )
@@ -0,0 +1,204 @@
+"""Streaming diff of two character snapshots."""
+
+from typing import Any, Iterable, Iterator, NamedTuple, Optional, Sequence, Union
+
+from sqlalchemy import Connection, Engine, func, select
+
+from hsrws.db.database import get_engine
+from hsrws.db.history import RUN_TABLE, STATE_COLUMNS, get_as_of_stmt, resolve_run
+
+FETCH_CHUNK_SIZE = 1000
+
+# Collations ordering strings by code point, as Python compares them. The
+# snapshots are read in this order so that merge_snapshots sees the same
+# order as its comparisons, whatever the database's default collation.
+BINARY_COLLATIONS = {"sqlite": "BINARY", "postgresql": "C"}
+
+RunReference = Union[int, float, str]
+
+
+class ColumnChange(NamedTuple):
+    """Change of one column of a character between two snapshots."""
+
+    column: str
+    old: Any
+    new: Any
+
+
+class ModifiedRow(NamedTuple):
+    """Character present in both snapshots with different values."""
+
+    character: str
+    changes: list[ColumnChange]
+
+
+class SnapshotDiff(NamedTuple):
+    """
+    Differences between an old and a new character snapshot.
+
+    Attributes:
+        old_run: Run number of the old snapshot.
+        new_run: Run number of the new snapshot.
+        added: Characters only in the new snapshot, keyed by column.
+        removed: Characters only in the old snapshot, keyed by column.
+        modified: Characters whose values changed, with per-column changes.
+    """
+
+    old_run: int
+    new_run: int
+    added: list[dict[str, Any]]
+    removed: list[dict[str, Any]]
+    modified: list[ModifiedRow]
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Converts the diff to JSON-serializable types.
+
+        Returns:
+            Dictionary with the runs, added and removed rows, and the
+            modified rows with a {column: {old, new}} mapping each.
+        """
+        return {
+            "old_run": self.old_run,
+            "new_run": self.new_run,
+            "added": self.added,
+            "removed": self.removed,
+            "modified": [
+                {
+                    "Character": row.character,
+                    "changes": {
+                        change.column: {"old": change.old, "new": change.new}
+                        for change in row.changes
+                    },
+                }
+                for row in self.modified
+            ],
+        }
+
+
+def merge_snapshots(
+    old_rows: Iterable[Sequence[Any]],
+    new_rows: Iterable[Sequence[Any]],
+) -> Iterator[tuple[str, Sequence[Any], Optional[Sequence[Any]]]]:
+    """
+    Sort-merge joins two snapshots ordered by their first column.
+
+    Rows are consumed one at a time, so memory does not grow with the
+    roster. Matching rows are compared value by value, and only rows that
+    differ are yielded.
+
+    Args:
+        old_rows: Rows of the old snapshot, ordered by key.
+        new_rows: Rows of the new snapshot, ordered by key.
+
+    Yields:
+        ('added', new row, None), ('removed', old row, None) or
+        ('modified', old row, new row).
+    """
+    old_iter, new_iter = iter(old_rows), iter(new_rows)
+    old_row, new_row = next(old_iter, None), next(new_iter, None)
+    while old_row is not None or new_row is not None:
+        if new_row is None or (old_row is not None and old_row[0] < new_row[0]):
+            yield "removed", old_row, None  # type: ignore
+            old_row = next(old_iter, None)
+        elif old_row is None or new_row[0] < old_row[0]:
+            yield "added", new_row, None
+            new_row = next(new_iter, None)
+        else:
+            if tuple(old_row) != tuple(new_row):
+                yield "modified", old_row, new_row
+            old_row, new_row = next(old_iter, None), next(new_iter, None)
+
+
+def _stream_rows(conn: Connection, stmt: Any) -> Iterator[Sequence[Any]]:
+    """
+    Streams the rows of a statement in chunks.
+
+    Drivers that buffer results client-side by default, such as psycopg,
+    read them from a server-side cursor instead.
+
+    Args:
+        conn: Database connection.
+        stmt: SQLAlchemy SELECT statement.
+
+    Yields:
+        Rows.
+    """
+    with conn.execute(
+        stmt, execution_options={"yield_per": FETCH_CHUNK_SIZE}
+    ) as result:
+        yield from result
+
+
+def diff_snapshots(
+    old: Optional[RunReference] = None,
+    new: Optional[RunReference] = None,
+    engine: Optional[Engine] = None,
+) -> SnapshotDiff:
+    """
+    Compares the characters of two recorded runs.
+
+    Args:
+        old: Run number, run id or patch version of the old snapshot,
+            defaults to the run before the new one.
+        new: Run number, run id or patch version of the new snapshot,
+            defaults to the latest run.
+        engine: SQLAlchemy engine, defaults to the application engine.
+
+    Returns:
+        Added, removed and modified characters.
+
+    Raises:
+        ValueError: If a run cannot be resolved.
+    """
+    engine = engine or get_engine()
+    with engine.connect() as conn:
+        if not conn.dialect.has_table(conn, RUN_TABLE.name):
+            raise ValueError("No run has been recorded yet")
+        latest_run = conn.execute(select(func.max(RUN_TABLE.c.RunNumber))).scalar()
+        new_run, new_max_version = (
+            resolve_run(conn, new) if new is not None else (latest_run, None)
+        )
+        if old is not None:
+            old_run, old_max_version = resolve_run(conn, old)
+        else:
+            old_run = conn.execute(
+                select(func.max(RUN_TABLE.c.RunNumber)).where(
+                    RUN_TABLE.c.RunNumber < new_run
+                )
+            ).scalar()
+            old_max_version = None
+            if old_run is None:
+                raise ValueError(f"No run recorded before run {new_run}")
+
+        collation = BINARY_COLLATIONS.get(conn.dialect.name)
+        old_stmt = get_as_of_stmt(
+            old_run, old_max_version, old_run == latest_run, collation
+        )
+        new_stmt = get_as_of_stmt(
+            new_run, new_max_version, new_run == latest_run, collation
+        )
+
+        diff = SnapshotDiff(old_run, new_run, [], [], [])
+        for kind, row, other in merge_snapshots(
+            _stream_rows(conn, old_stmt), _stream_rows(conn, new_stmt)
+        ):
+            if kind == "added":
+                diff.added.append(dict(zip(STATE_COLUMNS, row)))
+            elif kind == "removed":
+                diff.removed.append(dict(zip(STATE_COLUMNS, row)))
+            else:
+                assert other is not None
+                diff.modified.append(
+                    ModifiedRow(
+                        row[0],
+                        [
+                            ColumnChange(column, old_value, new_value)
+                            for column, old_value, new_value in zip(
+                                STATE_COLUMNS, row, other
+                            )
+                            if old_value != new_value
+                        ],
+                    )
+                )
+    return diff
@@ -0,0 +1,117 @@
+"""Normalized dimension and fact tables maintained from the character table."""
+
+from typing import Any
+
+from sqlalchemy import (
+    Connection,
+    Select,
+    String,
+    cast,
+    delete,
+    insert,
+    literal,
+    select,
+)
+
+from hsrws.db.models import (
+    CharacterFact,
+    ElementDimension,
+    HsrCharacter,
+    PathDimension,
+    RarityDimension,
+)
+
+CHARACTER_TABLE = HsrCharacter.__table__
+FACT_TABLE = CharacterFact.__table__
+PATH_TABLE = PathDimension.__table__
+ELEMENT_TABLE = ElementDimension.__table__
+RARITY_TABLE = RarityDimension.__table__
+
+# Fact columns holding the dimension key of a character column.
+KEY_COLUMNS = {"Path": PATH_TABLE.c.PathId, "Element": ELEMENT_TABLE.c.ElementId}
+
+# Name of the view over the facts created by schema migration 4, and dropped
+# by migration 7 since every reader queries HsrCharacters or the facts.
+CHARACTER_VIEW_NAME = "HsrCharactersView"
+
+
+def get_fact_rows_stmt() -> Select[Any]:
+    """
+    Returns the statement reading the characters with their dimension keys.
+
+    Returns:
+        SQLAlchemy SELECT statement with the CharacterFacts columns.
+    """
+    characters = CHARACTER_TABLE.c
+    return select(
+        *(KEY_COLUMNS.get(column.name, column) for column in CHARACTER_TABLE.columns)
+    ).select_from(
+        CHARACTER_TABLE.outerjoin(
+            PATH_TABLE, characters.Path == PATH_TABLE.c.Name
+        ).outerjoin(ELEMENT_TABLE, characters.Element == ELEMENT_TABLE.c.Name)
+    )
+
+
+def refresh_dimensions(conn: Connection) -> int:
+    """
+    Brings the fact table up to date with the character table.
+
+    Dimension values not seen before get a new key; existing keys never
+    change, so facts of other tables can keep referring to them. Only the
+    facts of new, changed or removed characters are written. Meant to run
+    inside the character load transaction.
+
+    Args:
+        conn: Connection inside the load transaction, after the upsert.
+
+    Returns:
+        Number of fact rows inserted for new or changed characters.
+    """
+    characters = CHARACTER_TABLE.c
+    for table, column in (
+        (PATH_TABLE, characters.Path),
+        (ELEMENT_TABLE, characters.Element),
+    ):
+        conn.execute(
+            insert(table).from_select(
+                ["Name"],
+                select(column)
+                .distinct()
+                .where(column.is_not(None), column.not_in(select(table.c.Name))),
+            )
+        )
+    conn.execute(
+        insert(RARITY_TABLE).from_select(
+            ["Rarity", "Label"],
+            select(
+                characters.Rarity, cast(characters.Rarity, String) + literal("-Star")
+            )
+            .distinct()
+            .where(
+                characters.Rarity.is_not(None),
+                characters.Rarity.not_in(select(RARITY_TABLE.c.Rarity)),
+            ),
+        )
+    )
+
+    # Like the history, only facts whose character changed are rewritten:
+    # facts without an identical character row are deleted, then characters
+    # without a fact are inserted. Keys of existing names never change.
+    fact_stmt = get_fact_rows_stmt()
+    facts = FACT_TABLE.c
+    same_fact = fact_stmt.where(
+        characters.Character == facts.Character,
+        *(
+            column.is_not_distinct_from(facts[column.name])
+            for column in fact_stmt.selected_columns
+            if column.name != "Character"
+        ),
+    )
+    conn.execute(delete(FACT_TABLE).where(~same_fact.exists()))
+    written = conn.execute(
+        insert(FACT_TABLE).from_select(
+            list(fact_stmt.selected_columns.keys()),
+            fact_stmt.where(characters.Character.not_in(select(facts.Character))),
+        )
+    ).rowcount
+    return written
@@ -0,0 +1,309 @@
+"""Columnar export of the character table as Parquet and Arrow IPC files.
+
+Every load writes the committed character table next to the SQLite
+database: a compressed Parquet file for notebooks and other tools, and an
+uncompressed Arrow IPC file that readers memory-map, so reloading the
+dataset costs no SQL and no copy of the numeric columns. Path and Element
+are dictionary-encoded in both files. Both need the optional pyarrow
+dependency.
+"""
+
+import importlib.util
+import os
+import uuid
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Union
+
+import pandas as pd
+from loguru import logger
+from sqlalchemy import URL, Connection, Engine, Float, Integer, SmallInteger, select
+from sqlalchemy.engine import make_url
+
+from hsrws.db.columnar import fetch_frame
+from hsrws.db.database import get_database_url
+from hsrws.db.generation import get_data_generation
+from hsrws.db.models import HsrCharacter
+
+CHARACTER_TABLE = HsrCharacter.__table__
+
+PARQUET_FILE_NAME = "HsrCharacters.parquet"
+ARROW_FILE_NAME = "HsrCharacters.arrow"
+
+# Low-cardinality text columns stored as dictionary codes.
+CATEGORICAL_COLUMNS = ("Path", "Element")
+
+# Schema metadata key holding the data generation the files were written at.
+GENERATION_METADATA_KEY = b"hsrws.data_generation"
+
+
+class CharacterExport(NamedTuple):
+    """Files written by a character export."""
+
+    parquet_path: Path
+    arrow_path: Path
+    rows: int
+    generation: int
+
+
+def pyarrow_available() -> bool:
+    """
+    Checks whether the optional pyarrow dependency is installed.
+
+    Returns:
+        True if pyarrow can be imported.
+    """
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def get_export_dir(url: Optional[Union[str, URL]] = None) -> Optional[Path]:
+    """
+    Gets the directory of the columnar export.
+
+    Args:
+        url: Database URL, defaults to get_database_url().
+
+    Returns:
+        Value of the HSR_EXPORT_DIR environment variable, the directory of a
+        file-based SQLite database if unset, or None if there is neither.
+    """
+    directory = os.getenv("HSR_EXPORT_DIR")
+    if directory:
+        return Path(directory)
+    url = make_url(url or get_database_url())
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return Path(url.database).parent
+
+
+def get_export_schema() -> Any:
+    """
+    Builds the Arrow schema of the exported character table.
+
+    Returns:
+        pyarrow schema with one field per HsrCharacters column.
+    """
+    import pyarrow as pa
+
+    fields = []
+    for column in CHARACTER_TABLE.columns:
+        if column.name in CATEGORICAL_COLUMNS:
+            arrow_type = pa.dictionary(pa.int32(), pa.string())
+        elif isinstance(column.type, SmallInteger):
+            arrow_type = pa.int16()
+        elif isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, Float):
+            arrow_type = pa.float64()
+        else:
+            arrow_type = pa.string()
+        fields.append(
+            pa.field(column.name, arrow_type, nullable=not column.primary_key)
+        )
+    return pa.schema(fields)
+
+
+def write_character_export(conn: Connection, directory: Path) -> CharacterExport:
+    """
+    Writes the character table to the Parquet and Arrow IPC files.
+
+    Each file is written to a temporary name and renamed into place, so
+    readers never see a partial file, and processes that mapped the previous
+    file keep reading it until they open the new one.
+
+    Args:
+        conn: Database connection; the table and data generation are read
+            in its transaction, so they describe the same state.
+        directory: Directory of the export files.
+
+    Returns:
+        Paths of the files, number of rows and data generation written.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    stmt = select(CHARACTER_TABLE).order_by(CHARACTER_TABLE.c.Character)
+    frame = fetch_frame(conn, stmt)
+    generation = get_data_generation(conn)
+
+    schema = get_export_schema().with_metadata(
+        {GENERATION_METADATA_KEY: str(generation).encode()}
+    )
+    arrays = []
+    for field in schema:
+        if pa.types.is_dictionary(field.type):
+            array = pa.array(frame[field.name], type=pa.string(), from_pandas=True)
+            arrays.append(array.dictionary_encode())
+        else:
+            arrays.append(
+                pa.array(frame[field.name], type=field.type, from_pandas=True)
+            )
+    table = pa.Table.from_arrays(arrays, schema=schema)
+
+    directory.mkdir(parents=True, exist_ok=True)
+    parquet_path = directory / PARQUET_FILE_NAME
+    arrow_path = directory / ARROW_FILE_NAME
+    _replace_file(
+        parquet_path,
+        lambda path: pq.write_table(
+            table, path, compression="zstd", use_dictionary=list(CATEGORICAL_COLUMNS)
+        ),
+    )
+
+    def write_arrow(path: Path) -> None:
+        # Uncompressed, so the record batches can be mapped without decoding.
+        with (
+            pa.OSFile(str(path), "wb") as sink,
+            pa.ipc.new_file(sink, schema) as writer,
+        ):
+            writer.write_table(table)
+
+    _replace_file(arrow_path, write_arrow)
+    return CharacterExport(parquet_path, arrow_path, table.num_rows, generation)
+
+
+def _replace_file(path: Path, write: Any) -> None:
+    """
+    Writes a file under a temporary name and renames it over the target.
+
+    Args:
+        path: Final path of the file.
+        write: Function writing the file to the path it is given.
+    """
+    temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def remove_character_export(directory: Path) -> None:
+    """
+    Deletes the export files of a directory.
+
+    Args:
+        directory: Directory of the export files.
+    """
+    for name in (PARQUET_FILE_NAME, ARROW_FILE_NAME):
+        (directory / name).unlink(missing_ok=True)
+
+
+def refresh_character_export(engine: Engine) -> Optional[CharacterExport]:
+    """
+    Rewrites the export files after a load.
+
+    A failed export only logs an error, since the database is already
+    committed. The previous files are deleted then, as well as when pyarrow
+    is not installed, so readers never prefer a stale export to the database.
+
+    Args:
+        engine: SQLAlchemy engine of the loaded database.
+
+    Returns:
+        Export written, or None if there is no export directory or the
+        export failed.
+    """
+    directory = get_export_dir(engine.url)
+    if directory is None:
+        return None
+    if not pyarrow_available():
+        remove_character_export(directory)
+        return None
+
+    try:
+        with engine.connect() as conn:
+            export = write_character_export(conn, directory)
+    except (OSError, ValueError) as e:
+        logger.error(f"Error writing the columnar export to {directory}: {e}")
+        remove_character_export(directory)
+        return None
+    logger.info(f"Exported {export.rows} characters to {directory}")
+    return export
+
+
+def read_export_table(path: Optional[Path] = None) -> Optional[Any]:
+    """
+    Memory-maps the Arrow IPC export.
+
+    The returned table references the mapped file instead of a copy of it,
+    so reading it costs no I/O until its values are used.
+
+    Args:
+        path: Arrow IPC file, defaults to the file of get_export_dir().
+
+    Returns:
+        pyarrow table, or None if the file does not exist or pyarrow is
+        not installed.
+    """
+    if path is None:
+        directory = get_export_dir()
+        if directory is None:
+            return None
+        path = directory / ARROW_FILE_NAME
+    if not pyarrow_available() or not path.exists():
+        return None
+
+    import pyarrow as pa
+
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def get_export_generation(table: Any) -> int:
+    """
+    Gets the data generation an export was written at.
+
+    Args:
+        table: Table read from the export.
+
+    Returns:
+        Data generation of the export, 0 if it was not recorded.
+    """
+    metadata = table.schema.metadata or {}
+    return int(metadata.get(GENERATION_METADATA_KEY, 0))
+
+
+def export_table_to_frame(table: Any) -> pd.DataFrame:
+    """
+    Converts an export table to a typed DataFrame.
+
+    Dictionary columns become categoricals sharing their codes. Numeric
+    columns without NULLs are views of the table buffers rather than copies;
+    integer columns holding NULLs become pandas nullable arrays.
+
+    Args:
+        table: Table read from the export.
+
+    Returns:
+        DataFrame with the HsrCharacters columns.
+    """
+    import pyarrow as pa
+
+    nullable_dtypes = {pa.int16(): pd.Int16Dtype(), pa.int64(): pd.Int64Dtype()}
+    frame = table.to_pandas(split_blocks=True)
+    for name in table.column_names:
+        column = table.column(name)
+        if column.type in nullable_dtypes and column.null_count:
+            frame[name] = column.to_pandas(types_mapper=nullable_dtypes.get)
+    return frame
+
+
+def read_character_export(path: Optional[Path] = None) -> pd.DataFrame:
+    """
+    Reads the character table from the Arrow IPC export.
+
+    Args:
+        path: Arrow IPC file, defaults to the file of get_export_dir().
+
+    Returns:
+        DataFrame with the HsrCharacters columns.
+
+    Raises:
+        FileNotFoundError: If there is no export to read.
+    """
+    table = read_export_table(path)
+    if table is None:
+        raise FileNotFoundError(
+            f"No columnar export found at {path or get_export_dir()}"
+        )
+    return export_table_to_frame(table)
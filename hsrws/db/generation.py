@@ -0,0 +1,48 @@
+"""Data generation counter bumped by every load of the database."""
+
+from sqlalchemy import Connection, insert, inspect, select, update
+
+from hsrws.db.models import DataGeneration
+
+GENERATION_TABLE = DataGeneration.__table__
+
+
+def get_data_generation(conn: Connection) -> int:
+    """
+    Gets the current data generation.
+
+    Args:
+        conn: Database connection.
+
+    Returns:
+        Number of loads written to the database, 0 if none was recorded.
+    """
+    if not inspect(conn).has_table(GENERATION_TABLE.name):
+        return 0
+    generation = conn.execute(
+        select(GENERATION_TABLE.c.Generation).where(GENERATION_TABLE.c.Id == 1)
+    ).scalar()
+    return generation or 0
+
+
+def bump_data_generation(conn: Connection) -> int:
+    """
+    Increments the data generation.
+
+    Meant to run inside the load transaction, so the new generation becomes
+    visible together with the data it describes.
+
+    Args:
+        conn: Connection inside the load transaction.
+
+    Returns:
+        New data generation.
+    """
+    result = conn.execute(
+        update(GENERATION_TABLE)
+        .where(GENERATION_TABLE.c.Id == 1)
+        .values(Generation=GENERATION_TABLE.c.Generation + 1)
+    )
+    if result.rowcount == 0:
+        conn.execute(insert(GENERATION_TABLE).values(Id=1, Generation=1))
+    return get_data_generation(conn)
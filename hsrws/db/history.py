@@ -0,0 +1,226 @@
+"""Run-versioned character history and time-travel queries."""
+
+import math
+from typing import Any, Optional, Union
+
+import pandas as pd
+from sqlalchemy import (
+    Connection,
+    Engine,
+    Select,
+    and_,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    update,
+)
+
+from hsrws.db.columnar import fetch_frame
+from hsrws.db.database import get_engine
+from hsrws.db.models import HsrCharacter, HsrCharacterHistory, ScrapeRun
+
+CHARACTER_TABLE = HsrCharacter.__table__
+HISTORY_TABLE = HsrCharacterHistory.__table__
+RUN_TABLE = ScrapeRun.__table__
+
+# Columns describing a character state, shared by the current and history tables.
+STATE_COLUMNS = [column.name for column in CHARACTER_TABLE.columns]
+
+
+def record_scrape_run(conn: Connection, run_id: str) -> int:
+    """
+    Records a load in the run log.
+
+    Args:
+        conn: Connection inside the load transaction, after the upsert.
+        run_id: Identifier of the scrape run that produced the load.
+
+    Returns:
+        Run number of the load.
+    """
+    latest_version = conn.execute(select(func.max(CHARACTER_TABLE.c.Version))).scalar()
+    result = conn.execute(
+        insert(RUN_TABLE).values(RunId=run_id, LatestVersion=latest_version)
+    )
+    return result.inserted_primary_key[0]
+
+
+def record_history(conn: Connection, run_number: int) -> dict[str, int]:
+    """
+    Appends the character states that changed in a load to the history.
+
+    Current history rows whose character was changed or removed are closed
+    at the run, and a row is opened for every new or changed character.
+    Unchanged characters write nothing.
+
+    Args:
+        conn: Connection inside the load transaction, after the upsert.
+        run_number: Run number of the load.
+
+    Returns:
+        Dictionary with the number of opened and closed history rows.
+    """
+    same_state = and_(
+        *(
+            CHARACTER_TABLE.c[name].is_not_distinct_from(HISTORY_TABLE.c[name])
+            for name in STATE_COLUMNS
+        )
+    )
+    closed = conn.execute(
+        update(HISTORY_TABLE)
+        .where(HISTORY_TABLE.c.ValidTo.is_(None), ~exists().where(same_state))
+        .values(ValidTo=run_number)
+    ).rowcount
+
+    current_characters = select(HISTORY_TABLE.c.Character).where(
+        HISTORY_TABLE.c.ValidTo.is_(None)
+    )
+    opened = conn.execute(
+        insert(HISTORY_TABLE).from_select(
+            [*STATE_COLUMNS, "ValidFrom"],
+            select(
+                *(CHARACTER_TABLE.c[name] for name in STATE_COLUMNS),
+                literal(run_number),
+            ).where(CHARACTER_TABLE.c.Character.not_in(current_characters)),
+        )
+    ).rowcount
+    return {"opened": opened, "closed": closed}
+
+
+def resolve_run(
+    conn: Connection, run_or_version: Union[int, float, str]
+) -> tuple[int, Optional[float]]:
+    """
+    Resolves a run number, run id or patch version to a run number.
+
+    A patch version resolves to the last run whose latest character version
+    did not exceed it, or to the first run if every run is newer; the roster
+    is then also limited to characters released up to that version.
+
+    Args:
+        conn: Database connection.
+        run_or_version: Run number (int), run id (str) or patch version (float).
+
+    Returns:
+        Run number and the maximum character version to include, if any.
+
+    Raises:
+        ValueError: If no matching run was recorded.
+    """
+    run_number: Optional[int]
+    max_version: Optional[float] = None
+    if isinstance(run_or_version, str):
+        run_number = conn.execute(
+            select(RUN_TABLE.c.RunNumber).where(RUN_TABLE.c.RunId == run_or_version)
+        ).scalar()
+    elif isinstance(run_or_version, float):
+        max_version = run_or_version
+        run_number = (
+            conn.execute(
+                select(func.max(RUN_TABLE.c.RunNumber)).where(
+                    RUN_TABLE.c.LatestVersion <= run_or_version
+                )
+            ).scalar()
+            or conn.execute(select(func.min(RUN_TABLE.c.RunNumber))).scalar()
+        )
+    else:
+        run_number = conn.execute(
+            select(RUN_TABLE.c.RunNumber).where(RUN_TABLE.c.RunNumber == run_or_version)
+        ).scalar()
+
+    if run_number is None:
+        raise ValueError(f"No recorded run matches {run_or_version!r}")
+    return run_number, max_version
+
+
+def parse_run_reference(value: str) -> Union[int, float, str]:
+    """
+    Parses a run reference given as text, e.g. on the command line.
+
+    Args:
+        value: Digits for a run number, a decimal for a patch version,
+            anything else for a run id.
+
+    Returns:
+        Run number (int), patch version (float) or run id (str).
+
+    Raises:
+        ValueError: If the reference is empty or a version that is not a
+            finite number.
+    """
+    value = value.strip()
+    if not value:
+        raise ValueError("Run reference must not be empty")
+    if value.isdigit():
+        return int(value)
+    try:
+        version = float(value)
+    except ValueError:
+        return value
+    if not math.isfinite(version):
+        raise ValueError(f"Patch version must be a finite number, not {value!r}")
+    return version
+
+
+def get_as_of_stmt(
+    run_number: int,
+    max_version: Optional[float] = None,
+    current: bool = False,
+    collation: Optional[str] = None,
+) -> Select[Any]:
+    """
+    Returns the statement to get the characters as they were after a run.
+
+    Args:
+        run_number: Run number.
+        max_version: Only include characters released up to this version.
+        current: The run is the latest one, so the current table is read
+            instead of the history.
+        collation: Collation to order the characters by, defaults to the
+            column's collation.
+
+    Returns:
+        SQLAlchemy SELECT statement with the HsrCharacters columns.
+    """
+    if current:
+        table = CHARACTER_TABLE
+        stmt = select(*(table.c[name] for name in STATE_COLUMNS))
+    else:
+        table = HISTORY_TABLE
+        stmt = select(*(table.c[name] for name in STATE_COLUMNS)).where(
+            table.c.ValidFrom <= run_number,
+            or_(table.c.ValidTo.is_(None), table.c.ValidTo > run_number),
+        )
+    if max_version is not None:
+        stmt = stmt.where(table.c.Version <= max_version)
+    order = table.c.Character
+    return stmt.order_by(order.collate(collation) if collation else order)
+
+
+def as_of(
+    run_or_version: Union[int, float, str], engine: Optional[Engine] = None
+) -> pd.DataFrame:
+    """
+    Gets the characters as they were after a run or at a patch version.
+
+    Args:
+        run_or_version: Run number (int), run id (str) or patch version (float).
+        engine: SQLAlchemy engine, defaults to the application engine.
+
+    Returns:
+        DataFrame with the HsrCharacters columns, one row per character.
+
+    Raises:
+        ValueError: If no matching run was recorded.
+    """
+    engine = engine or get_engine()
+    with engine.connect() as conn:
+        if not conn.dialect.has_table(conn, RUN_TABLE.name):
+            raise ValueError("No run has been recorded yet")
+        run_number, max_version = resolve_run(conn, run_or_version)
+        latest_run = conn.execute(select(func.max(RUN_TABLE.c.RunNumber))).scalar()
+        stmt = get_as_of_stmt(run_number, max_version, current=run_number == latest_run)
+        return fetch_frame(conn, stmt)
@@ -0,0 +1,152 @@
+"""Versioned schema migrations.
+
+Each module of hsrws.db.migrations.versions is one migration, named
+v<version>_<name>, with an upgrade(conn) function. Pending migrations run
+in version order inside one transaction, and every applied version is
+recorded in the SchemaVersion table. Upgrades are serialized, so processes
+starting together against a new database apply each migration once.
+
+The first migration creates missing tables from the current models, so a
+new database already has the latest schema; later migrations must therefore
+be idempotent and only change databases that lack their change.
+"""
+
+import importlib
+import pkgutil
+from typing import Callable, NamedTuple, Optional
+
+from loguru import logger
+from sqlalchemy import Connection, Engine, func, insert, inspect, select
+
+from hsrws.db.migrations import versions
+from hsrws.db.models import SchemaVersion
+from hsrws.db.pragmas import begin_write
+
+SCHEMA_VERSION_TABLE = SchemaVersion.__table__
+
+# Key of the PostgreSQL advisory lock held while upgrading the schema.
+SCHEMA_LOCK_KEY = 0x48535253
+
+
+class Migration(NamedTuple):
+    """Schema migration loaded from a versions module."""
+
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def load_migrations() -> list[Migration]:
+    """
+    Loads the migrations of the versions package.
+
+    Returns:
+        Migrations ordered by version.
+
+    Raises:
+        ValueError: If a module name is malformed or a version is repeated.
+    """
+    migrations: list[Migration] = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        prefix, _, name = module_info.name.partition("_")
+        if not (prefix.startswith("v") and prefix[1:].isdigit() and name):
+            raise ValueError(f"Malformed migration module name {module_info.name!r}")
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        migrations.append(Migration(int(prefix[1:]), name, module.upgrade))
+
+    migrations.sort(key=lambda migration: migration.version)
+    numbers = [migration.version for migration in migrations]
+    if len(set(numbers)) != len(numbers):
+        raise ValueError(f"Repeated migration versions in {numbers}")
+    return migrations
+
+
+MIGRATIONS = load_migrations()
+
+
+def get_schema_version(conn: Connection) -> int:
+    """
+    Gets the version of the database schema.
+
+    Args:
+        conn: Database connection.
+
+    Returns:
+        Highest applied migration version, 0 if none was applied.
+    """
+    if not inspect(conn).has_table(SCHEMA_VERSION_TABLE.name):
+        return 0
+    version = conn.execute(select(func.max(SCHEMA_VERSION_TABLE.c.Version))).scalar()
+    return version or 0
+
+
+def lock_schema(conn: Connection) -> None:
+    """
+    Serializes schema upgrades until the end of the transaction.
+
+    PostgreSQL takes a transaction-scoped advisory lock. SQLite transactions
+    opened with begin_write already hold the database write lock.
+
+    Args:
+        conn: Connection inside a transaction.
+    """
+    if conn.dialect.name == "postgresql":
+        conn.execute(select(func.pg_advisory_xact_lock(SCHEMA_LOCK_KEY)))
+
+
+def upgrade_schema(
+    conn: Connection, migrations: Optional[list[Migration]] = None
+) -> list[int]:
+    """
+    Applies the pending migrations on a connection.
+
+    When migrations are pending, the schema lock is taken and the version is
+    read again, so a concurrent upgrade is not applied twice.
+
+    Args:
+        conn: Connection inside a transaction, which the migrations join. On
+            SQLite it must be opened with begin_write.
+        migrations: Migrations to consider, defaults to MIGRATIONS.
+
+    Returns:
+        Versions applied, in order.
+    """
+    migrations = MIGRATIONS if migrations is None else migrations
+    latest = max((migration.version for migration in migrations), default=0)
+    if get_schema_version(conn) >= latest:
+        return []
+
+    lock_schema(conn)
+    current = get_schema_version(conn)
+    pending = [migration for migration in migrations if migration.version > current]
+    if not pending:
+        return []
+
+    SCHEMA_VERSION_TABLE.create(conn, checkfirst=True)
+    for migration in pending:
+        logger.info(f"Applying schema migration {migration.version}: {migration.name}")
+        migration.upgrade(conn)
+        conn.execute(
+            insert(SCHEMA_VERSION_TABLE).values(
+                Version=migration.version, Name=migration.name
+            )
+        )
+    return [migration.version for migration in pending]
+
+
+def migrate(engine: Engine) -> int:
+    """
+    Upgrades a database to the latest schema in one transaction.
+
+    Args:
+        engine: SQLAlchemy engine of the database.
+
+    Returns:
+        Schema version after the upgrade.
+    """
+    with begin_write(engine) as conn:
+        applied = upgrade_schema(conn)
+        version = get_schema_version(conn)
+    if applied:
+        logger.info(f"Upgraded database schema to version {version}")
+    return version
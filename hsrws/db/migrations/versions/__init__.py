@@ -0,0 +1 @@
+"""Schema migrations, one module per version."""
@@ -0,0 +1,15 @@
+"""Create the tables of the models that do not exist yet."""
+
+from sqlalchemy import Connection
+
+from hsrws.db.models import Base
+
+
+def upgrade(conn: Connection) -> None:
+    """
+    Creates every missing model table with its indexes.
+
+    Args:
+        conn: Connection inside the migration transaction.
+    """
+    Base.metadata.create_all(conn)
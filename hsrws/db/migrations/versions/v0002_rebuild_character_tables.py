@@ -0,0 +1,24 @@
+"""Rebuild character tables written before the models defined their schema."""
+
+from sqlalchemy import Connection
+
+from hsrws.db.models import HsrCharacter, HsrCharacterHistory
+from hsrws.db.schema import LEGACY_CHARACTER_CASTS, rebuild_table, table_matches_model
+
+
+def upgrade(conn: Connection) -> None:
+    """
+    Rebuilds the character tables whose schema differs from the model.
+
+    Covers tables written by pandas' to_sql, with no primary key and an
+    extra index column, and tables with text rarities. Those only exist in
+    SQLite files, so other dialects are left as created by the models.
+
+    Args:
+        conn: Connection inside the migration transaction.
+    """
+    if conn.dialect.name != "sqlite":
+        return
+    for table in (HsrCharacter.__table__, HsrCharacterHistory.__table__):
+        if not table_matches_model(conn, table):
+            rebuild_table(conn, table, LEGACY_CHARACTER_CASTS)
@@ -0,0 +1,17 @@
+"""Add the model indexes missing from existing tables."""
+
+from sqlalchemy import Connection
+
+from hsrws.db.models import Base
+
+
+def upgrade(conn: Connection) -> None:
+    """
+    Creates every model index that does not exist yet.
+
+    Args:
+        conn: Connection inside the migration transaction.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
@@ -0,0 +1,15 @@
+"""Create the view joining the character facts to their dimensions."""
+
+from sqlalchemy import Connection
+
+
+def upgrade(conn: Connection) -> None:
+    """
+    Creates nothing any more.
+
+    No reader used the HsrCharactersView view, so new databases skip it and
+    migration 7 drops it from databases that have it.
+
+    Args:
+        conn: Connection inside the migration transaction.
+    """
@@ -0,0 +1,16 @@
+"""Create the FTS5 character search table and index the existing characters."""
+
+from sqlalchemy import Connection
+
+from hsrws.db.search import create_search_table, refresh_character_search
+
+
+def upgrade(conn: Connection) -> None:
+    """
+    Creates the CharacterSearch table and fills it from HsrCharacters.
+
+    Args:
+        conn: Connection inside the migration transaction.
+    """
+    create_search_table(conn)
+    refresh_character_search(conn)
@@ -0,0 +1,15 @@
+"""Fill the fact tables of databases loaded before they existed."""
+
+from sqlalchemy import Connection
+
+from hsrws.db.dimensions import refresh_dimensions
+
+
+def upgrade(conn: Connection) -> None:
+    """
+    Rebuilds the dimension and fact tables from the character table.
+
+    Args:
+        conn: Connection inside the migration transaction.
+    """
+    refresh_dimensions(conn)
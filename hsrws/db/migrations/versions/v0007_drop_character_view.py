@@ -0,0 +1,15 @@
+"""Drop the unused view joining the character facts to their dimensions."""
+
+from sqlalchemy import Connection
+
+from hsrws.db.dimensions import CHARACTER_VIEW_NAME
+
+
+def upgrade(conn: Connection) -> None:
+    """
+    Drops the HsrCharactersView view if it exists.
+
+    Args:
+        conn: Connection inside the migration transaction.
+    """
+    conn.exec_driver_sql(f'DROP VIEW IF EXISTS "{CHARACTER_VIEW_NAME}"')
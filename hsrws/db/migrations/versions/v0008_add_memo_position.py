@@ -0,0 +1,26 @@
+"""Add the recency column to transform memo tables created without it."""
+
+from sqlalchemy import Connection, inspect
+
+from hsrws.db.models import TransformMemoEntry
+
+
+def upgrade(conn: Connection) -> None:
+    """
+    Adds the Position column to an existing TransformMemo table.
+
+    Stored entries all get position 0 and are ranked again on the next save.
+
+    Args:
+        conn: Connection inside the migration transaction.
+    """
+    table = TransformMemoEntry.__table__
+    inspector = inspect(conn)
+    if not inspector.has_table(table.name):
+        return
+    columns = {column["name"] for column in inspector.get_columns(table.name)}
+    if "Position" not in columns:
+        conn.exec_driver_sql(
+            f'ALTER TABLE "{table.name}" '
+            'ADD COLUMN "Position" INTEGER NOT NULL DEFAULT 0'
+        )
@@ -1,5 +1,31 @@
 """Database models for the HSR application."""
 
 from hsrws.db.models.characters import HsrCharacter, Base
+from hsrws.db.models.chart_aggregates import ChartAggregate
+from hsrws.db.models.data_generation import DataGeneration
+from hsrws.db.models.dead_letters import DeadLetter
+from hsrws.db.models.dimensions import (
+    CharacterFact,
+    ElementDimension,
+    PathDimension,
+    RarityDimension,
+)
+from hsrws.db.models.history import HsrCharacterHistory, ScrapeRun
+from hsrws.db.models.schema_version import SchemaVersion
+from hsrws.db.models.transform_memo import TransformMemoEntry
 
-__all__ = ["HsrCharacter", "Base"]
+__all__ = [
+    "HsrCharacter",
+    "Base",
+    "CharacterFact",
+    "ChartAggregate",
+    "DataGeneration",
+    "DeadLetter",
+    "ElementDimension",
+    "HsrCharacterHistory",
+    "PathDimension",
+    "RarityDimension",
+    "ScrapeRun",
+    "SchemaVersion",
+    "TransformMemoEntry",
+]
@@ -1,7 +1,15 @@
 """SQLAlchemy models for the HSR characters database."""
 
 from sqlalchemy.orm import declarative_base  # Updated import path
-from sqlalchemy import Column, String, Float
+from sqlalchemy import (
+    CheckConstraint,
+    Column,
+    Float,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+)
 
 Base = declarative_base()
 
@@ -14,14 +22,62 @@ class HsrCharacter(Base):
         Character: Character name (primary key).
         Path: Character's path.
         Element: Character's element.
-        Rarity: Character's rarity.
+        Rarity: Character's rarity in stars.
+        ATK_Lvl_80: Base ATK at level 80.
+        DEF_Lvl_80: Base DEF at level 80.
+        HP_Lvl_80: Base HP at level 80.
+        SPD_Lvl_80: Base SPD at level 80.
         Version: Version the character was released in.
     """
 
     __tablename__ = "HsrCharacters"
+    # Covering indexes matching the GROUP BY patterns of the character_stats
+    # queries, so each one is an index scan without a sort.
+    __table_args__ = (
+        Index("ix_HsrCharacters_Element_Path", "Element", "Path"),
+        Index("ix_HsrCharacters_Rarity_Element", "Rarity", "Element"),
+        Index("ix_HsrCharacters_Path_Rarity", "Path", "Rarity"),
+        Index(
+            "ix_HsrCharacters_Version_Element_Path_Rarity",
+            "Version",
+            "Element",
+            "Path",
+            "Rarity",
+        ),
+        Index("ix_HsrCharacters_Element_Version", "Element", "Version"),
+        Index("ix_HsrCharacters_Path_Version", "Path", "Version"),
+        # Covering indexes of the stat aggregations per element and path.
+        Index(
+            "ix_HsrCharacters_Element_Stats",
+            "Element",
+            "ATK Lvl 80",
+            "DEF Lvl 80",
+            "HP Lvl 80",
+            "SPD Lvl 80",
+        ),
+        Index(
+            "ix_HsrCharacters_Path_Stats",
+            "Path",
+            "ATK Lvl 80",
+            "DEF Lvl 80",
+            "HP Lvl 80",
+            "SPD Lvl 80",
+        ),
+        CheckConstraint('"Rarity" BETWEEN 1 AND 5', name="ck_HsrCharacters_Rarity"),
+        CheckConstraint(
+            '"ATK Lvl 80" >= 0 AND "DEF Lvl 80" >= 0 '
+            'AND "HP Lvl 80" >= 0 AND "SPD Lvl 80" >= 0',
+            name="ck_HsrCharacters_Stats",
+        ),
+        CheckConstraint('"Version" > 0', name="ck_HsrCharacters_Version"),
+    )
 
     Character = Column(String, primary_key=True)
     Path = Column(String)
     Element = Column(String)
-    Rarity = Column(String)
+    Rarity = Column(SmallInteger)
+    ATK_Lvl_80 = Column("ATK Lvl 80", Integer)
+    DEF_Lvl_80 = Column("DEF Lvl 80", Integer)
+    HP_Lvl_80 = Column("HP Lvl 80", Integer)
+    SPD_Lvl_80 = Column("SPD Lvl 80", Integer)
     Version: Column[float] = Column(Float)
@@ -0,0 +1,30 @@
+"""SQLAlchemy model for the materialized chart aggregates table."""
+
+from sqlalchemy import Column, Float, Integer, String
+
+from hsrws.db.models.characters import Base
+
+
+class ChartAggregate(Base):
+    """
+    SQLAlchemy model for ChartAggregates table.
+
+    Each row is one output row of a chart dataset, stored in dataset order.
+
+    Attributes:
+        Dataset: Name of the chart dataset (primary key).
+        Position: Row position within the dataset (primary key).
+        Key1: First categorical key, such as the Element of a crosstab.
+        Key2: Second categorical key, such as the Path of a crosstab.
+        Version: Version key of timeline and evolution datasets.
+        Count: Character count.
+    """
+
+    __tablename__ = "ChartAggregates"
+
+    Dataset = Column(String, primary_key=True)
+    Position = Column(Integer, primary_key=True)
+    Key1 = Column(String)
+    Key2 = Column(String)
+    Version = Column(Float)
+    Count = Column(Integer, nullable=False)
@@ -0,0 +1,23 @@
+"""SQLAlchemy model for the data generation counter."""
+
+from sqlalchemy import Column, Integer
+
+from hsrws.db.models.characters import Base
+
+
+class DataGeneration(Base):
+    """
+    SQLAlchemy model for DataGeneration table.
+
+    The table holds a single row whose counter is incremented by every load,
+    so readers can tell whether cached query results are still current.
+
+    Attributes:
+        Id: Row identifier, always 1 (primary key).
+        Generation: Number of loads written to the database.
+    """
+
+    __tablename__ = "DataGeneration"
+
+    Id = Column(Integer, primary_key=True)
+    Generation = Column(Integer, nullable=False)
@@ -0,0 +1,28 @@
+"""SQLAlchemy model for the dead-letter store of malformed character entries."""
+
+from sqlalchemy import Column, DateTime, Integer, String, Text, func
+
+from hsrws.db.models.characters import Base
+
+
+class DeadLetter(Base):
+    """
+    SQLAlchemy model for DeadLetters table.
+
+    Attributes:
+        Id: Surrogate key (primary key).
+        RunId: Identifier of the scrape run that rejected the entry.
+        Reason: Why the entry failed extraction.
+        RawJson: Raw JSON of the character entry.
+        CreatedAt: When the entry was stored.
+    """
+
+    __tablename__ = "DeadLetters"
+
+    Id = Column(Integer, primary_key=True, autoincrement=True)
+    RunId = Column(String, nullable=False, index=True)
+    Reason = Column(String, nullable=False)
+    RawJson = Column(Text, nullable=False)
+    CreatedAt = Column(
+        DateTime, nullable=False, server_default=func.current_timestamp()
+    )
@@ -0,0 +1,101 @@
+"""SQLAlchemy models for the normalized character dimension and fact tables."""
+
+from sqlalchemy import (
+    Column,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+)
+
+from hsrws.db.models.characters import Base
+
+
+class PathDimension(Base):
+    """
+    SQLAlchemy model for Paths table.
+
+    Attributes:
+        PathId: Surrogate key (primary key).
+        Name: Path name.
+    """
+
+    __tablename__ = "Paths"
+
+    PathId = Column(Integer, primary_key=True, autoincrement=True)
+    Name = Column(String, nullable=False, unique=True)
+
+
+class ElementDimension(Base):
+    """
+    SQLAlchemy model for Elements table.
+
+    Attributes:
+        ElementId: Surrogate key (primary key).
+        Name: Element name.
+    """
+
+    __tablename__ = "Elements"
+
+    ElementId = Column(Integer, primary_key=True, autoincrement=True)
+    Name = Column(String, nullable=False, unique=True)
+
+
+class RarityDimension(Base):
+    """
+    SQLAlchemy model for Rarities table.
+
+    Attributes:
+        Rarity: Rarity in stars (primary key).
+        Label: Display label, such as '5-Star'.
+    """
+
+    __tablename__ = "Rarities"
+
+    Rarity = Column(SmallInteger, primary_key=True, autoincrement=False)
+    Label = Column(String, nullable=False)
+
+
+class CharacterFact(Base):
+    """
+    SQLAlchemy model for CharacterFacts table.
+
+    The HsrCharacters rows with the Path and Element strings replaced by
+    integer keys of the dimension tables.
+
+    Attributes:
+        Character: Character name (primary key).
+        PathId: Key of the character's path.
+        ElementId: Key of the character's element.
+        Rarity: Character's rarity in stars.
+        ATK_Lvl_80: Base ATK at level 80.
+        DEF_Lvl_80: Base DEF at level 80.
+        HP_Lvl_80: Base HP at level 80.
+        SPD_Lvl_80: Base SPD at level 80.
+        Version: Version the character was released in.
+    """
+
+    __tablename__ = "CharacterFacts"
+    __table_args__ = (
+        Index(
+            "ix_CharacterFacts_Version_ElementId_PathId_Rarity",
+            "Version",
+            "ElementId",
+            "PathId",
+            "Rarity",
+        ),
+        Index("ix_CharacterFacts_PathId", "PathId"),
+        Index("ix_CharacterFacts_ElementId", "ElementId"),
+    )
+
+    Character = Column(String, primary_key=True)
+    PathId = Column(Integer, ForeignKey("Paths.PathId"))
+    ElementId = Column(Integer, ForeignKey("Elements.ElementId"))
+    Rarity = Column(SmallInteger, ForeignKey("Rarities.Rarity"))
+    ATK_Lvl_80 = Column("ATK Lvl 80", Integer)
+    DEF_Lvl_80 = Column("DEF Lvl 80", Integer)
+    HP_Lvl_80 = Column("HP Lvl 80", Integer)
+    SPD_Lvl_80 = Column("SPD Lvl 80", Integer)
+    Version = Column(Float)
@@ -0,0 +1,73 @@
+"""SQLAlchemy models for the scrape run log and the character history."""
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    func,
+)
+
+from hsrws.db.models.characters import Base
+
+
+class ScrapeRun(Base):
+    """
+    SQLAlchemy model for ScrapeRuns table.
+
+    Attributes:
+        RunNumber: Sequential number of the load (primary key).
+        RunId: Identifier of the scrape run that produced the load.
+        LatestVersion: Latest character release version after the load.
+        LoadedAt: When the load was committed.
+    """
+
+    __tablename__ = "ScrapeRuns"
+
+    RunNumber = Column(Integer, primary_key=True, autoincrement=True)
+    RunId = Column(String, nullable=False, unique=True)
+    LatestVersion = Column(Float)
+    LoadedAt = Column(DateTime, nullable=False, server_default=func.current_timestamp())
+
+
+class HsrCharacterHistory(Base):
+    """
+    SQLAlchemy model for HsrCharacterHistory table.
+
+    Each row is a state of a character, valid from the run that wrote it
+    until the run that changed or removed it.
+
+    Attributes:
+        Character: Character name (primary key).
+        ValidFrom: Run number from which the state is valid (primary key).
+        ValidTo: Run number from which the state is no longer valid, None
+            while it is current.
+        Path: Character's path.
+        Element: Character's element.
+        Rarity: Character's rarity in stars.
+        ATK_Lvl_80: Base ATK at level 80.
+        DEF_Lvl_80: Base DEF at level 80.
+        HP_Lvl_80: Base HP at level 80.
+        SPD_Lvl_80: Base SPD at level 80.
+        Version: Version the character was released in.
+    """
+
+    __tablename__ = "HsrCharacterHistory"
+    __table_args__ = (
+        Index("ix_HsrCharacterHistory_ValidTo_ValidFrom", "ValidTo", "ValidFrom"),
+    )
+
+    Character = Column(String, primary_key=True)
+    ValidFrom = Column(Integer, primary_key=True)
+    ValidTo = Column(Integer)
+    Path = Column(String)
+    Element = Column(String)
+    Rarity = Column(SmallInteger)
+    ATK_Lvl_80 = Column("ATK Lvl 80", Integer)
+    DEF_Lvl_80 = Column("DEF Lvl 80", Integer)
+    HP_Lvl_80 = Column("HP Lvl 80", Integer)
+    SPD_Lvl_80 = Column("SPD Lvl 80", Integer)
+    Version = Column(Float)
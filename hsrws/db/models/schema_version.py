@@ -0,0 +1,27 @@
+"""SQLAlchemy model for the applied schema migrations."""
+
+from sqlalchemy import Column, DateTime, Integer, String, func
+
+from hsrws.db.models.characters import Base
+
+
+class SchemaVersion(Base):
+    """
+    SQLAlchemy model for SchemaVersion table.
+
+    Each row is a schema migration applied to the database; the highest
+    version is the version of the schema.
+
+    Attributes:
+        Version: Version the migration upgrades the schema to (primary key).
+        Name: Name of the migration.
+        AppliedAt: When the migration was committed.
+    """
+
+    __tablename__ = "SchemaVersion"
+
+    Version = Column(Integer, primary_key=True, autoincrement=False)
+    Name = Column(String, nullable=False)
+    AppliedAt = Column(
+        DateTime, nullable=False, server_default=func.current_timestamp()
+    )
@@ -0,0 +1,26 @@
+"""SQLAlchemy model for the persistent transform memo table."""
+
+from sqlalchemy import Column, Integer, String
+
+from hsrws.db.models.characters import Base
+
+
+class TransformMemoEntry(Base):
+    """
+    SQLAlchemy model for TransformMemo table.
+
+    Attributes:
+        Transform: Name of the transform function (primary key).
+        Raw: Raw input value (primary key).
+        Fingerprint: Fingerprint of the transform logic that produced the value.
+        Normalized: JSON-encoded normalized value.
+        Position: Recency rank of the entry, the most recently used is highest.
+    """
+
+    __tablename__ = "TransformMemo"
+
+    Transform = Column(String, primary_key=True)
+    Raw = Column(String, primary_key=True)
+    Fingerprint = Column(String, nullable=False)
+    Normalized = Column(String, nullable=False)
+    Position = Column(Integer, nullable=False, server_default="0")
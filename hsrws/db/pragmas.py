@@ -0,0 +1,181 @@
+"""SQLite connection settings shared by every engine of the application."""
+
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.exc import DisconnectionError
+
+DEFAULT_JOURNAL_MODE = "WAL"
+
+# Execution option naming the SQLite BEGIN mode of a transaction.
+SQLITE_BEGIN_OPTION = "sqlite_begin"
+
+# Connection info keys: inode of the database file the connection opened, and
+# its total_changes when the current transaction began.
+INODE_INFO_KEY = "sqlite_inode"
+CHANGES_INFO_KEY = "sqlite_total_changes"
+
+SQLITE_PRAGMAS: dict[str, Any] = {
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,  # Negative values are KiB
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+    "foreign_keys": "ON",
+}
+
+
+class DatabaseReplacedError(DisconnectionError):
+    """Raised when the database file was replaced under an open connection."""
+
+
+def get_journal_mode() -> str:
+    """
+    Gets the SQLite journal mode.
+
+    Returns:
+        Value of the HSR_SQLITE_JOURNAL_MODE environment variable, WAL if unset.
+    """
+    return os.getenv("HSR_SQLITE_JOURNAL_MODE", DEFAULT_JOURNAL_MODE).upper()
+
+
+def apply_sqlite_pragmas(
+    dbapi_connection: Any, journal_mode: Optional[str] = None
+) -> None:
+    """
+    Applies the journal mode and performance PRAGMAs to a DBAPI connection.
+
+    Args:
+        dbapi_connection: sqlite3 connection.
+        journal_mode: Journal mode, defaults to get_journal_mode().
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        # Switching a new database to WAL takes a lock, so wait for it like
+        # for any other lock.
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_PRAGMAS['busy_timeout']}")
+        cursor.execute(f"PRAGMA journal_mode={journal_mode or get_journal_mode()}")
+        for pragma, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma}={value}")
+    finally:
+        cursor.close()
+
+
+def database_inode(path: str) -> Optional[int]:
+    """
+    Gets the inode of a database file.
+
+    Args:
+        path: Path of the database file.
+
+    Returns:
+        Inode number, None if the file does not exist.
+    """
+    try:
+        return os.stat(path).st_ino
+    except FileNotFoundError:
+        return None
+
+
+def install_sqlite_pragmas(engine: Engine, journal_mode: Optional[str] = None) -> None:
+    """
+    Applies the SQLite PRAGMAs to every new connection of an engine.
+
+    Transactions are begun explicitly, so DDL statements are transactional
+    like any other statement. A connection with the SQLITE_BEGIN_OPTION
+    execution option begins them in that mode, such as IMMEDIATE.
+
+    A snapshot swap renames a new file over the database, and connections
+    opened before keep the replaced file open. For file databases, such a
+    connection is reconnected when it is checked out of the pool, and a
+    transaction that wrote to the replaced file fails at commit with
+    DatabaseReplacedError instead of losing its writes.
+
+    Engines of other dialects are left untouched.
+
+    Args:
+        engine: SQLAlchemy engine.
+        journal_mode: Journal mode, defaults to get_journal_mode().
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    database = engine.url.database
+    path = None if database in (None, "", ":memory:") else database
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        apply_sqlite_pragmas(dbapi_connection, journal_mode)
+        # Leave transaction control to SQLAlchemy, see _on_begin.
+        dbapi_connection.isolation_level = None
+        if path is not None:
+            connection_record.info[INODE_INFO_KEY] = database_inode(path)
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(connection: Any) -> None:
+        # The sqlite3 driver only opens a transaction before DML statements,
+        # so DDL such as a schema migration would otherwise autocommit.
+        mode = connection.get_execution_options().get(SQLITE_BEGIN_OPTION)
+        connection.exec_driver_sql(f"BEGIN {mode}" if mode else "BEGIN")
+        if path is not None:
+            connection.info[CHANGES_INFO_KEY] = _total_changes(connection)
+
+    if path is None:
+        return
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(
+        _dbapi_connection: Any, connection_record: Any, _connection_proxy: Any
+    ) -> None:
+        # The pool reconnects when a checkout raises DisconnectionError.
+        if connection_record.info.get(INODE_INFO_KEY) != database_inode(path):
+            raise DatabaseReplacedError(f"{path} was replaced")
+
+    @event.listens_for(engine, "commit")
+    def _on_commit(connection: Any) -> None:
+        # A writer waiting on the lock of a swap gets it on the replaced file.
+        if connection.info.get(INODE_INFO_KEY) == database_inode(path):
+            return
+        changes = _total_changes(connection)
+        if changes is None or changes != connection.info.get(CHANGES_INFO_KEY):
+            connection.exec_driver_sql("ROLLBACK")
+            raise DatabaseReplacedError(
+                f"{path} was replaced during the transaction; its writes were "
+                "rolled back"
+            )
+
+
+def _total_changes(connection: Connection) -> Optional[int]:
+    """
+    Gets the number of rows a SQLite connection has written since it opened.
+
+    Args:
+        connection: SQLAlchemy connection.
+
+    Returns:
+        Number of changed rows, None if the driver does not expose it.
+    """
+    return getattr(connection.connection.dbapi_connection, "total_changes", None)
+
+
+@contextmanager
+def begin_write(engine: Engine) -> Iterator[Connection]:
+    """
+    Opens a transaction that holds the database write lock from its start.
+
+    On SQLite the transaction begins IMMEDIATE, so concurrent writers wait
+    for each other at BEGIN, within busy_timeout, instead of failing when a
+    read transaction is upgraded to a write. Other dialects begin as usual.
+
+    Args:
+        engine: SQLAlchemy engine with the SQLite PRAGMAs installed.
+
+    Yields:
+        Connection inside the transaction, committed on exit.
+    """
+    with engine.connect() as conn:
+        conn.execution_options(**{SQLITE_BEGIN_OPTION: "IMMEDIATE"})
+        with conn.begin():
+            yield conn
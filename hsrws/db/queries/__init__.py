@@ -1,20 +1,35 @@
 """Character statistic queries for the HSR application."""
 
+from hsrws.db.queries.aggregates import (
+    CharacterFilter,
+    build_aggregate_stmt,
+    clear_statement_caches,
+    filter_params,
+)
 from hsrws.db.queries.character_stats import (
+    get_character_cube_stmt,
+    get_element_distribution_stmt,
+    get_element_path_heatmap_stmt,
     get_latest_patch_stmt,
     get_path_distribution_stmt,
-    get_element_distribution_stmt,
+    get_path_rarity_distribution_stmt,
     get_rarity_distribution_stmt,
-    get_element_path_heatmap_stmt,
     get_rarity_element_distribution_stmt,
-    get_version_release_timeline_stmt,
     get_version_element_evolution_stmt,
-    get_path_rarity_distribution_stmt,
     get_version_path_evolution_stmt,
+    get_version_release_timeline_stmt,
 )
+from hsrws.db.queries.selection import CharacterSelection, get_selection_stmt
 
 __all__ = [
+    "CharacterFilter",
+    "CharacterSelection",
+    "build_aggregate_stmt",
+    "clear_statement_caches",
+    "filter_params",
+    "get_selection_stmt",
     "get_latest_patch_stmt",
+    "get_character_cube_stmt",
     "get_path_distribution_stmt",
     "get_element_distribution_stmt",
     "get_rarity_distribution_stmt",
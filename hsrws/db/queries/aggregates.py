@@ -0,0 +1,301 @@
+"""Generic aggregate statements over the character dimensions."""
+
+import functools
+from typing import Any, Callable, NamedTuple, Optional, TypeVar
+
+from sqlalchemy import Select, bindparam, func, select
+
+from hsrws.db.models import HsrCharacter
+
+STATEMENT_CACHE_SIZE = 256
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Memoized statement builders, cleared by clear_statement_caches.
+_statement_builders: list[Any] = []
+
+DIMENSION_COLUMNS = {
+    "Path": HsrCharacter.Path,
+    "Element": HsrCharacter.Element,
+    "Rarity": HsrCharacter.Rarity,
+    "Version": HsrCharacter.Version,
+}
+
+STAT_COLUMNS = {
+    "ATK Lvl 80": HsrCharacter.ATK_Lvl_80,
+    "DEF Lvl 80": HsrCharacter.DEF_Lvl_80,
+    "HP Lvl 80": HsrCharacter.HP_Lvl_80,
+    "SPD Lvl 80": HsrCharacter.SPD_Lvl_80,
+}
+
+AGGREGATES = {"count": func.count, "sum": func.sum, "avg": func.avg}
+
+# Aggregates that can be accumulated over versions.
+CUMULATIVE_AGGREGATES = ("count", "sum")
+
+
+class CharacterFilter(NamedTuple):
+    """
+    Optional restrictions on the characters a statistic counts.
+
+    Attributes:
+        min_version: Lowest release version included.
+        max_version: Highest release version included.
+        element: Only count characters of this element.
+        path: Only count characters of this path.
+    """
+
+    min_version: Optional[float] = None
+    max_version: Optional[float] = None
+    element: Optional[str] = None
+    path: Optional[str] = None
+
+
+def memoize_statement(builder: F) -> F:
+    """
+    Memoizes a statement builder per argument combination.
+
+    Args:
+        builder: Function returning a statement from hashable arguments.
+
+    Returns:
+        LRU-cached builder, cleared by clear_statement_caches.
+    """
+    cached = functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)(builder)
+    _statement_builders.append(cached)
+    return cached  # type: ignore[return-value]
+
+
+def clear_statement_caches() -> None:
+    """Drops every memoized statement, so the next calls build them again."""
+    for builder in _statement_builders:
+        builder.cache_clear()
+
+
+def filter_shape(filters: Any) -> tuple[str, ...]:
+    """
+    Gets the shape of a filter: the names of the fields it sets.
+
+    Statements are memoized per shape, so filters that only differ in their
+    values share one statement and its compiled form.
+
+    Args:
+        filters: CharacterFilter or CharacterSelection, None for no filter.
+
+    Returns:
+        Names of the fields that are neither None nor empty.
+    """
+    return tuple(filter_params(filters))
+
+
+def filter_params(filters: Any) -> dict[str, Any]:
+    """
+    Gets the values of a filter, bound at execute time.
+
+    Args:
+        filters: CharacterFilter or CharacterSelection, None for no filter.
+
+    Returns:
+        Parameters of the statements built for the filter, keyed by the
+        names of the fields that are neither None nor empty.
+    """
+    if filters is None:
+        return {}
+    return {
+        name: value
+        for name, value in filters._asdict().items()
+        if value is not None and value != ()
+    }
+
+
+def filter_characters(stmt: Select[Any], shape: tuple[str, ...]) -> Select[Any]:
+    """
+    Restricts a statement over HsrCharacters to the filtered characters.
+
+    Args:
+        stmt: SELECT statement reading HsrCharacters.
+        shape: Names of the set CharacterFilter fields, as returned by
+            filter_shape.
+
+    Returns:
+        Statement with one WHERE criterion per set filter, whose value is
+        the bound parameter named after the field.
+    """
+    if "min_version" in shape:
+        stmt = stmt.where(HsrCharacter.Version >= bindparam("min_version"))
+    if "max_version" in shape:
+        stmt = stmt.where(HsrCharacter.Version <= bindparam("max_version"))
+    if "element" in shape:
+        stmt = stmt.where(HsrCharacter.Element == bindparam("element"))
+    if "path" in shape:
+        stmt = stmt.where(HsrCharacter.Path == bindparam("path"))
+    return stmt
+
+
+def build_aggregate_stmt(
+    dimensions: tuple[str, ...],
+    filters: Optional[CharacterFilter] = None,
+    aggregate: str = "count",
+    stat: Optional[str] = None,
+    value_label: Optional[str] = None,
+    dimension_labels: Optional[tuple[str, ...]] = None,
+    cumulative: bool = False,
+    order_by_value: bool = False,
+) -> Select[Any]:
+    """
+    Returns the statement aggregating characters per combination of dimensions.
+
+    Grouping follows the column order of a covering index on the dimensions
+    when there is one, so counts are computed by an index scan without a
+    sort. Statements are memoized per filter shape: the filter values are
+    not part of the statement and are passed at execute time as
+    filter_params(filters).
+
+    Args:
+        dimensions: Dimension columns to group by, also the output order.
+        filters: Character filter, None for every character.
+        aggregate: 'count', 'sum' or 'avg'.
+        stat: Stat column to aggregate, required for 'sum' and 'avg'. With
+            'count', counts the characters whose stat is known.
+        value_label: Label of the aggregate column, defaults to the aggregate.
+        dimension_labels: Labels of the dimension columns, defaults to their
+            names.
+        cumulative: Accumulate the aggregate over versions within the other
+            dimensions. Requires 'Version' among the dimensions.
+        order_by_value: Order by the aggregate, largest first, instead of by
+            the dimensions.
+
+    Returns:
+        SQLAlchemy SELECT statement with one column per dimension and the
+        aggregate column.
+
+    Raises:
+        ValueError: If a dimension, stat or aggregate is unknown, or the
+            combination of arguments is not supported.
+    """
+    return _build_aggregate_stmt(
+        dimensions,
+        filter_shape(filters),
+        aggregate,
+        stat,
+        value_label,
+        dimension_labels,
+        cumulative,
+        order_by_value,
+    )
+
+
+@memoize_statement
+def _build_aggregate_stmt(
+    dimensions: tuple[str, ...],
+    shape: tuple[str, ...],
+    aggregate: str,
+    stat: Optional[str],
+    value_label: Optional[str],
+    dimension_labels: Optional[tuple[str, ...]],
+    cumulative: bool,
+    order_by_value: bool,
+) -> Select[Any]:
+    """Builds the statement of build_aggregate_stmt for a filter shape."""
+    unknown = [name for name in dimensions if name not in DIMENSION_COLUMNS]
+    if unknown or len(set(dimensions)) != len(dimensions):
+        raise ValueError(f"Invalid dimensions {dimensions}")
+    if aggregate not in AGGREGATES:
+        raise ValueError(f"Unknown aggregate {aggregate!r}")
+    if stat is not None and stat not in STAT_COLUMNS:
+        raise ValueError(f"Unknown stat {stat!r}")
+    if stat is None and aggregate != "count":
+        raise ValueError(f"Aggregate {aggregate!r} requires a stat")
+    if dimension_labels is not None and len(dimension_labels) != len(dimensions):
+        raise ValueError("dimension_labels must match dimensions")
+
+    value_label = value_label or aggregate
+    labels = dimension_labels or dimensions
+    columns = [DIMENSION_COLUMNS[name] for name in dimensions]
+    arguments = [STAT_COLUMNS[stat]] if stat is not None else []
+    aggregate_func = AGGREGATES[aggregate]
+
+    if cumulative:
+        if "Version" not in dimensions or aggregate not in CUMULATIVE_AGGREGATES:
+            raise ValueError(
+                f"Cumulative {aggregate!r} over {dimensions} is not supported"
+            )
+        return _cumulative_stmt(
+            dimensions, labels, aggregate_func(*arguments), value_label, shape
+        )
+
+    value = aggregate_func(*arguments).label(value_label)
+    stmt = filter_characters(
+        select(*(column.label(label) for column, label in zip(columns, labels)), value),
+        shape,
+    ).group_by(*(DIMENSION_COLUMNS[name] for name in _index_order(dimensions)))
+    if order_by_value:
+        return stmt.order_by(value.desc())
+    return stmt.order_by(*columns)
+
+
+def _index_order(dimensions: tuple[str, ...]) -> tuple[str, ...]:
+    """
+    Orders dimensions like the leading columns of a matching index.
+
+    Args:
+        dimensions: Dimension names.
+
+    Returns:
+        Dimensions in index column order, or as given if no index leads with
+        exactly these columns.
+    """
+    for index in HsrCharacter.__table__.indexes:
+        leading = tuple(column.name for column in index.columns)[: len(dimensions)]
+        if set(leading) == set(dimensions):
+            return leading
+    return dimensions
+
+
+def _cumulative_stmt(
+    dimensions: tuple[str, ...],
+    labels: tuple[str, ...],
+    aggregate: Any,
+    value_label: str,
+    shape: tuple[str, ...],
+) -> Select[Any]:
+    """
+    Returns the statement accumulating an aggregate over versions.
+
+    The running aggregate is a window over the characters themselves, read
+    in (dimensions, Version) index order, and the first row of each
+    (dimensions, Version) peer group carries the cumulative value. This
+    avoids grouping into a subquery that the window would have to re-sort.
+
+    Args:
+        dimensions: Dimension names, including 'Version'.
+        labels: Labels of the dimension columns.
+        aggregate: Aggregate function expression.
+        value_label: Label of the aggregate column.
+        shape: Names of the set CharacterFilter fields.
+
+    Returns:
+        SQLAlchemy SELECT statement ordered by the dimensions.
+    """
+    partition = [
+        DIMENSION_COLUMNS[name] for name in dimensions if name != "Version"
+    ] or None
+    columns = [DIMENSION_COLUMNS[name] for name in dimensions]
+    running = filter_characters(
+        select(
+            *(column.label(label) for column, label in zip(columns, labels)),
+            aggregate.over(partition_by=partition, order_by=HsrCharacter.Version).label(
+                value_label
+            ),
+            func.row_number()
+            .over(partition_by=[*(partition or []), HsrCharacter.Version])
+            .label("peer_number"),
+        ),
+        shape,
+    ).subquery()
+
+    return (
+        select(*(running.c[label] for label in labels), running.c[value_label])
+        .where(running.c.peer_number == 1)
+        .order_by(*(running.c[label] for label in labels))
+    )
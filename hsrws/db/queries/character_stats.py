@@ -1,170 +1,235 @@
-"""SQLAlchemy queries for character statistics."""
+"""SQLAlchemy queries for character statistics.
 
-from sqlalchemy import Column, Select, func, select
+Each statement is a preset of the generic aggregate engine, which memoizes
+statements per filter shape; the filter values are passed at execute time
+as filter_params(filters). The character cube reads the normalized fact
+table instead.
+"""
+
+from typing import Any, Optional
+
+from sqlalchemy import Column, Select, bindparam, func, select
+
+from hsrws.db.dimensions import ELEMENT_TABLE, FACT_TABLE, PATH_TABLE
 from hsrws.db.models import HsrCharacter
+from hsrws.db.queries.aggregates import (
+    CharacterFilter,
+    build_aggregate_stmt,
+    filter_characters,
+    filter_shape,
+    memoize_statement,
+)
 
 
-def get_latest_patch_stmt() -> Select[tuple[float]]:
+def get_latest_patch_stmt(
+    filters: Optional[CharacterFilter] = None,
+) -> Select[tuple[float]]:
     """
     Returns the statement to get the latest patch version.
 
+    Args:
+        filters: Character filter, None for every character. Its values are
+            passed at execute time as filter_params(filters).
+
     Returns:
         SQLAlchemy SELECT statement.
     """
+    return _latest_patch_stmt(filter_shape(filters))
+
+
+@memoize_statement
+def _latest_patch_stmt(shape: tuple[str, ...]) -> Select[tuple[float]]:
+    """Builds the statement of get_latest_patch_stmt for a filter shape."""
     version_data: Column[float] = HsrCharacter.Version
     latest_version_data = func.max(version_data)
-    return select(latest_version_data.label("latest_version"))
+    return filter_characters(select(latest_version_data.label("latest_version")), shape)
 
 
-def get_path_distribution_stmt():
+def get_character_cube_stmt(
+    filters: Optional[CharacterFilter] = None,
+) -> Select[Any]:
+    """
+    Returns the statement to count characters per Version, Element, Path and Rarity.
+
+    Every chart dataset is a rollup of these counts, so reading them is the
+    only scan a full set of charts needs. Counts are grouped on the integer
+    keys of the fact table in the order of its covering index, and only the
+    few resulting groups are joined to the dimension names.
+
+    Args:
+        filters: Character filter, None for every character. Its values are
+            passed at execute time as filter_params(filters).
+
+    Returns:
+        SQLAlchemy SELECT statement for the finest-grained character counts,
+        ordered by the dimensions.
+    """
+    return _character_cube_stmt(filter_shape(filters))
+
+
+@memoize_statement
+def _character_cube_stmt(shape: tuple[str, ...]) -> Select[Any]:
+    """Builds the statement of get_character_cube_stmt for a filter shape."""
+    facts = FACT_TABLE.c
+    counts = select(
+        facts.Version,
+        facts.ElementId,
+        facts.PathId,
+        facts.Rarity,
+        func.count().label("count"),
+    ).group_by(facts.Version, facts.ElementId, facts.PathId, facts.Rarity)
+    if "min_version" in shape:
+        counts = counts.where(facts.Version >= bindparam("min_version"))
+    if "max_version" in shape:
+        counts = counts.where(facts.Version <= bindparam("max_version"))
+    # Names are looked up once in the small dimension tables, so the facts
+    # are still filtered and grouped on their integer keys.
+    for fact_key, dimension, name in (
+        (facts.ElementId, ELEMENT_TABLE, "element"),
+        (facts.PathId, PATH_TABLE, "path"),
+    ):
+        if name in shape:
+            counts = counts.where(
+                fact_key
+                == select(dimension.c[fact_key.name])
+                .where(dimension.c.Name == bindparam(name))
+                .scalar_subquery()
+            )
+    counts = counts.subquery()
+
+    element = ELEMENT_TABLE.c.Name.label("Element")
+    path = PATH_TABLE.c.Name.label("Path")
+    return (
+        select(counts.c.Version, element, path, counts.c.Rarity, counts.c["count"])
+        .select_from(
+            counts.outerjoin(
+                ELEMENT_TABLE, counts.c.ElementId == ELEMENT_TABLE.c.ElementId
+            ).outerjoin(PATH_TABLE, counts.c.PathId == PATH_TABLE.c.PathId)
+        )
+        .order_by(counts.c.Version, element, path, counts.c.Rarity)
+    )
+
+
+def get_path_distribution_stmt(filters: Optional[CharacterFilter] = None):
     """
     Returns the statement to get Path distribution.
 
+    Args:
+        filters: Character filter, None for every character.
+
     Returns:
         SQLAlchemy SELECT statement for Path distribution.
     """
-    return (
-        select(HsrCharacter.Path.label("category"), func.count().label("count"))
-        .group_by(HsrCharacter.Path)
-        .order_by(func.count().desc())
+    return build_aggregate_stmt(
+        ("Path",), filters, dimension_labels=("category",), order_by_value=True
     )
 
 
-def get_element_distribution_stmt():
+def get_element_distribution_stmt(filters: Optional[CharacterFilter] = None):
     """
     Returns the statement to get Element distribution.
 
+    Args:
+        filters: Character filter, None for every character.
+
     Returns:
         SQLAlchemy SELECT statement for Element distribution.
     """
-    return (
-        select(HsrCharacter.Element.label("category"), func.count().label("count"))
-        .group_by(HsrCharacter.Element)
-        .order_by(func.count().desc())
+    return build_aggregate_stmt(
+        ("Element",), filters, dimension_labels=("category",), order_by_value=True
     )
 
 
-def get_rarity_distribution_stmt():
+def get_rarity_distribution_stmt(filters: Optional[CharacterFilter] = None):
     """
     Returns the statement to get Rarity distribution.
 
+    Args:
+        filters: Character filter, None for every character.
+
     Returns:
         SQLAlchemy SELECT statement for Rarity distribution.
     """
-    return (
-        select(HsrCharacter.Rarity.label("category"), func.count().label("count"))
-        .group_by(HsrCharacter.Rarity)
-        .order_by(func.count().desc())
+    return build_aggregate_stmt(
+        ("Rarity",), filters, dimension_labels=("category",), order_by_value=True
     )
 
 
-def get_element_path_heatmap_stmt():
+def get_element_path_heatmap_stmt(filters: Optional[CharacterFilter] = None):
     """
     Returns the statement to get Element-Path distribution for heatmap.
 
+    Args:
+        filters: Character filter, None for every character.
+
     Returns:
         SQLAlchemy SELECT statement for Element-Path heatmap data.
     """
-    return (
-        select(HsrCharacter.Element, HsrCharacter.Path, func.count().label("count"))
-        .group_by(HsrCharacter.Element, HsrCharacter.Path)
-        .order_by(HsrCharacter.Element, HsrCharacter.Path)
-    )
+    return build_aggregate_stmt(("Element", "Path"), filters)
 
 
-def get_rarity_element_distribution_stmt():
+def get_rarity_element_distribution_stmt(filters: Optional[CharacterFilter] = None):
     """
     Returns the statement to get Rarity-Element distribution for stacked bar chart.
 
+    Args:
+        filters: Character filter, None for every character.
+
     Returns:
         SQLAlchemy SELECT statement for Rarity-Element distribution data.
     """
-    return (
-        select(HsrCharacter.Rarity, HsrCharacter.Element, func.count().label("count"))
-        .group_by(HsrCharacter.Rarity, HsrCharacter.Element)
-        .order_by(HsrCharacter.Rarity, HsrCharacter.Element)
-    )
+    return build_aggregate_stmt(("Rarity", "Element"), filters)
 
 
-def get_version_release_timeline_stmt():
+def get_version_release_timeline_stmt(filters: Optional[CharacterFilter] = None):
     """
     Returns the statement to get character releases by version for timeline plot.
 
+    Args:
+        filters: Character filter, None for every character.
+
     Returns:
         SQLAlchemy SELECT statement for version release timeline data.
     """
-    return (
-        select(HsrCharacter.Version, func.count().label("character_count"))
-        .group_by(HsrCharacter.Version)
-        .order_by(HsrCharacter.Version)
-    )
+    return build_aggregate_stmt(("Version",), filters, value_label="character_count")
 
 
-def get_version_element_evolution_stmt():
+def get_version_element_evolution_stmt(filters: Optional[CharacterFilter] = None):
     """
     Returns the statement to get cumulative elemental balance evolution across versions.
 
+    Args:
+        filters: Character filter, None for every character. Only the
+            filtered characters are accumulated.
+
     Returns:
         SQLAlchemy SELECT statement for cumulative elemental balance evolution data.
     """
-    # First create a subquery with the count per version and element
-    version_element_counts = (
-        select(HsrCharacter.Version, HsrCharacter.Element, func.count().label("count"))
-        .group_by(HsrCharacter.Version, HsrCharacter.Element)
-        .order_by(HsrCharacter.Version, HsrCharacter.Element)
-        .subquery()
-    )
-
-    # Then use window function to calculate cumulative sum
-    return select(
-        version_element_counts.c.Version,
-        version_element_counts.c.Element,
-        func.sum(version_element_counts.c.count)
-        .over(
-            partition_by=version_element_counts.c.Element,
-            order_by=version_element_counts.c.Version,
-        )
-        .label("count"),
-    ).order_by(version_element_counts.c.Version, version_element_counts.c.Element)
+    return build_aggregate_stmt(("Version", "Element"), filters, cumulative=True)
 
 
-def get_path_rarity_distribution_stmt():
+def get_path_rarity_distribution_stmt(filters: Optional[CharacterFilter] = None):
     """
     Returns the statement to get Path-Rarity distribution for grouped bar chart.
 
+    Args:
+        filters: Character filter, None for every character.
+
     Returns:
         SQLAlchemy SELECT statement for Path-Rarity distribution data.
     """
-    return (
-        select(HsrCharacter.Path, HsrCharacter.Rarity, func.count().label("count"))
-        .group_by(HsrCharacter.Path, HsrCharacter.Rarity)
-        .order_by(HsrCharacter.Path, HsrCharacter.Rarity)
-    )
+    return build_aggregate_stmt(("Path", "Rarity"), filters)
 
 
-def get_version_path_evolution_stmt():
+def get_version_path_evolution_stmt(filters: Optional[CharacterFilter] = None):
     """
     Returns the statement to get cumulative path balance evolution across versions.
 
+    Args:
+        filters: Character filter, None for every character. Only the
+            filtered characters are accumulated.
+
     Returns:
         SQLAlchemy SELECT statement for cumulative path balance evolution data.
     """
-    # First create a subquery with the count per version and path
-    version_path_counts = (
-        select(HsrCharacter.Version, HsrCharacter.Path, func.count().label("count"))
-        .group_by(HsrCharacter.Version, HsrCharacter.Path)
-        .order_by(HsrCharacter.Version, HsrCharacter.Path)
-        .subquery()
-    )
-
-    # Then use window function to calculate cumulative sum
-    return select(
-        version_path_counts.c.Version,
-        version_path_counts.c.Path,
-        func.sum(version_path_counts.c.count)
-        .over(
-            partition_by=version_path_counts.c.Path,
-            order_by=version_path_counts.c.Version,
-        )
-        .label("count"),
-    ).order_by(version_path_counts.c.Version, version_path_counts.c.Path)
+    return build_aggregate_stmt(("Version", "Path"), filters, cumulative=True)
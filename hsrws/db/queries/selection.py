@@ -0,0 +1,75 @@
+"""Multi-valued character selections and their SQL statement."""
+
+from typing import Any, NamedTuple, Optional
+
+from sqlalchemy import Select, bindparam, select
+
+from hsrws.db.models import HsrCharacter
+from hsrws.db.queries.aggregates import filter_shape, memoize_statement
+
+SELECTION_COLUMNS = {
+    "Character": HsrCharacter.Character,
+    "Path": HsrCharacter.Path,
+    "Element": HsrCharacter.Element,
+    "Rarity": HsrCharacter.Rarity,
+    "Version": HsrCharacter.Version,
+}
+
+
+class CharacterSelection(NamedTuple):
+    """
+    Combination of filters on the character dimensions.
+
+    A character matches when it has one of the listed values of every
+    dimension that lists values, and was released within the version range.
+
+    Attributes:
+        paths: Accepted paths, empty for any path.
+        elements: Accepted elements, empty for any element.
+        rarities: Accepted rarities, empty for any rarity.
+        min_version: Lowest release version included.
+        max_version: Highest release version included.
+    """
+
+    paths: tuple[str, ...] = ()
+    elements: tuple[str, ...] = ()
+    rarities: tuple[int, ...] = ()
+    min_version: Optional[float] = None
+    max_version: Optional[float] = None
+
+
+def get_selection_stmt(selection: CharacterSelection) -> Select[Any]:
+    """
+    Returns the statement reading the characters of a selection.
+
+    Statements are memoized per selection shape, and the selected values
+    are passed at execute time as filter_params(selection).
+
+    Args:
+        selection: Character selection.
+
+    Returns:
+        SQLAlchemy SELECT statement with the SELECTION_COLUMNS, ordered by
+        Character.
+    """
+    return _selection_stmt(filter_shape(selection))
+
+
+@memoize_statement
+def _selection_stmt(shape: tuple[str, ...]) -> Select[Any]:
+    """Builds the statement of get_selection_stmt for a selection shape."""
+    stmt = select(
+        *(column.label(name) for name, column in SELECTION_COLUMNS.items())
+    ).order_by(HsrCharacter.Character)
+    for name, column in (
+        ("paths", HsrCharacter.Path),
+        ("elements", HsrCharacter.Element),
+        ("rarities", HsrCharacter.Rarity),
+    ):
+        if name in shape:
+            stmt = stmt.where(column.in_(bindparam(name, expanding=True)))
+    if "min_version" in shape:
+        stmt = stmt.where(HsrCharacter.Version >= bindparam("min_version"))
+    if "max_version" in shape:
+        stmt = stmt.where(HsrCharacter.Version <= bindparam("max_version"))
+    return stmt
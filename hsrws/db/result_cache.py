@@ -0,0 +1,165 @@
+"""In-process cache of query results keyed by the data generation."""
+
+import functools
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, TypeVar
+
+import pandas as pd
+from sqlalchemy import Dialect, Executable
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+T = TypeVar("T")
+
+
+def get_cache_max_bytes() -> int:
+    """
+    Gets the memory cap of the query result cache.
+
+    Returns:
+        Value of the HSR_QUERY_CACHE_MAX_BYTES environment variable, 64 MiB
+        if unset. Zero disables the cache.
+    """
+    return int(os.getenv("HSR_QUERY_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+
+
+@functools.lru_cache(maxsize=256)
+def statement_cache_key(stmt: Executable, dialect: Dialect) -> tuple[str, str]:
+    """
+    Computes the cache key of a statement.
+
+    The key is memoized per statement object, so the memoized statement
+    builders are compiled for it only once.
+
+    Args:
+        stmt: SQLAlchemy statement.
+        dialect: Dialect the statement is compiled for.
+
+    Returns:
+        Compiled SQL string and its bound parameters.
+    """
+    compiled = stmt.compile(dialect=dialect)
+    return str(compiled), repr(sorted(compiled.params.items()))
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimates the memory held by a cached value.
+
+    Args:
+        value: DataFrame, tuple of DataFrames or any other object.
+
+    Returns:
+        Size in bytes.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def copy_result(value: T) -> T:
+    """
+    Copies a cached value so that callers cannot modify the cached one.
+
+    Args:
+        value: DataFrame, named tuple of DataFrames or an immutable value.
+
+    Returns:
+        Copy of the DataFrames, other values as they are.
+    """
+    if isinstance(value, pd.DataFrame):
+        return value.copy()  # type: ignore[return-value]
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return type(value)(*(copy_result(item) for item in value))
+    return value
+
+
+class QueryResultCache:
+    """
+    LRU cache of query results with a memory cap.
+
+    Entries belong to a data generation. Looking up a newer generation drops
+    every entry of the previous ones, since the data they were read from has
+    been replaced.
+
+    Attributes:
+        max_bytes: Maximum estimated size of the cached results.
+        hits: Number of lookups answered from the cache.
+        misses: Number of lookups that had to run the query.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._generation = -1
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Estimated size of the cached results in bytes."""
+        return self._size
+
+    def get_or_compute(
+        self, key: Hashable, generation: int, compute: Callable[[], T]
+    ) -> T:
+        """
+        Returns the cached result for a key, computing it on a miss.
+
+        Args:
+            key: Cache key, such as statement_cache_key(stmt, dialect).
+            generation: Current data generation.
+            compute: Function running the query.
+
+        Returns:
+            Copy of the cached or computed result.
+        """
+        with self._lock:
+            if generation != self._generation:
+                self._clear_entries()
+                self._generation = generation
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return copy_result(entry[0])
+            self.misses += 1
+
+        value = compute()
+        size = estimate_size(value)
+        with self._lock:
+            if generation == self._generation and size <= self.max_bytes:
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self._size -= previous[1]
+                self._entries[key] = (value, size)
+                self._size += size
+                while self._size > self.max_bytes:
+                    _, (_, evicted_size) = self._entries.popitem(last=False)
+                    self._size -= evicted_size
+        return copy_result(value)
+
+    def clear(self) -> None:
+        """Drops every cached result and resets the counters."""
+        with self._lock:
+            self._clear_entries()
+            self._generation = -1
+            self.hits = 0
+            self.misses = 0
+
+    def _clear_entries(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+
+query_cache = QueryResultCache(get_cache_max_bytes())
@@ -0,0 +1,113 @@
+"""Reconciliation of existing tables with their model schema."""
+
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import Connection, Table, inspect, text
+
+# Conversions of legacy text rarities such as '5' or 'Unknown' to integers,
+# relying on SQLite casting text without a leading number to 0.
+LEGACY_CHARACTER_CASTS = {"Rarity": 'NULLIF(CAST("Rarity" AS INTEGER), 0)'}
+
+
+def table_matches_model(conn: Connection, table: Table) -> bool:
+    """
+    Checks whether an existing table has the schema of its model.
+
+    The primary key, the column type affinities and the named CHECK
+    constraints are compared. Missing indexes are not a mismatch; they can
+    be added without a rebuild.
+
+    Args:
+        conn: Database connection.
+        table: Model table, which must exist in the database.
+
+    Returns:
+        True if the table can be used as is.
+    """
+    inspector = inspect(conn)
+    pk = inspector.get_pk_constraint(table.name)["constrained_columns"]
+    if pk != [column.name for column in table.primary_key.columns]:
+        return False
+
+    reflected = {column["name"]: column for column in inspector.get_columns(table.name)}
+    for column in table.columns:
+        existing = reflected.get(column.name)
+        if existing is None or _python_type(existing["type"]) is not _python_type(
+            column.type
+        ):
+            return False
+
+    checks = {check["name"] for check in inspector.get_check_constraints(table.name)}
+    return all(
+        constraint.name in checks
+        for constraint in table.constraints
+        if constraint.__visit_name__ == "check_constraint"
+    )
+
+
+def rebuild_table(
+    conn: Connection, table: Table, casts: Optional[dict[str, str]] = None
+) -> None:
+    """
+    Rebuilds an existing table with its model schema, keeping its rows.
+
+    The table is renamed, created again from the model and its rows copied
+    over. Columns that are not in the model are dropped and model columns
+    that did not exist are left NULL.
+
+    Only SQLite databases are rebuilt: legacy tables were written to SQLite
+    files by pandas, while databases on other dialects have always been
+    created from the models. The copy and the casts use SQLite semantics.
+
+    Args:
+        conn: Connection inside a transaction.
+        table: Model table, which must exist in the database.
+        casts: SQLite expressions converting a legacy column to the model
+            type, keyed by column name.
+
+    Raises:
+        ValueError: If the database is not SQLite.
+    """
+    if conn.dialect.name != "sqlite":
+        raise ValueError(
+            f"Cannot rebuild {table.name} on {conn.dialect.name}; "
+            "only SQLite tables are rebuilt."
+        )
+    logger.info(f"Rebuilding {table.name} table with the model schema...")
+    inspector = inspect(conn)
+    legacy_columns = {column["name"] for column in inspector.get_columns(table.name)}
+    legacy_name = f"{table.name}_legacy"
+
+    # Index names are global; free them for the rebuilt table.
+    for index in inspector.get_indexes(table.name):
+        conn.execute(text(f'DROP INDEX "{index["name"]}"'))
+    conn.execute(text(f'ALTER TABLE "{table.name}" RENAME TO "{legacy_name}"'))
+    table.create(conn)
+
+    names = [column.name for column in table.columns if column.name in legacy_columns]
+    columns = ", ".join(f'"{name}"' for name in names)
+    values = ", ".join((casts or {}).get(name, f'"{name}"') for name in names)
+    conn.execute(
+        text(
+            f'INSERT OR REPLACE INTO "{table.name}" ({columns}) '
+            f'SELECT {values} FROM "{legacy_name}"'
+        )
+    )
+    conn.execute(text(f'DROP TABLE "{legacy_name}"'))
+
+
+def _python_type(column_type) -> Optional[type]:
+    """
+    Gets the Python type of a column type.
+
+    Args:
+        column_type: SQLAlchemy column type.
+
+    Returns:
+        Python type, or None if the type has none.
+    """
+    try:
+        return column_type.python_type
+    except NotImplementedError:
+        return None
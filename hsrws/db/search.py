@@ -0,0 +1,164 @@
+"""Full-text and prefix search over characters with an SQLite FTS5 table."""
+
+import re
+from typing import Any, Optional
+
+from sqlalchemy import Connection, select, text
+
+from hsrws.db.models import HsrCharacter
+
+CHARACTER_TABLE = HsrCharacter.__table__
+
+SEARCH_TABLE_NAME = "CharacterSearch"
+
+# Indexed columns with their bm25 weight: name matches rank above path,
+# element and detail-page text matches.
+SEARCH_COLUMN_WEIGHTS = {"Name": 10.0, "Path": 2.0, "Element": 2.0, "Details": 1.0}
+
+# Prefix lengths indexed for autocomplete; longer prefixes use the token index.
+PREFIX_LENGTHS = (1, 2, 3)
+
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 100
+
+# Words of a query, split like the unicode61 tokenizer of the table.
+QUERY_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def create_search_table(conn: Connection) -> None:
+    """
+    Creates the FTS5 search table if it is missing.
+
+    The Character key is stored unindexed to identify the results. Details
+    holds detail-page text, such as skill descriptions, for scrapers that
+    collect it. Other dialects have no FTS5 and are left untouched.
+
+    Args:
+        conn: Database connection.
+    """
+    if conn.dialect.name != "sqlite":
+        return
+    columns = ", ".join(f'"{column}"' for column in SEARCH_COLUMN_WEIGHTS)
+    prefixes = " ".join(str(length) for length in PREFIX_LENGTHS)
+    conn.exec_driver_sql(
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS "{SEARCH_TABLE_NAME}" USING fts5('
+        f'"Character" UNINDEXED, {columns}, '
+        f"tokenize = 'unicode61 remove_diacritics 2', prefix = '{prefixes}')"
+    )
+
+
+def display_name(character: str) -> str:
+    """
+    Turns a normalized character key back into a readable name.
+
+    Args:
+        character: Normalized Character key, such as 'march-7th'.
+
+    Returns:
+        Name with spaces and capitalized words, such as 'March 7th'.
+    """
+    return " ".join(word[:1].upper() + word[1:] for word in character.split("-"))
+
+
+def refresh_character_search(conn: Connection) -> int:
+    """
+    Rebuilds the search table from the character table.
+
+    Meant to run inside the character load transaction, so searches see
+    the same characters as every other query.
+
+    Args:
+        conn: Connection inside the load transaction, after the upsert.
+
+    Returns:
+        Number of characters indexed, 0 on dialects without FTS5.
+    """
+    if conn.dialect.name != "sqlite":
+        return 0
+    characters = CHARACTER_TABLE.c
+    rows = [
+        {
+            "character": character,
+            "name": display_name(character),
+            "path": path,
+            "element": element,
+        }
+        for character, path, element in conn.execute(
+            select(characters.Character, characters.Path, characters.Element)
+        )
+    ]
+    conn.exec_driver_sql(f'DELETE FROM "{SEARCH_TABLE_NAME}"')
+    if rows:
+        conn.execute(
+            text(
+                f'INSERT INTO "{SEARCH_TABLE_NAME}" '
+                '("Character", "Name", "Path", "Element") '
+                "VALUES (:character, :name, :path, :element)"
+            ),
+            rows,
+        )
+    return len(rows)
+
+
+def build_match_query(query: str, prefix: bool = True) -> Optional[str]:
+    """
+    Builds an FTS5 MATCH expression from user input.
+
+    Every word is quoted, so FTS5 operators and punctuation in the input are
+    matched as plain text. Words must all match, in any column.
+
+    Args:
+        query: Search text.
+        prefix: Match the last word as a prefix, for autocomplete.
+
+    Returns:
+        MATCH expression, or None if the query has no words.
+    """
+    tokens = QUERY_TOKEN_PATTERN.findall(query)
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    if prefix:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_characters(
+    conn: Connection,
+    query: str,
+    limit: int = DEFAULT_SEARCH_LIMIT,
+    prefix: bool = True,
+) -> list[dict[str, Any]]:
+    """
+    Searches characters by name, path, element and detail-page text.
+
+    Args:
+        conn: Database connection.
+        query: Search text.
+        limit: Maximum number of results.
+        prefix: Match the last word as a prefix, for autocomplete.
+
+    Returns:
+        Matching characters, best match first, with their Character key,
+        Name, Path and Element.
+
+    Raises:
+        ValueError: If the database has no FTS5 search table.
+    """
+    if conn.dialect.name != "sqlite":
+        raise ValueError(
+            f"Character search requires SQLite FTS5, not {conn.dialect.name}"
+        )
+    match = build_match_query(query, prefix)
+    if match is None:
+        return []
+
+    weights = ", ".join(str(weight) for weight in SEARCH_COLUMN_WEIGHTS.values())
+    stmt = text(
+        'SELECT "Character", "Name", "Path", "Element" '
+        f'FROM "{SEARCH_TABLE_NAME}" WHERE "{SEARCH_TABLE_NAME}" MATCH :match '
+        f'ORDER BY bm25("{SEARCH_TABLE_NAME}", 0.0, {weights}), "Character" '
+        "LIMIT :limit"
+    )
+    rows = conn.execute(stmt, {"match": match, "limit": limit}).mappings()
+    return [dict(row) for row in rows]
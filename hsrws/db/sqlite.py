@@ -1,27 +1,507 @@
 """SQLite database functionality."""
 
+import asyncio
+import itertools
+import os
 import sqlite3
 import traceback
+import uuid
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Optional, Union
 
 import pandas as pd
 from loguru import logger
+from sqlalchemy import (
+    Column,
+    Connection,
+    Engine,
+    MetaData,
+    Select,
+    Table,
+    create_engine,
+    delete,
+    or_,
+    select,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import NullPool
 
+from hsrws.db.backends import refresh_duckdb_copy
+from hsrws.db.character_store import reset_character_store
+from hsrws.db.chart_aggregates import refresh_chart_aggregates
+from hsrws.db.database import get_async_engine, get_engine
+from hsrws.db.dimensions import refresh_dimensions
+from hsrws.db.export import refresh_character_export
+from hsrws.db.generation import bump_data_generation
+from hsrws.db.history import record_history, record_scrape_run
+from hsrws.db.migrations import upgrade_schema
+from hsrws.db.models import HsrCharacter
+from hsrws.db.pragmas import (
+    SQLITE_BEGIN_OPTION,
+    SQLITE_PRAGMAS,
+    begin_write,
+    install_sqlite_pragmas,
+)
+from hsrws.db.search import refresh_character_search
 
-def load_to_sqlite(df: pd.DataFrame) -> None:
+BATCH_SIZE = 500
+
+LOAD_MODES = ("upsert", "swap")
+
+CHARACTER_TABLE = HsrCharacter.__table__
+
+# INSERT constructs supporting ON CONFLICT, per dialect.
+UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+# Temporary table PostgreSQL loads COPY changed rows into before the upsert.
+STAGING_TABLE = Table(
+    "HsrCharactersStaging",
+    MetaData(),
+    *(Column(column.name, column.type) for column in CHARACTER_TABLE.columns),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+
+def get_load_mode() -> str:
+    """
+    Gets the load mode.
+
+    Returns:
+        Value of the HSR_DB_LOAD_MODE environment variable, 'upsert' if unset.
+    """
+    return os.getenv("HSR_DB_LOAD_MODE", "upsert").lower()
+
+
+def load_to_sqlite(
+    df: pd.DataFrame,
+    prune: bool = True,
+    engine: Optional[Engine] = None,
+    mode: Optional[str] = None,
+    run_id: Optional[str] = None,
+) -> dict[str, int]:
     """
-    Loads dataframe to SQLite database.
+    Upserts dataframe rows into the HsrCharacters table in one transaction.
+
+    Pending schema migrations are applied first, in the same transaction,
+    so the tables match the models. Rows are
+    written in batches with INSERT ... ON CONFLICT(Character) DO UPDATE, and
+    only rows that are new or changed are sent to the database. On
+    PostgreSQL through psycopg they are bulk copied with COPY instead. The same
+    transaction records the run, appends changed characters to the history,
+    rebuilds the normalized fact table, the materialized chart aggregates
+    and the search index and bumps the data generation. Once committed, the
+    table is exported to the columnar Parquet and Arrow files, the query
+    tables are copied again to the HSR_DUCKDB_PATH file if set and the
+    in-process character store is dropped, so it is read again.
+
+    In 'upsert' mode the live database is written in place; with WAL
+    journaling readers keep reading the last committed state meanwhile.
+    In 'swap' mode a copy of the database is loaded and atomically renamed
+    over the live file, so the live file is never written to.
 
     Args:
         df: Dataframe to load.
+        prune: Delete characters that are not in the dataframe, so the table
+            mirrors a full scrape. Disable to load a partial set of rows.
+        engine: SQLAlchemy engine, defaults to the application engine.
+        mode: 'upsert' or 'swap', defaults to get_load_mode().
+        run_id: Identifier of the scrape run that produced the rows,
+            defaults to a new random id.
+
+    Returns:
+        Dictionary with the number of inserted, updated, unchanged and
+        deleted rows.
 
     Raises:
-        sqlite3.OperationalError: If there's an issue with the SQLite operation.
+        ValueError: If the load mode is unknown or cannot be used.
+        SQLAlchemyError: If there's an issue with the database operation.
     """
-    logger.info("Loading dataframe to SQLite database...")
+    logger.info("Loading dataframe to the database...")
+    mode = mode or get_load_mode()
+    if mode not in LOAD_MODES:
+        raise ValueError(f"Unknown load mode {mode!r}, expected one of {LOAD_MODES}")
+
+    engine = engine or get_engine()
+    run_id = run_id or uuid.uuid4().hex
+    rows = dataframe_to_rows(df)
     try:
-        with sqlite3.connect("hsr.db") as conn:
-            df.to_sql("HsrCharacters", conn, if_exists="replace")
-    except sqlite3.OperationalError as e:
-        logger.error(f"OperationalError: {e}")
+        if mode == "swap":
+            counts = swap_load(engine, rows, prune, run_id)
+        else:
+            with begin_write(engine) as conn:
+                counts = write_load(conn, rows, prune, run_id)
+    except SQLAlchemyError as e:
+        logger.error(f"Database error: {e}")
         logger.error(traceback.format_exc())
         raise
+
+    logger.info(f"Loaded characters: {counts}")
+    reset_character_store()
+    refresh_character_export(engine)
+    refresh_duckdb_copy(engine)
+    return counts
+
+
+async def load_to_sqlite_async(
+    df: pd.DataFrame,
+    prune: bool = True,
+    mode: Optional[str] = None,
+    run_id: Optional[str] = None,
+) -> dict[str, int]:
+    """
+    Loads a dataframe like load_to_sqlite without blocking the event loop.
+
+    In 'upsert' mode the load transaction runs on the async engine. The
+    async drivers cannot COPY, so where the synchronous engine can, as on
+    PostgreSQL through psycopg, the load runs on it in a worker thread. A
+    'swap' load copies and renames database files, so it runs in a worker
+    thread too, as does writing the columnar export.
+
+    Args:
+        df: Dataframe to load.
+        prune: Delete characters that are not in the dataframe.
+        mode: 'upsert' or 'swap', defaults to get_load_mode().
+        run_id: Identifier of the scrape run that produced the rows,
+            defaults to a new random id.
+
+    Returns:
+        Dictionary with the number of inserted, updated, unchanged and
+        deleted rows.
+
+    Raises:
+        ValueError: If the load mode is unknown or cannot be used.
+        SQLAlchemyError: If there's an issue with the database operation.
+    """
+    mode = mode or get_load_mode()
+    sync_engine = await asyncio.to_thread(get_engine)
+    if mode != "upsert" or copy_supported(sync_engine):
+        return await asyncio.to_thread(
+            load_to_sqlite, df, prune, sync_engine, mode, run_id
+        )
+
+    logger.info("Loading dataframe to the database...")
+    run_id = run_id or uuid.uuid4().hex
+    rows = dataframe_to_rows(df)
+    engine = await get_async_engine()
+    try:
+        async with engine.connect() as conn:
+            await conn.execution_options(**{SQLITE_BEGIN_OPTION: "IMMEDIATE"})
+            async with conn.begin():
+                counts = await conn.run_sync(write_load, rows, prune, run_id)
+    except SQLAlchemyError as e:
+        logger.error(f"Database error: {e}")
+        logger.error(traceback.format_exc())
+        raise
+
+    logger.info(f"Loaded characters: {counts}")
+    reset_character_store()
+    await asyncio.to_thread(refresh_character_export, sync_engine)
+    await asyncio.to_thread(refresh_duckdb_copy, sync_engine)
+    return counts
+
+
+def write_load(
+    conn: Connection, rows: list[dict[str, Any]], prune: bool, run_id: str
+) -> dict[str, int]:
+    """
+    Writes a load in a transaction: schema upgrade, upsert and derived tables.
+
+    Args:
+        conn: Connection inside the load transaction.
+        rows: Row dictionaries keyed by HsrCharacters columns.
+        prune: Delete characters that are not in rows.
+        run_id: Identifier of the scrape run that produced the rows.
+
+    Returns:
+        Dictionary with the number of inserted, updated, unchanged and
+        deleted rows.
+    """
+    upgrade_schema(conn)
+    counts = upsert_characters(conn, rows, prune)
+    finish_load(conn, run_id)
+    return counts
+
+
+def swap_load(
+    engine: Engine, rows: list[dict[str, Any]], prune: bool, run_id: str
+) -> dict[str, int]:
+    """
+    Loads rows into a copy of the database and renames it over the live file.
+
+    The copy is taken with the SQLite backup API, so every other table is
+    carried over. Readers either see the old file or the new one, never a
+    partially written table, and are never blocked by the load. The write
+    lock of the live file is held from the backup until the rename, so no
+    write to the live file is lost; writers wait for the swap like for any
+    other write transaction.
+
+    Connections opened before the swap keep reading the previous snapshot
+    until their transaction ends. Every engine with the SQLite PRAGMAs
+    installed, in any process, reconnects pooled connections to the new
+    file on checkout and fails transactions that wrote to the replaced file,
+    see install_sqlite_pragmas. The async engine does not pool connections,
+    so it always opens the current file.
+
+    WAL sidecar files belong to a specific database file and cannot be
+    swapped with it, so this mode requires a rollback journal
+    (HSR_SQLITE_JOURNAL_MODE=DELETE).
+
+    Args:
+        engine: SQLAlchemy engine of the live SQLite database.
+        rows: Row dictionaries keyed by HsrCharacters columns.
+        prune: Delete characters that are not in rows.
+        run_id: Identifier of the scrape run that produced the rows.
+
+    Returns:
+        Dictionary with the number of inserted, updated, unchanged and
+        deleted rows.
+
+    Raises:
+        ValueError: If the engine is not a file-based SQLite database in a
+            rollback journal mode.
+    """
+    database = engine.url.database
+    if engine.dialect.name != "sqlite" or database in (None, "", ":memory:"):
+        raise ValueError("Snapshot swap requires a file-based SQLite database.")
+
+    live_path = Path(database)
+    snapshot_path = live_path.with_name(f".{live_path.name}.{uuid.uuid4().hex}.tmp")
+    with closing(
+        sqlite3.connect(
+            live_path,
+            isolation_level=None,
+            timeout=SQLITE_PRAGMAS["busy_timeout"] / 1000,
+        )
+    ) as writer:
+        journal_mode = writer.execute("PRAGMA journal_mode").fetchone()[0]
+        if str(journal_mode).lower() == "wal":
+            raise ValueError(
+                "Snapshot swap cannot be used with WAL journaling; "
+                "set HSR_SQLITE_JOURNAL_MODE=DELETE."
+            )
+
+        # Rolled back when the writer closes, after the rename.
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            with (
+                closing(sqlite3.connect(live_path)) as source,
+                closing(sqlite3.connect(snapshot_path)) as target,
+            ):
+                source.backup(target)
+
+            snapshot_engine = create_engine(
+                f"sqlite:///{snapshot_path}", poolclass=NullPool
+            )
+            try:
+                install_sqlite_pragmas(snapshot_engine, journal_mode="DELETE")
+                with begin_write(snapshot_engine) as conn:
+                    counts = write_load(conn, rows, prune, run_id)
+            finally:
+                snapshot_engine.dispose()
+
+            os.replace(snapshot_path, live_path)
+        finally:
+            snapshot_path.unlink(missing_ok=True)
+
+    engine.dispose()
+    return counts
+
+
+def finish_load(conn: Connection, run_id: str) -> None:
+    """
+    Updates the tables derived from HsrCharacters after an upsert.
+
+    Args:
+        conn: Connection inside the load transaction.
+        run_id: Identifier of the scrape run that produced the load.
+    """
+    run_number = record_scrape_run(conn, run_id)
+    history = record_history(conn, run_number)
+    logger.info(f"Recorded run {run_number} in the character history: {history}")
+    refresh_dimensions(conn)
+    refresh_chart_aggregates(conn)
+    refresh_character_search(conn)
+    bump_data_generation(conn)
+
+
+def dataframe_to_rows(df: pd.DataFrame) -> list[dict[str, Any]]:
+    """
+    Converts a character dataframe to rows keyed by HsrCharacters columns.
+
+    Columns that are not part of the model are ignored, values are coerced
+    to the column's Python type and missing values become None. Values of
+    numeric columns that are not numbers, such as an 'Unknown' rarity, are
+    treated as missing.
+
+    Args:
+        df: Character dataframe.
+
+    Returns:
+        List of row dictionaries with Python scalar values.
+    """
+    casts = {
+        column.name: column.type.python_type
+        for column in CHARACTER_TABLE.columns
+        if column.name in df
+    }
+    subset = df[list(casts)].copy()
+    for column, cast in casts.items():
+        if cast in (int, float):
+            subset[column] = pd.to_numeric(subset[column], errors="coerce")
+    subset = subset.astype(object)
+    records = subset.where(subset.notna(), None).to_dict("records")
+    return [
+        {
+            column: None if value is None else casts[column](value)
+            for column, value in record.items()
+        }
+        for record in records
+    ]
+
+
+def upsert_characters(
+    conn: Connection, rows: list[dict[str, Any]], prune: bool = True
+) -> dict[str, int]:
+    """
+    Upserts character rows and reports what changed.
+
+    Args:
+        conn: Connection inside the load transaction.
+        rows: Row dictionaries keyed by HsrCharacters columns.
+        prune: Delete characters that are not in rows.
+
+    Returns:
+        Dictionary with the number of inserted, updated, unchanged and
+        deleted rows.
+    """
+    existing = {
+        row["Character"]: row
+        for row in conn.execute(select(CHARACTER_TABLE)).mappings()
+    }
+
+    inserted = updated = 0
+    changed: list[dict[str, Any]] = []
+    for row in rows:
+        current = existing.get(row["Character"])
+        if current is None:
+            inserted += 1
+        elif any(current[column] != value for column, value in row.items()):
+            updated += 1
+        else:
+            continue
+        changed.append(row)
+
+    # Executemany and COPY require every row in a batch to have the same keys.
+    for columns, group in itertools.groupby(
+        sorted(changed, key=lambda row: tuple(row)), key=lambda row: tuple(row)
+    ):
+        if copy_supported(conn):
+            _copy_upsert(conn, columns, list(group))
+            continue
+        stmt = _upsert_stmt(columns, conn.dialect.name)
+        for batch in itertools.batched(group, BATCH_SIZE):
+            conn.execute(stmt, list(batch))
+
+    deleted = 0
+    if prune:
+        stale = existing.keys() - {row["Character"] for row in rows}
+        for batch in itertools.batched(sorted(stale), BATCH_SIZE):
+            conn.execute(
+                delete(CHARACTER_TABLE).where(CHARACTER_TABLE.c.Character.in_(batch))
+            )
+        deleted = len(stale)
+
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": len(rows) - inserted - updated,
+        "deleted": deleted,
+    }
+
+
+def copy_supported(conn: Union[Connection, Engine]) -> bool:
+    """
+    Checks whether rows can be bulk loaded with COPY ... FROM STDIN.
+
+    Args:
+        conn: Database connection or engine.
+
+    Returns:
+        True for PostgreSQL connections through the psycopg driver.
+    """
+    return conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg"
+
+
+def _copy_upsert(
+    conn: Connection, columns: tuple[str, ...], rows: list[dict[str, Any]]
+) -> None:
+    """
+    Upserts rows by copying them into the staging table first.
+
+    COPY streams every row in one round trip, then a single INSERT ... SELECT
+    ... ON CONFLICT merges them. The staging table is temporary and dropped
+    at commit.
+
+    Args:
+        conn: PostgreSQL connection inside the load transaction.
+        columns: Columns present in the rows.
+        rows: Row dictionaries keyed by columns.
+    """
+    STAGING_TABLE.create(conn, checkfirst=True)
+    conn.execute(delete(STAGING_TABLE))
+
+    # A conflicting row may only be updated once per statement; the last
+    # duplicate wins, as with executemany.
+    unique_rows = {row["Character"]: row for row in rows}.values()
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    cursor = conn.connection.driver_connection.cursor()
+    with (
+        cursor,
+        cursor.copy(f'COPY "{STAGING_TABLE.name}" ({column_list}) FROM STDIN') as copy,
+    ):
+        for row in unique_rows:
+            copy.write_row([row[column] for column in columns])
+
+    source = select(*(STAGING_TABLE.c[column] for column in columns))
+    conn.execute(_upsert_stmt(columns, conn.dialect.name, source))
+
+
+def _upsert_stmt(
+    columns: tuple[str, ...], dialect: str = "sqlite", source: Optional[Select] = None
+):
+    """
+    Builds the INSERT ... ON CONFLICT(Character) DO UPDATE statement.
+
+    Args:
+        columns: Columns present in the rows.
+        dialect: Name of the database dialect.
+        source: SELECT of the rows to insert, in columns order; without it
+            the statement takes the rows as parameters.
+
+    Returns:
+        SQLAlchemy insert statement.
+
+    Raises:
+        ValueError: If the dialect has no INSERT ... ON CONFLICT support.
+    """
+    if dialect not in UPSERT_INSERTS:
+        raise ValueError(f"Upserts are not supported on {dialect!r} databases")
+    stmt = UPSERT_INSERTS[dialect](CHARACTER_TABLE)
+    if source is not None:
+        stmt = stmt.from_select(columns, source)
+    updates = [column for column in columns if column != "Character"]
+    if not updates:
+        return stmt.on_conflict_do_nothing(index_elements=["Character"])
+    return stmt.on_conflict_do_update(
+        index_elements=["Character"],
+        set_={column: stmt.excluded[column] for column in updates},
+        where=or_(
+            *(
+                CHARACTER_TABLE.c[column].is_distinct_from(stmt.excluded[column])
+                for column in updates
+            )
+        ),
+    )
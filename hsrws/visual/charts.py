@@ -8,15 +8,7 @@ from loguru import logger
 import io
 from PIL import Image
 
-from hsrws.visual.data_utils import (
-    get_latest_patch,
-    get_element_path_heatmap_data,
-    get_rarity_element_distribution_data,
-    get_version_release_timeline_data,
-    get_element_balance_evolution_data,
-    get_path_rarity_distribution_data,
-    get_path_balance_evolution_data,
-)
+from hsrws.visual.data_utils import format_patch, get_chart_datasets
 from hsrws.visual.plotting import (
     plot_element_path_heatmap,
     plot_rarity_element_distribution,
@@ -87,43 +79,44 @@ def create_advanced_charts():
     # Set seaborn style
     sns.set_theme(style="whitegrid")
 
-    # Get the latest patch version
-    latest_patch = get_latest_patch()
+    # Read every chart dataset in a single pass over the character table
+    datasets = get_chart_datasets()
+    latest_patch = format_patch(datasets.latest_version)
 
     # Create element-path heatmap
-    element_path_data = get_element_path_heatmap_data()
-    element_path_fig = plot_element_path_heatmap(element_path_data, latest_patch)
+    element_path_fig = plot_element_path_heatmap(
+        datasets.element_path_heatmap, latest_patch
+    )
     save_figure(element_path_fig, "element_path_heatmap.png")
 
     # Create rarity-element stacked bar chart
-    rarity_element_data = get_rarity_element_distribution_data()
     rarity_element_fig = plot_rarity_element_distribution(
-        rarity_element_data, latest_patch
+        datasets.rarity_element_distribution, latest_patch
     )
     save_figure(rarity_element_fig, "rarity_element_distribution.png")
 
     # Create version release timeline
-    version_release_data = get_version_release_timeline_data()
     version_release_fig = plot_version_release_timeline(
-        version_release_data, latest_patch
+        datasets.version_release_timeline, latest_patch
     )
     save_figure(version_release_fig, "version_release_timeline.png")
 
     # Create elemental balance evolution area chart
-    element_evolution_data = get_element_balance_evolution_data()
     element_evolution_fig = plot_element_balance_evolution(
-        element_evolution_data, latest_patch
+        datasets.element_balance_evolution, latest_patch
     )
     save_figure(element_evolution_fig, "element_balance_evolution.png")
 
     # Create path-rarity grouped bar chart
-    path_rarity_data = get_path_rarity_distribution_data()
-    path_rarity_fig = plot_path_rarity_distribution(path_rarity_data, latest_patch)
+    path_rarity_fig = plot_path_rarity_distribution(
+        datasets.path_rarity_distribution, latest_patch
+    )
     save_figure(path_rarity_fig, "path_rarity_distribution.png")
 
     # Create path balance evolution line chart
-    path_evolution_data = get_path_balance_evolution_data()
-    path_evolution_fig = plot_path_balance_evolution(path_evolution_data, latest_patch)
+    path_evolution_fig = plot_path_balance_evolution(
+        datasets.path_balance_evolution, latest_patch
+    )
     save_figure(path_evolution_fig, "path_balance_evolution.png")
 
     logger.info(
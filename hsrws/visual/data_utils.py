@@ -1,39 +1,162 @@
 """Data utility functions for visualization."""
 
-from typing import Any
+import asyncio
+from typing import Any, Optional, Sequence
+
 import pandas as pd
-from sqlalchemy import Select
-from hsrws.db import get_session
+from sqlalchemy import Connection, Select, func, select
+
+from hsrws.db.backends import get_query_backend, get_query_engine, get_query_session
+from hsrws.db.character_store import character_store_enabled, get_character_store
+from hsrws.db.chart_aggregates import (
+    ChartDatasets,
+    compute_chart_datasets,
+    count_character_cube,
+    read_chart_aggregates,
+)
+from hsrws.db.columnar import fetch_columnar, get_column_dtypes
+from hsrws.db.database import get_async_engine
+from hsrws.db.export import (
+    export_table_to_frame,
+    get_export_generation,
+    read_export_table,
+)
+from hsrws.db.generation import get_data_generation
 from hsrws.db.queries import (
-    get_latest_patch_stmt,
+    CharacterFilter,
+    CharacterSelection,
+    build_aggregate_stmt,
+    filter_params,
+    get_character_cube_stmt,
     get_element_path_heatmap_stmt,
+    get_latest_patch_stmt,
+    get_path_rarity_distribution_stmt,
     get_rarity_element_distribution_stmt,
-    get_version_release_timeline_stmt,
+    get_selection_stmt,
     get_version_element_evolution_stmt,
-    get_path_rarity_distribution_stmt,
     get_version_path_evolution_stmt,
+    get_version_release_timeline_stmt,
 )
+from hsrws.db.result_cache import query_cache, statement_cache_key
 
 
-def fetch_data_orm(stmt: Select[tuple[Any, ...]]):
+def fetch_data_orm(
+    stmt: Select[tuple[Any, ...]], params: Optional[dict[str, Any]] = None
+):
     """
     Fetches data from the database using SQLAlchemy ORM.
 
+    Statements run on the configured query backend. Results are cached per
+    statement and parameters until the next load bumps the data generation.
+
     Args:
         stmt: SQLAlchemy statement to execute.
+        params: Values of the bound parameters of the statement, such as
+            filter_params(filters) for a filtered statement.
 
     Returns:
         DataFrame with query results.
     """
-    with get_session() as session:
-        result = session.execute(stmt).all()
-        # Convert to pandas DataFrame with column names
-        column_names = (
-            [col.key for col in stmt.selected_columns]
-            if hasattr(stmt, "selected_columns")
-            else [c["name"] for c in stmt.column_descriptions]
-        )
-        return pd.DataFrame(result, columns=column_names)
+    with get_query_session() as session:
+        return _fetch_cached(session.connection(), stmt, params)
+
+
+async def fetch_data_async(
+    stmt: Select[tuple[Any, ...]], params: Optional[dict[str, Any]] = None
+) -> pd.DataFrame:
+    """
+    Fetches data without blocking the event loop.
+
+    On the SQLite backend the statement runs on the async engine and shares
+    the result cache of fetch_data_orm. Other query backends have no async
+    driver, so the synchronous fetch runs in a worker thread.
+
+    Args:
+        stmt: SQLAlchemy statement to execute.
+        params: Values of the bound parameters of the statement.
+
+    Returns:
+        DataFrame with query results.
+    """
+    if get_query_backend() != "sqlite":
+        return await asyncio.to_thread(fetch_data_orm, stmt, params)
+    engine = await get_async_engine()
+    async with engine.connect() as conn:
+        return await conn.run_sync(_fetch_cached, stmt, params)
+
+
+async def fetch_many_async(
+    stmts: Sequence[Select[tuple[Any, ...]]],
+) -> list[pd.DataFrame]:
+    """
+    Fetches several statements concurrently, each on its own connection.
+
+    Args:
+        stmts: SQLAlchemy statements to execute.
+
+    Returns:
+        DataFrames with the query results, in the order of the statements.
+    """
+    return list(await asyncio.gather(*(fetch_data_async(stmt) for stmt in stmts)))
+
+
+def _fetch_cached(
+    conn: Connection,
+    stmt: Select[tuple[Any, ...]],
+    params: Optional[dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """
+    Reads a statement through the result cache.
+
+    Args:
+        conn: Database connection.
+        stmt: SQLAlchemy statement to execute.
+        params: Values of the bound parameters of the statement.
+
+    Returns:
+        DataFrame with query results.
+    """
+    return query_cache.get_or_compute(
+        (
+            *statement_cache_key(stmt, conn.dialect),
+            repr(sorted((params or {}).items())),
+        ),
+        get_data_generation(conn),
+        lambda: _execute_to_dataframe(conn, stmt, params),
+    )
+
+
+def _execute_to_dataframe(
+    conn: Connection,
+    stmt: Select[tuple[Any, ...]],
+    params: Optional[dict[str, Any]] = None,
+):
+    """
+    Executes a statement and converts its rows to a DataFrame.
+
+    Statements whose column types are known are read column by column from
+    the cursor; other statements go through SQLAlchemy rows.
+
+    Args:
+        conn: Database connection.
+        stmt: SQLAlchemy statement to execute.
+        params: Values of the bound parameters of the statement.
+
+    Returns:
+        DataFrame with query results.
+    """
+    dtypes = get_column_dtypes(stmt, conn.dialect)
+    if dtypes is not None:
+        return fetch_columnar(conn, stmt, dtypes, params=params)
+
+    result = conn.execute(stmt, params).all()
+    # Convert to pandas DataFrame with column names
+    column_names = (
+        [col.key for col in stmt.selected_columns]
+        if hasattr(stmt, "selected_columns")
+        else [c["name"] for c in stmt.column_descriptions]
+    )
+    return pd.DataFrame(result, columns=column_names)
 
 
 def get_latest_patch():
@@ -45,9 +168,161 @@ def get_latest_patch():
     """
     result = fetch_data_orm(get_latest_patch_stmt())
     version: float = result.iloc[0]["latest_version"]  # type: ignore
+    return format_patch(version)
+
+
+def format_patch(version: Optional[float]) -> str:
+    """
+    Formats a patch version for chart titles.
+
+    Args:
+        version: Patch version number.
+
+    Returns:
+        Patch version formatted as "Patch (X.X)".
+    """
     return f"Patch ({version})"
 
 
+def get_chart_datasets() -> ChartDatasets:
+    """
+    Gets every chart dataset.
+
+    The columnar export written by the last load is memory-mapped and rolled
+    up without reading the character table, as long as it was written at the
+    current data generation; an export left behind by an older load is
+    ignored. Otherwise the datasets materialized by the last load are read
+    as they are, and a database loaded before they existed falls back to
+    computing them from a single read of the character cube.
+
+    Returns:
+        Bundle of chart datasets.
+    """
+    table = read_export_table()
+    with get_query_engine().connect() as conn:
+        generation = get_data_generation(conn)
+        if table is not None and get_export_generation(table) == generation:
+            return query_cache.get_or_compute(
+                ("chart_datasets", "export"),
+                generation,
+                lambda: compute_chart_datasets(
+                    count_character_cube(export_table_to_frame(table))
+                ),
+            )
+        datasets = query_cache.get_or_compute(
+            ("chart_datasets",),
+            generation,
+            lambda: read_chart_aggregates(conn),
+        )
+    if datasets is not None:
+        return datasets
+    return compute_chart_datasets(fetch_data_orm(get_character_cube_stmt()))
+
+
+def get_character_counts(
+    dimensions: tuple[str, ...],
+    filters: Optional[CharacterFilter] = None,
+    aggregate: str = "count",
+    stat: Optional[str] = None,
+    **options: Any,
+) -> pd.DataFrame:
+    """
+    Aggregates characters per combination of dimensions.
+
+    Counts are answered from the in-process character store without SQL;
+    other aggregates, or every read when the store is disabled, run
+    build_aggregate_stmt on the query backend.
+
+    Args:
+        dimensions: Dimension columns to group by, also the output order.
+        filters: Character filter, None for every character.
+        aggregate: 'count', 'sum' or 'avg'.
+        stat: Stat column to aggregate.
+        **options: Other build_aggregate_stmt arguments, such as cumulative.
+
+    Returns:
+        DataFrame with one column per dimension and the aggregate column.
+
+    Raises:
+        ValueError: If the arguments are not supported by build_aggregate_stmt.
+    """
+    if character_store_enabled() and aggregate == "count" and stat is None:
+        return get_character_store().aggregate(dimensions, filters, **options)
+    return fetch_data_orm(
+        build_aggregate_stmt(dimensions, filters, aggregate, stat, **options),
+        filter_params(filters),
+    )
+
+
+def get_character_crosstab(
+    index: str, columns: str, filters: Optional[CharacterFilter] = None
+) -> pd.DataFrame:
+    """
+    Counts characters per pair of dimension values as a table.
+
+    Args:
+        index: Dimension of the rows.
+        columns: Dimension of the columns.
+        filters: Character filter, None for every character.
+
+    Returns:
+        DataFrame indexed by the values of index with one column per value
+        of columns, holding the counts.
+
+    Raises:
+        ValueError: If a dimension is unknown or both are the same.
+    """
+    if character_store_enabled():
+        return get_character_store().crosstab(index, columns, filters)
+    if index == columns:
+        raise ValueError(f"Invalid dimensions {(index, columns)}")
+    counts = fetch_data_orm(
+        build_aggregate_stmt((index, columns), filters), filter_params(filters)
+    )
+    return (
+        counts.pivot(index=index, columns=columns, values="count")
+        .fillna(0)
+        .astype("int64")
+    )
+
+
+def get_selected_characters(selection: CharacterSelection) -> pd.DataFrame:
+    """
+    Reads the characters matching a combination of dimension filters.
+
+    The bitmap index of the character store intersects the filters without
+    SQL; get_selection_stmt runs instead when the store is disabled.
+
+    Args:
+        selection: Character selection.
+
+    Returns:
+        DataFrame with the Character, Path, Element, Rarity and Version of
+        the matching characters, ordered by Character.
+    """
+    if character_store_enabled():
+        return get_character_store().select_characters(selection)
+    return fetch_data_orm(get_selection_stmt(selection), filter_params(selection))
+
+
+def count_selected_characters(selection: CharacterSelection) -> int:
+    """
+    Counts the characters matching a combination of dimension filters.
+
+    Args:
+        selection: Character selection.
+
+    Returns:
+        Number of matching characters.
+    """
+    if character_store_enabled():
+        return get_character_store().count_characters(selection)
+    count_stmt = select(func.count().label("count")).select_from(
+        get_selection_stmt(selection).subquery()
+    )
+    return int(fetch_data_orm(count_stmt, filter_params(selection))["count"].iloc[0])
+
+
 def get_element_path_heatmap_data():
     """
     Gets the Element-Path distribution data for heatmap.
@@ -149,6 +424,9 @@ def get_rarity_colors():
     """
     Gets a mapping of rarity levels to their display colors.
 
+    Rarities are integers in the database; the keys are their text form,
+    as used for the plot hue.
+
     Returns:
         Dictionary mapping rarity levels to color values.
     """
@@ -26,7 +26,7 @@ def plot_rarity_element_distribution(
 
     # Create catplot with seaborn (include legend by default)
     g = sns.catplot(
-        data=df,
+        data=df.astype({"Rarity": str}),
         x="Element",
         y="count",
         hue="Rarity",
@@ -73,7 +73,7 @@ def plot_path_rarity_distribution(
 
     # Create catplot with seaborn (include legend by default)
     g = sns.catplot(
-        data=df,
+        data=df.astype({"Rarity": str}),
         x="Path",
         y="count",
         hue="Rarity",
@@ -1,23 +1,33 @@
 """Main script for Honkai Star Rail data analysis."""
 
 import asyncio
+import math
 import os
 import sys
-from typing import Any
+from typing import Any, Optional
 
 import pandas as pd
 from loguru import logger
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 
 from hsrws.core.scraper import Scraper
 from hsrws.utils.payload import get_headers
-from hsrws.data.transformer import (
-    transform_char_name,
-    clean_path_name,
-    add_char_version,
-)
-from hsrws.db.sqlite import load_to_sqlite
+from hsrws.data.transformer import transform_character_data
+from hsrws.data.memo import load_transform_memo, save_transform_memo
+from hsrws.db.dead_letters import store_dead_letters
+from hsrws.db.diff import diff_snapshots
+from hsrws.db.database import get_engine
+from hsrws.db.history import parse_run_reference
+from hsrws.db.queries import CharacterFilter, CharacterSelection
+from hsrws.db.search import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, search_characters
+from hsrws.db.sqlite import load_to_sqlite_async
 from hsrws.visual.charts import create_advanced_charts
+from hsrws.visual.data_utils import (
+    count_selected_characters,
+    get_character_counts,
+    get_character_crosstab,
+    get_selected_characters,
+)
 
 # Configure logger
 logger.configure(handlers=[{"sink": sys.stderr, "level": "WARNING"}])
@@ -32,33 +42,58 @@ logger.add(
 app = Flask(__name__)
 
 
-def scrape_data() -> pd.DataFrame:
+async def scrape_data_async() -> pd.DataFrame:
     """
-    Function to scrape character data from Honkai Star Rail API.
+    Scrapes character data from Honkai Star Rail API.
+
+    Database and file access run in worker threads, so the event loop
+    keeps serving the scraper requests.
 
     Returns:
         Pandas DataFrame with character data.
     """
     url: str = "https://sg-wiki-api.hoyolab.com/hoyowiki/hsr/wapi/get_entry_page_list"
     headers: dict[str, Any] = get_headers()
+    await asyncio.to_thread(load_transform_memo)
 
     scraper: Scraper = Scraper()  # type: ignore
-    character_data_dataframe: pd.DataFrame = asyncio.run(
-        scraper.scrape_hsr_data(url, headers)
-    )
+    character_data_dataframe: pd.DataFrame = await scraper.scrape_hsr_data(url, headers)
 
-    character_data_dataframe["Character"] = character_data_dataframe["Character"].apply(  # type: ignore
-        transform_char_name
-    )
-    character_data_dataframe["Path"] = character_data_dataframe["Path"].apply(  # type: ignore
-        clean_path_name
-    )
+    await asyncio.to_thread(store_dead_letters, scraper.run_id, scraper.dead_letters)
+
+    transform_character_data(character_data_dataframe)
+    await asyncio.to_thread(save_transform_memo)
 
-    add_char_version(character_data_dataframe)
+    # Links the loaded run to its dead letters in the run log
+    character_data_dataframe.attrs["run_id"] = scraper.run_id
 
     return character_data_dataframe
 
 
+def scrape_data() -> pd.DataFrame:
+    """
+    Function to scrape character data from Honkai Star Rail API.
+
+    Returns:
+        Pandas DataFrame with character data.
+    """
+    return asyncio.run(scrape_data_async())
+
+
+async def scrape_and_load() -> tuple[pd.DataFrame, dict[str, int]]:
+    """
+    Scrapes character data and loads it in one event loop.
+
+    Returns:
+        Scraped DataFrame and the load counts.
+    """
+    char_data_df = await scrape_data_async()
+    load_counts = await load_to_sqlite_async(
+        char_data_df, run_id=char_data_df.attrs.get("run_id")
+    )
+    return char_data_df, load_counts
+
+
 def visualize_data() -> None:
     """Create visualization charts from the database."""
     create_advanced_charts()
@@ -70,14 +105,14 @@ def api_scrape():
     """API endpoint for scraping data."""
     try:
         logger.info("Starting data scraping via API")
-        char_data_df = scrape_data()
-        load_to_sqlite(char_data_df)
+        char_data_df, load_counts = asyncio.run(scrape_and_load())
         logger.info("Data scraping and storage complete")
         return jsonify(
             {
                 "status": "success",
                 "message": "Data scraping complete",
                 "data_shape": char_data_df.shape,
+                "load": load_counts,
             }
         )
     except Exception as e:
@@ -104,6 +139,204 @@ def api_visualize():
         ), 500
 
 
+@app.route("/diff", methods=["GET"])
+def api_diff():
+    """API endpoint comparing the characters of two recorded runs."""
+    try:
+        old, new = (
+            parse_run_reference(request.args[name]) if name in request.args else None
+            for name in ("old", "new")
+        )
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    try:
+        diff = diff_snapshots(old, new)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 404
+    except Exception as e:
+        logger.error(f"Error during diff: {e}")
+        return jsonify(
+            {"status": "error", "message": "An internal error has occurred."}
+        ), 500
+    return jsonify({"status": "success", "diff": diff.to_dict()})
+
+
+@app.route("/search", methods=["GET"])
+def api_search():
+    """API endpoint searching characters by name, path and element."""
+    query = request.args.get("q", "")
+    try:
+        limit = int(request.args.get("limit", DEFAULT_SEARCH_LIMIT))
+    except ValueError:
+        return jsonify({"status": "error", "message": "limit must be an integer"}), 400
+    if not query.strip():
+        return jsonify({"status": "error", "message": "Missing search query q"}), 400
+    prefix = request.args.get("prefix", "true").lower() in ("true", "1", "t")
+    try:
+        with get_engine().connect() as conn:
+            results = search_characters(
+                conn, query, min(max(limit, 1), MAX_SEARCH_LIMIT), prefix
+            )
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 501
+    except Exception as e:
+        logger.error(f"Error during search: {e}")
+        return jsonify(
+            {"status": "error", "message": "An internal error has occurred."}
+        ), 500
+    return jsonify({"status": "success", "results": results})
+
+
+def parse_character_filter(args: Any) -> CharacterFilter:
+    """
+    Reads a character filter from query string arguments.
+
+    Args:
+        args: Request arguments with optional min_version, max_version,
+            element and path values.
+
+    Returns:
+        Character filter.
+
+    Raises:
+        ValueError: If a version is not a finite number.
+    """
+    return CharacterFilter(
+        min_version=parse_version(args, "min_version"),
+        max_version=parse_version(args, "max_version"),
+        element=args.get("element"),
+        path=args.get("path"),
+    )
+
+
+def parse_version(args: Any, name: str) -> Optional[float]:
+    """
+    Reads a patch version from query string arguments.
+
+    Args:
+        args: Request arguments.
+        name: Name of the version argument.
+
+    Returns:
+        Version, None if the argument is missing or empty.
+
+    Raises:
+        ValueError: If the version is not a finite number.
+    """
+    if not args.get(name):
+        return None
+    version = float(args[name])
+    if not math.isfinite(version):
+        raise ValueError(f"{name} must be a finite number, not {args[name]!r}")
+    return version
+
+
+def parse_character_selection(args: Any) -> CharacterSelection:
+    """
+    Reads a character selection from query string arguments.
+
+    Args:
+        args: Request arguments with optional comma-separated path, element
+            and rarity values and min_version and max_version numbers.
+
+    Returns:
+        Character selection.
+
+    Raises:
+        ValueError: If a rarity is not a number or a version is not a finite
+            number.
+    """
+
+    def values(name: str) -> list[str]:
+        return [value for value in args.get(name, "").split(",") if value]
+
+    return CharacterSelection(
+        paths=tuple(values("path")),
+        elements=tuple(values("element")),
+        rarities=tuple(int(value) for value in values("rarity")),
+        min_version=parse_version(args, "min_version"),
+        max_version=parse_version(args, "max_version"),
+    )
+
+
+@app.route("/characters", methods=["GET"])
+def api_characters():
+    """API endpoint listing the characters matching a combination of filters."""
+    try:
+        selection = parse_character_selection(request.args)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    count_only = request.args.get("count_only", "false").lower() in ("true", "1", "t")
+    try:
+        if count_only:
+            return jsonify(
+                {"status": "success", "count": count_selected_characters(selection)}
+            )
+        characters = get_selected_characters(selection)
+    except Exception as e:
+        logger.error(f"Error during character selection: {e}")
+        return jsonify(
+            {"status": "error", "message": "An internal error has occurred."}
+        ), 500
+    records = (
+        characters.astype(object).where(characters.notna(), None).to_dict("records")
+    )
+    return jsonify({"status": "success", "count": len(records), "characters": records})
+
+
+def _index_values(index: pd.Index) -> list[Any]:
+    """Converts index labels to JSON values, with None for NULL."""
+    return index.astype(object).where(index.notna(), None).tolist()
+
+
+@app.route("/stats", methods=["GET"])
+def api_stats():
+    """API endpoint counting characters per combination of dimensions."""
+    dimensions = tuple(
+        name for name in request.args.get("dimensions", "").split(",") if name
+    )
+    cumulative = request.args.get("cumulative", "false").lower() in ("true", "1", "t")
+    try:
+        counts = get_character_counts(
+            dimensions, parse_character_filter(request.args), cumulative=cumulative
+        )
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error during stats: {e}")
+        return jsonify(
+            {"status": "error", "message": "An internal error has occurred."}
+        ), 500
+    records = counts.astype(object).where(counts.notna(), None).to_dict("records")
+    return jsonify({"status": "success", "results": records})
+
+
+@app.route("/stats/crosstab", methods=["GET"])
+def api_stats_crosstab():
+    """API endpoint counting characters per pair of dimension values."""
+    try:
+        table = get_character_crosstab(
+            request.args.get("index", "Element"),
+            request.args.get("columns", "Path"),
+            parse_character_filter(request.args),
+        )
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error during crosstab: {e}")
+        return jsonify(
+            {"status": "error", "message": "An internal error has occurred."}
+        ), 500
+    return jsonify(
+        {
+            "status": "success",
+            "index": _index_values(table.index),
+            "columns": _index_values(table.columns),
+            "counts": table.to_numpy().tolist(),
+        }
+    )
+
+
 if __name__ == "__main__":
     debug_mode = os.getenv("FLASK_DEBUG", "False").lower() in ("true", "1", "t")
     app.run(debug=debug_mode, host="0.0.0.0", port=1234)
@@ -75,3 +75,20 @@ def mock_character_list():
             "rarity": 4,
         },
     ]
+
+
+@pytest.fixture
+def temp_database(monkeypatch, tmp_path):
+    """Point the application engine at a temporary SQLite database."""
+    from hsrws.db.character_store import reset_character_store
+    from hsrws.db.database import dispose_engine, get_engine
+    from hsrws.db.result_cache import query_cache
+
+    monkeypatch.setenv("HSR_DATABASE_URL", f"sqlite:///{tmp_path / 'hsr.db'}")
+    dispose_engine()
+    query_cache.clear()
+    reset_character_store()
+    yield get_engine()
+    dispose_engine()
+    query_cache.clear()
+    reset_character_store()
@@ -0,0 +1,216 @@
+"""Tests for character record validation."""
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from hsrws.core.records import (
+    CharacterRecord,
+    MalformedEntryError,
+    flatten_character_entry,
+    format_error_summary,
+    records_to_dataframe,
+    validate_character_page,
+)
+from hsrws.utils.payload import default_char_data_dict
+
+
+def make_entry(name="Test Character", stats=None, **filter_values):
+    """Build a raw API character entry."""
+    entry = {"name": name, "filter_values": {}, "display_field": {}}
+    for key, values in filter_values.items():
+        entry["filter_values"][key] = {"values": values}
+    if stats is not None:
+        entry["display_field"]["attr_level_80"] = json.dumps(stats)
+    return entry
+
+
+FULL_STATS = {"base_atk": 100, "base_def": 200, "base_hp": 300, "base_speed": 400}
+
+
+def test_valid_page_has_no_errors():
+    """Test that a valid page validates without error counts."""
+    entry = make_entry(
+        stats=FULL_STATS,
+        character_paths=["The Hunt"],
+        character_combat_type=["Fire"],
+        character_rarity=["5-Star"],
+    )
+
+    records, errors, rejected = validate_character_page([entry])
+
+    assert not errors
+    assert not rejected
+    assert records[0].model_dump(by_alias=True) == {
+        "Character": "Test Character",
+        "Path": "Hunt",
+        "Element": "Fire",
+        "Rarity": "5",
+        "ATK Lvl 80": 100,
+        "DEF Lvl 80": 200,
+        "HP Lvl 80": 300,
+        "SPD Lvl 80": 400,
+    }
+
+
+def test_numeric_string_stats_are_coerced():
+    """Test that stats given as numeric strings are parsed to integers."""
+    stats = {key: str(value) for key, value in FULL_STATS.items()}
+    records, errors, _ = validate_character_page([make_entry(stats=stats)])
+
+    assert not errors
+    assert records[0].spd_lvl_80 == 400
+
+
+def test_missing_stats_are_null():
+    """Test that missing stats stay None instead of polluting averages."""
+    partial = {k: v for k, v in FULL_STATS.items() if k != "base_speed"}
+    records, errors, rejected = validate_character_page(
+        [make_entry(name="A", stats=partial), make_entry(name="B")]
+    )
+
+    assert [r.spd_lvl_80 for r in records] == [None, None]
+    assert records[0].atk_lvl_80 == 100
+    assert not errors
+    assert not rejected
+
+
+def test_malformed_stats_are_rejected_and_counted():
+    """Test that entries with invalid stats are rejected, not zeroed."""
+    bad = {**FULL_STATS, "base_atk": "lots"}
+    records, errors, rejected = validate_character_page(
+        [make_entry(name="A", stats=bad), make_entry(name="B", stats=FULL_STATS)]
+    )
+
+    assert [r.character for r in records] == ["B"]
+    assert errors[("ATK Lvl 80", "int_parsing")] == 1
+    assert rejected[0].entry["name"] == "A"
+    assert rejected[0].reason.startswith("ATK Lvl 80:")
+
+
+def test_missing_type_data_defaults_to_unknown():
+    """Test that empty or malformed filter values become 'Unknown'."""
+    entry = {
+        "name": "Test Character",
+        "filter_values": {"character_paths": {}, "character_rarity": {"values": []}},
+    }
+    records, _, _ = validate_character_page([entry])
+
+    assert (records[0].path, records[0].element, records[0].rarity) == (
+        "Unknown",
+        "Unknown",
+        "Unknown",
+    )
+
+
+def test_missing_name_is_rejected():
+    """Test that a character without a name does not abort the page."""
+    records, errors, rejected = validate_character_page(
+        [make_entry(stats=FULL_STATS), {"display_field": {}}]
+    )
+
+    assert len(records) == 1
+    assert rejected[0].entry == {"display_field": {}}
+    assert errors[("Character", "missing")] == 1
+
+
+def test_invalid_stats_json_is_rejected():
+    """Test that undecodable stats JSON rejects the entry."""
+    entry = {"name": "X", "display_field": {"attr_level_80": "{not json"}}
+    with pytest.raises(ValueError):
+        flatten_character_entry(entry)
+
+    records, errors, rejected = validate_character_page([entry, "not a dict"])
+
+    assert records == []
+    assert rejected[0].reason.startswith("attr_level_80:")
+    assert rejected[1].reason == "entry: not a JSON object"
+    assert errors[("attr_level_80", "json_invalid")] == 1
+
+
+@pytest.mark.parametrize(
+    "entry, field, error_type",
+    [
+        ({"name": "X", "filter_values": []}, "filter_values", "dict_type"),
+        (
+            {"name": "X", "filter_values": {"character_paths": "The Hunt"}},
+            "filter_values.character_paths",
+            "dict_type",
+        ),
+        (
+            {"name": "X", "filter_values": {"character_paths": {"values": "Hunt"}}},
+            "filter_values.character_paths.values",
+            "list_type",
+        ),
+        ({"name": "X", "display_field": "stats"}, "display_field", "dict_type"),
+        (
+            {"name": "X", "display_field": {"attr_level_80": 80}},
+            "attr_level_80",
+            "string_type",
+        ),
+        (
+            {"name": "X", "display_field": {"attr_level_80": "[1]"}},
+            "attr_level_80",
+            "dict_type",
+        ),
+    ],
+)
+def test_malformed_structure_is_rejected(entry, field, error_type):
+    """Test that each malformed nesting level is rejected with its own field."""
+    with pytest.raises(MalformedEntryError):
+        flatten_character_entry(entry)
+
+    records, errors, rejected = validate_character_page(
+        [entry, make_entry(name="Valid")]
+    )
+
+    assert [record.character for record in records] == ["Valid"]
+    assert rejected[0].entry is entry
+    assert rejected[0].reason.startswith(f"{field}:")
+    assert errors == {(field, error_type): 1}
+
+
+def test_rejected_entries_carry_keys():
+    """Test that rejected entries keep the key given for them."""
+    entries = [
+        "not a dict",
+        {"display_field": {}},
+        make_entry(),
+        {"name": "X", "filter_values": []},
+    ]
+
+    _, _, rejected = validate_character_page(entries, keys=[10, 11, 12, 13])
+
+    assert sorted(entry.key for entry in rejected) == [10, 11, 13]
+    assert validate_character_page(entries).rejected[0].key is None
+
+
+def test_records_to_dataframe():
+    """Test that records convert to the scraper's DataFrame columns."""
+    records, _, _ = validate_character_page([make_entry(stats=FULL_STATS)])
+    df = records_to_dataframe(records)
+
+    assert list(df.columns) == list(default_char_data_dict())
+    assert df.loc[0, "ATK Lvl 80"] == 100
+
+
+def test_record_is_frozen():
+    """Test that validated records are immutable."""
+    record = CharacterRecord.model_validate(
+        {
+            "Character": "X",
+            **{c: 1 for c in ["ATK Lvl 80", "DEF Lvl 80", "HP Lvl 80", "SPD Lvl 80"]},
+        }
+    )
+    with pytest.raises(ValidationError):
+        record.character = "Y"
+
+
+def test_format_error_summary():
+    """Test that error counts are summarized in a single line."""
+    _, errors, _ = validate_character_page([{}, {}, make_entry(stats={"base_hp": -1})])
+    summary = format_error_summary(errors)
+
+    assert summary.startswith("3 invalid fields")
+    assert "Character [missing]: 2" in summary
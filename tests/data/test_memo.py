@@ -0,0 +1,104 @@
+"""Tests for the transform memo."""
+
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from hsrws.data.memo import TransformMemo, fingerprint, transform_memo
+from hsrws.data.transformer import add_char_version, transform_char_name
+
+
+@pytest.fixture(autouse=True)
+def clear_memo():
+    """Reset the shared memo around each test."""
+    transform_memo.clear()
+    yield
+    transform_memo.clear()
+
+
+def test_memo_hit_skips_transform():
+    """Test that a repeated raw value is answered from the memo."""
+    assert transform_char_name("March 7th") == "march-7th"
+    assert transform_char_name("March 7th") == "march-7th"
+
+    assert transform_memo.misses == 1
+    assert transform_memo.hits == 1
+
+
+def test_memo_is_bounded():
+    """Test that the least recently used entries are evicted."""
+    memo = TransformMemo(max_size=2)
+    for raw in ["a", "b", "a", "c"]:
+        memo.get_or_compute("upper", "v1", raw, str.upper)
+
+    assert len(memo) == 2
+    # "b" was the least recently used entry and must be recomputed.
+    memo.get_or_compute("upper", "v1", "b", str.upper)
+    assert memo.misses == 4
+
+
+def test_memo_invalidated_by_fingerprint_change():
+    """Test that a changed transform fingerprint forces recomputation."""
+    memo = TransformMemo()
+    assert memo.get_or_compute("t", "old", "x", lambda raw: "old") == "old"
+    assert memo.get_or_compute("t", "new", "x", lambda raw: "new") == "new"
+    assert memo.misses == 2
+
+
+def test_fingerprint_changes_with_extra_inputs():
+    """Test that transform dependencies are part of the fingerprint."""
+    func = transform_char_name.__wrapped__
+    assert fingerprint(func) == fingerprint(func)
+    assert fingerprint(func, {1.0: ["a"]}) != fingerprint(func, {1.1: ["a"]})
+
+
+def test_add_char_version_respects_version_dict_changes():
+    """Test that updating the version dictionary invalidates memoized versions."""
+    df = pd.DataFrame({"Character": ["firefly"]})
+    with patch(
+        "hsrws.data.transformer.get_version_dict", return_value={2.3: ["firefly"]}
+    ):
+        add_char_version(df)
+    assert df["Version"].iloc[0] == 2.3
+
+    with patch(
+        "hsrws.data.transformer.get_version_dict", return_value={2.4: ["firefly"]}
+    ):
+        add_char_version(df)
+    assert df["Version"].iloc[0] == 2.4
+
+
+def test_memo_persistence_round_trip(tmp_path):
+    """Test that saved memo entries are reloaded in a new process."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'memo.db'}")
+    memo = TransformMemo()
+    memo.get_or_compute("upper", "v1", "abc", str.upper)
+    assert memo.save(engine) == 1
+    # Nothing changed, so nothing is rewritten.
+    assert memo.save(engine) == 0
+
+    reloaded = TransformMemo()
+    assert reloaded.load(engine) == 1
+    assert reloaded.get_or_compute("upper", "v1", "abc", lambda raw: "unused") == "ABC"
+    assert reloaded.hits == 1
+
+
+def test_memo_reload_keeps_recency_order(tmp_path):
+    """Test that reloading keeps the most recently used entries in LRU order."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'memo.db'}")
+    memo = TransformMemo()
+    for raw in ["c", "a", "b", "c"]:
+        memo.get_or_compute("upper", "v1", raw, str.upper)
+    memo.save(engine)
+
+    reloaded = TransformMemo(max_size=2)
+    assert reloaded.load(engine) == 2
+    # "a" was the least recently used entry, so it was not reloaded.
+    assert reloaded.get_or_compute("upper", "v1", "a", str.upper) == "A"
+    assert reloaded.misses == 1
+    # Reloading "a" evicted "b", the least recently used entry kept.
+    reloaded.get_or_compute("upper", "v1", "c", str.upper)
+    reloaded.get_or_compute("upper", "v1", "b", str.upper)
+    assert reloaded.misses == 2
@@ -0,0 +1,118 @@
+"""Tests for the generic aggregate statement engine."""
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import sqlite
+
+from hsrws.db.queries import CharacterFilter, build_aggregate_stmt, filter_params
+from hsrws.db.sqlite import load_to_sqlite
+from hsrws.visual.data_utils import fetch_data_orm
+
+
+@pytest.fixture
+def characters_database(temp_database):
+    """Database holding characters with stats over several versions."""
+    load_to_sqlite(
+        pd.DataFrame(
+            {
+                "Character": ["Himeko", "Asta", "Seele", "Topaz", "Kafka"],
+                "Path": ["Erudition", "Harmony", "Hunt", "Hunt", "Nihility"],
+                "Element": ["Fire", "Fire", "Quantum", "Fire", "Lightning"],
+                "Rarity": ["5", "4", "5", "5", "5"],
+                "ATK Lvl 80": [756, 511, 640, 620, None],
+                "Version": [1.0, 1.0, 1.0, 1.4, 1.2],
+            }
+        )
+    )
+    return temp_database
+
+
+def test_count_any_dimensions(characters_database):
+    """Test counting over a new combination of dimensions."""
+    result = fetch_data_orm(build_aggregate_stmt(("Element", "Rarity")))
+
+    assert result.to_dict("records") == [
+        {"Element": "Fire", "Rarity": 4, "count": 1},
+        {"Element": "Fire", "Rarity": 5, "count": 2},
+        {"Element": "Lightning", "Rarity": 5, "count": 1},
+        {"Element": "Quantum", "Rarity": 5, "count": 1},
+    ]
+
+
+def test_stat_aggregates(characters_database):
+    """Test sum and average of a stat, ignoring unknown values."""
+    average = fetch_data_orm(
+        build_aggregate_stmt(
+            ("Path",), aggregate="avg", stat="ATK Lvl 80", order_by_value=True
+        )
+    )
+    known = fetch_data_orm(build_aggregate_stmt(("Element",), stat="ATK Lvl 80"))
+
+    assert average.to_dict("records")[0] == {"Path": "Erudition", "avg": 756.0}
+    assert average.set_index("Path")["avg"]["Hunt"] == 630.0
+    assert known.set_index("Element")["count"].to_dict() == {
+        "Fire": 3,
+        "Lightning": 0,
+        "Quantum": 1,
+    }
+
+
+def test_cumulative_sum(characters_database):
+    """Test accumulating a stat sum over versions."""
+    filters = CharacterFilter(element="Fire")
+    result = fetch_data_orm(
+        build_aggregate_stmt(
+            ("Version",), filters, aggregate="sum", stat="ATK Lvl 80", cumulative=True
+        ),
+        filter_params(filters),
+    )
+
+    assert result.to_dict("records") == [
+        {"Version": 1.0, "sum": 1267},
+        {"Version": 1.4, "sum": 1887},
+    ]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"dimensions": ("Character",)},
+        {"dimensions": ("Path", "Path")},
+        {"dimensions": ("Path",), "aggregate": "median"},
+        {"dimensions": ("Path",), "aggregate": "sum"},
+        {"dimensions": ("Path",), "stat": "Luck"},
+        {"dimensions": ("Path",), "cumulative": True},
+        {
+            "dimensions": ("Version",),
+            "aggregate": "avg",
+            "stat": "HP Lvl 80",
+            "cumulative": True,
+        },
+        {"dimensions": ("Path",), "dimension_labels": ("a", "b")},
+    ],
+)
+def test_invalid_arguments(kwargs):
+    """Test that unsupported requests are rejected."""
+    with pytest.raises(ValueError):
+        build_aggregate_stmt(**kwargs)
+
+
+def test_memoized():
+    """Test that equal requests return the same statement."""
+    assert build_aggregate_stmt(("Path", "Rarity")) is build_aggregate_stmt(
+        ("Path", "Rarity")
+    )
+
+
+@pytest.mark.parametrize(
+    "dimensions", [("Path", "Element"), ("Element", "Rarity"), ("Version", "Path")]
+)
+def test_counts_use_covering_index(characters_database, dimensions):
+    """Test that counts group in the order of a covering index."""
+    sql = build_aggregate_stmt(dimensions).compile(dialect=sqlite.dialect())
+    with characters_database.connect() as conn:
+        plan = [row[3] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+    assert "USING COVERING INDEX" in plan[0]
+    assert not any("GROUP BY" in step for step in plan)
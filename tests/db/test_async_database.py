@@ -0,0 +1,142 @@
+"""Tests for the async data access layer."""
+
+import asyncio
+import contextlib
+
+import pandas as pd
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+pytest.importorskip("aiosqlite")
+
+from hsrws.db.database import get_async_database_url, get_async_engine
+from hsrws.db.generation import get_data_generation
+from hsrws.db.queries import character_stats
+from hsrws.db.result_cache import query_cache
+from hsrws.db.sqlite import load_to_sqlite, load_to_sqlite_async
+from hsrws.visual import data_utils
+from hsrws.visual.data_utils import fetch_data_async, fetch_data_orm, fetch_many_async
+
+DASHBOARD_STMTS = [
+    character_stats.get_element_path_heatmap_stmt(),
+    character_stats.get_rarity_element_distribution_stmt(),
+    character_stats.get_version_release_timeline_stmt(),
+    character_stats.get_path_rarity_distribution_stmt(),
+]
+
+
+@pytest.fixture
+def characters_database(temp_database):
+    """Database holding characters over several versions."""
+    load_to_sqlite(
+        pd.DataFrame(
+            {
+                "Character": ["Himeko", "Asta", "Seele", "Topaz"],
+                "Path": ["Erudition", "Harmony", "Hunt", "Hunt"],
+                "Element": ["Fire", "Fire", "Quantum", "Fire"],
+                "Rarity": [5, 4, 5, 5],
+                "Version": [1.0, 1.0, 1.0, 1.4],
+            }
+        )
+    )
+    return temp_database
+
+
+def test_async_database_url():
+    """Test that URLs get the async driver of their dialect."""
+    url = get_async_database_url("sqlite:///data/hsr.db")
+
+    assert url.drivername == "sqlite+aiosqlite"
+    assert url.database == "data/hsr.db"
+    with pytest.raises(ValueError):
+        get_async_database_url("oracle://localhost/hsr")
+
+
+@pytest.mark.asyncio
+async def test_fetch_matches_sync(characters_database):
+    """Test that async reads match sync reads and share their cache."""
+    expected = fetch_data_orm(DASHBOARD_STMTS[0])
+    query_cache.clear()
+
+    result = await fetch_data_async(DASHBOARD_STMTS[0])
+    cached = fetch_data_orm(DASHBOARD_STMTS[0])
+
+    pd.testing.assert_frame_equal(result, expected)
+    pd.testing.assert_frame_equal(cached, expected)
+    assert (query_cache.misses, query_cache.hits) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_dashboard_queries_run_concurrently(characters_database, monkeypatch):
+    """Test that several statements are read on simultaneous connections."""
+    engine = await get_async_engine()
+    open_connections = []
+    peak = []
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def checkout(*args):
+        open_connections.append(None)
+        peak.append(len(open_connections))
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def checkin(*args):
+        open_connections.pop()
+
+    # Every fetch waits on its open connection until all fetches have one,
+    # which only completes if they run concurrently.
+    barrier = asyncio.Barrier(len(DASHBOARD_STMTS))
+
+    class BarrierEngine:
+        @contextlib.asynccontextmanager
+        async def connect(self):
+            async with engine.connect() as conn:
+                await barrier.wait()
+                yield conn
+
+    async def get_barrier_engine():
+        return BarrierEngine()
+
+    monkeypatch.setattr(data_utils, "get_async_engine", get_barrier_engine)
+    results = await asyncio.wait_for(fetch_many_async(DASHBOARD_STMTS), timeout=10)
+
+    assert max(peak) == len(DASHBOARD_STMTS)
+    for stmt, result in zip(DASHBOARD_STMTS, results):
+        pd.testing.assert_frame_equal(result, fetch_data_orm(stmt))
+
+
+@pytest.mark.asyncio
+async def test_async_load(characters_database):
+    """Test that an async load writes the rows and bumps the data generation."""
+    counts = await load_to_sqlite_async(
+        pd.DataFrame(
+            {
+                "Character": ["Himeko", "Kafka"],
+                "Path": ["Erudition", "Nihility"],
+                "Element": ["Fire", "Lightning"],
+                "Rarity": [5, 5],
+                "Version": [1.0, 1.2],
+            }
+        )
+    )
+
+    assert counts == {"inserted": 1, "updated": 0, "unchanged": 1, "deleted": 3}
+    with characters_database.connect() as conn:
+        assert get_data_generation(conn) == 2
+    result = await fetch_data_async(character_stats.get_element_distribution_stmt())
+    assert result.set_index("category")["count"].to_dict() == {
+        "Fire": 1,
+        "Lightning": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_async_load_failure_rolls_back(characters_database):
+    """Test that a failing async load leaves the database unchanged."""
+    with pytest.raises(IntegrityError):
+        await load_to_sqlite_async(
+            pd.DataFrame({"Character": ["Himeko"], "Rarity": [9]})
+        )
+
+    with characters_database.connect() as conn:
+        assert get_data_generation(conn) == 1
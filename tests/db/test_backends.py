@@ -0,0 +1,208 @@
+"""Tests for the DuckDB query backend."""
+
+import json
+import os
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+pytest.importorskip("duckdb_engine")
+
+from hsrws import cli
+from hsrws.db import backends
+from hsrws.db.backends import (
+    copy_to_duckdb,
+    create_duckdb_engine,
+    dispose_duckdb_engine,
+    get_query_backend,
+)
+from hsrws.db.export import GENERATION_METADATA_KEY
+from hsrws.db.generation import get_data_generation
+from hsrws.db.queries import CharacterFilter, character_stats, filter_params
+from hsrws.db.result_cache import query_cache
+from hsrws.db.sqlite import load_to_sqlite
+from hsrws.visual.data_utils import fetch_data_orm
+
+BUILDERS = [
+    getattr(character_stats, name)
+    for name in dir(character_stats)
+    if name.startswith("get_") and name.endswith("_stmt")
+]
+
+
+@pytest.fixture
+def characters_database(temp_database):
+    """SQLite database holding characters over several versions."""
+    load_to_sqlite(
+        pd.DataFrame(
+            {
+                "Character": ["Himeko", "Asta", "Seele", "Topaz", "Kafka", "Arlan"],
+                "Path": ["Erudition", "Harmony", "Hunt", "Hunt", "Nihility", None],
+                "Element": ["Fire", "Fire", "Quantum", "Fire", "Lightning", "Fire"],
+                "Rarity": [5, 4, 5, 5, 5, 4],
+                "ATK Lvl 80": [756, 511, 640, 620, None, 599],
+                "Version": [1.0, 1.0, 1.0, 1.4, 1.2, 1.0],
+            }
+        )
+    )
+    return temp_database
+
+
+@pytest.fixture
+def duckdb_database(characters_database, tmp_path):
+    """DuckDB file holding a copy of the characters database."""
+    engine = create_duckdb_engine(str(tmp_path / "hsr.duckdb"))
+    copy_to_duckdb(characters_database, engine)
+    yield engine
+    engine.dispose()
+
+
+def read_rows(engine, stmt, params=None):
+    """Read the rows of a statement, sorted to ignore the order of ties."""
+    with engine.connect() as conn:
+        return sorted(conn.execute(stmt, params).all(), key=repr)
+
+
+@pytest.mark.parametrize("filters", [None, CharacterFilter(element="Fire")])
+@pytest.mark.parametrize("build_stmt", BUILDERS)
+def test_statements_match_sqlite(
+    characters_database, duckdb_database, build_stmt, filters
+):
+    """Test that every statement gives the same rows on both backends."""
+    stmt = build_stmt(filters)
+    params = filter_params(filters)
+
+    assert read_rows(duckdb_database, stmt, params) == read_rows(
+        characters_database, stmt, params
+    )
+
+
+def test_in_memory_from_parquet(characters_database, duckdb_database, tmp_path):
+    """Test querying an in-memory database loaded from Parquet."""
+    parquet_path = tmp_path / "characters.parquet"
+    with duckdb_database.connect() as conn:
+        conn.exec_driver_sql(
+            f"COPY \"HsrCharacters\" TO '{parquet_path}' (FORMAT parquet)"
+        )
+    engine = create_duckdb_engine(parquet_path=str(parquet_path))
+
+    filters = CharacterFilter(element="Fire")
+    for stmt, params in (
+        (character_stats.get_element_path_heatmap_stmt(), None),
+        (character_stats.get_character_cube_stmt(filters), filter_params(filters)),
+    ):
+        assert read_rows(engine, stmt, params) == read_rows(
+            characters_database, stmt, params
+        )
+    engine.dispose()
+
+
+def test_parquet_reloaded_when_replaced(characters_database, tmp_path):
+    """Test that pooled connections reload a replaced Parquet file."""
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    parquet_path = tmp_path / "characters.parquet"
+
+    def write_export(characters, generation):
+        table = pa.Table.from_pandas(characters, preserve_index=False)
+        pq.write_table(
+            table.replace_schema_metadata(
+                {GENERATION_METADATA_KEY: str(generation).encode()}
+            ),
+            parquet_path,
+        )
+
+    with characters_database.connect() as conn:
+        characters = pd.read_sql(text('SELECT * FROM "HsrCharacters"'), conn)
+    write_export(characters, 1)
+    engine = create_duckdb_engine(parquet_path=str(parquet_path))
+    stmt = character_stats.get_rarity_distribution_stmt()
+
+    with engine.connect() as conn:
+        assert get_data_generation(conn) == 1
+    assert read_rows(engine, stmt) == [(4, 2), (5, 4)]
+
+    write_export(characters.iloc[:1], 2)
+    mtime = parquet_path.stat().st_mtime_ns + 1_000_000
+    os.utime(parquet_path, ns=(mtime, mtime))
+
+    with engine.connect() as conn:
+        assert get_data_generation(conn) == 2
+    assert read_rows(engine, stmt) == [(5, 1)]
+    engine.dispose()
+
+
+def test_fetch_from_configured_backend(
+    characters_database, duckdb_database, monkeypatch
+):
+    """Test that the query layer reads from DuckDB when configured."""
+    duckdb_database.dispose()
+    monkeypatch.setenv("HSR_QUERY_BACKEND", "duckdb")
+    monkeypatch.setenv("HSR_DUCKDB_PATH", duckdb_database.url.database)
+    dispose_duckdb_engine()
+    query_cache.clear()
+    try:
+        result = fetch_data_orm(character_stats.get_rarity_distribution_stmt())
+
+        assert backends.get_query_engine().dialect.name == "duckdb"
+        assert result.set_index("category")["count"].to_dict() == {5: 4, 4: 2}
+    finally:
+        dispose_duckdb_engine()
+
+
+def test_load_refreshes_duckdb_copy(characters_database, duckdb_database, monkeypatch):
+    """Test that a load copies the query tables again to the DuckDB file."""
+    duckdb_database.dispose()
+    monkeypatch.setenv("HSR_DUCKDB_PATH", duckdb_database.url.database)
+    dispose_duckdb_engine()
+    try:
+        load_to_sqlite(
+            pd.DataFrame({"Character": ["Acheron"], "Rarity": [5], "Version": [2.1]}),
+            prune=False,
+        )
+
+        engine = backends.get_duckdb_engine()
+        stmt = character_stats.get_rarity_distribution_stmt()
+        assert read_rows(engine, stmt) == read_rows(characters_database, stmt)
+        with engine.connect() as conn, characters_database.connect() as source:
+            assert get_data_generation(conn) == get_data_generation(source)
+    finally:
+        dispose_duckdb_engine()
+
+
+def test_failed_duckdb_refresh_is_logged(characters_database, monkeypatch):
+    """Test that a DuckDB copy failing does not fail the committed load."""
+    monkeypatch.setenv("HSR_DUCKDB_PATH", "unused.duckdb")
+
+    def fail(source, target):
+        raise RuntimeError("no duckdb")
+
+    monkeypatch.setattr(backends, "copy_to_duckdb", fail)
+    monkeypatch.setattr(backends, "get_duckdb_engine", lambda: None)
+
+    assert backends.refresh_duckdb_copy(characters_database) is None
+
+
+def test_export_command(characters_database, tmp_path, capsys):
+    """Test the export-duckdb command copying the query tables."""
+    path = tmp_path / "export.duckdb"
+
+    assert cli.main(["export-duckdb", str(path)]) == 0
+
+    assert json.loads(capsys.readouterr().out) == {
+        "HsrCharacters": 6,
+        "DataGeneration": 1,
+    }
+    engine = create_duckdb_engine(str(path))
+    stmt = character_stats.get_path_distribution_stmt()
+    assert read_rows(engine, stmt) == read_rows(characters_database, stmt)
+    engine.dispose()
+
+
+def test_unknown_backend(monkeypatch):
+    """Test that unknown backends are rejected."""
+    monkeypatch.setenv("HSR_QUERY_BACKEND", "oracle")
+
+    with pytest.raises(ValueError):
+        get_query_backend()
@@ -0,0 +1,122 @@
+"""Tests for the bitmap indexes of the character store."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hsrws.db.bitmaps import BitmapIndex, bitset_positions, to_bitset
+from hsrws.db.character_store import CharacterStore, get_character_store
+from hsrws.db.queries import CharacterSelection, filter_params, get_selection_stmt
+from hsrws.db.sqlite import load_to_sqlite
+from hsrws.visual.data_utils import (
+    count_selected_characters,
+    fetch_data_orm,
+    get_selected_characters,
+)
+
+CHARACTERS = pd.DataFrame(
+    {
+        "Character": [
+            "Seele",
+            "Himeko",
+            "Herta",
+            "Jiaoqiu",
+            "Acheron",
+            "Ghost",
+            "Asta",
+        ],
+        "Path": [
+            "Hunt",
+            "Erudition",
+            "Erudition",
+            "Nihility",
+            "Nihility",
+            None,
+            "Harmony",
+        ],
+        "Element": ["Quantum", "Fire", "Ice", "Fire", "Lightning", "Quantum", "Fire"],
+        "Rarity": [5, 5, 5, 5, 5, 5, 4],
+        "Version": [1.0, 1.0, 2.5, 2.4, 2.1, None, 1.0],
+    }
+)
+
+SELECTIONS = [
+    CharacterSelection(),
+    CharacterSelection(
+        paths=("Erudition", "Nihility"), elements=("Quantum",), rarities=(5,)
+    ),
+    CharacterSelection(paths=("Erudition", "Nihility"), min_version=2.1),
+    CharacterSelection(elements=("Fire", "Ice"), max_version=2.4),
+    CharacterSelection(rarities=(4, 5), min_version=1.0, max_version=1.0),
+    CharacterSelection(min_version=3.0),
+    CharacterSelection(paths=("Remembrance",)),
+]
+
+
+@pytest.fixture
+def store(temp_database):
+    """Character store of a database with NULL dimension values."""
+    load_to_sqlite(CHARACTERS)
+    return get_character_store()
+
+
+@pytest.mark.parametrize("selection", SELECTIONS)
+def test_selection_matches_sql(store, selection):
+    """Test that bitmap selections return the rows of the SQL statement."""
+    expected = fetch_data_orm(get_selection_stmt(selection), filter_params(selection))
+
+    result = store.select_characters(selection)
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert store.count_characters(selection) == len(expected)
+
+
+def test_version_range(store):
+    """Test that version ranges are inclusive and skip unknown versions."""
+    bitmaps = store.bitmaps
+    characters = store.select_characters(CharacterSelection())["Character"]
+
+    def names(bits):
+        return characters[bitset_positions(bits, bitmaps.size)].tolist()
+
+    assert names(bitmaps.version_range(2.1, 2.4)) == ["Acheron", "Jiaoqiu"]
+    assert names(bitmaps.version_range(2.2)) == ["Herta", "Jiaoqiu"]
+    assert names(bitmaps.version_range(max_version=0.9)) == []
+    assert bitmaps.version_range(2.5, 2.1) == 0
+    assert bitmaps.version_range().bit_count() == len(CHARACTERS) - 1
+
+
+def test_bitset_round_trip():
+    """Test that packing and unpacking a mask keeps the set positions."""
+    mask = np.zeros(130, dtype=bool)
+    mask[[0, 7, 8, 64, 129]] = True
+
+    bits = to_bitset(mask)
+
+    assert bits == (1 << 0) | (1 << 7) | (1 << 8) | (1 << 64) | (1 << 129)
+    assert bitset_positions(bits, 130).tolist() == [0, 7, 8, 64, 129]
+
+
+def test_empty_index():
+    """Test that an empty roster selects nothing."""
+    store = CharacterStore(pd.DataFrame(columns=CHARACTERS.columns), 0)
+
+    assert store.count_characters(CharacterSelection(min_version=1.0)) == 0
+    assert store.select_characters(CharacterSelection()).empty
+
+
+def test_unknown_dimension(store):
+    """Test that only the indexed dimensions have bitsets."""
+    assert isinstance(store.bitmaps, BitmapIndex)
+    with pytest.raises(ValueError):
+        store.bitmaps.bitset("Character", "Seele")
+
+
+def test_sql_fallback(store, monkeypatch):
+    """Test that selections read SQL when the store is disabled."""
+    selection = SELECTIONS[2]
+    expected = get_selected_characters(selection)
+    monkeypatch.setenv("HSR_CHARACTER_STORE", "false")
+
+    pd.testing.assert_frame_equal(get_selected_characters(selection), expected)
+    assert count_selected_characters(selection) == len(expected) == 3
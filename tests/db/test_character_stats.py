@@ -0,0 +1,107 @@
+"""Tests for the memoized character statistics statements."""
+
+import pandas as pd
+import pytest
+
+from hsrws.db.queries import (
+    CharacterFilter,
+    CharacterSelection,
+    character_stats,
+    clear_statement_caches,
+    filter_params,
+    get_selection_stmt,
+)
+from hsrws.db.sqlite import load_to_sqlite
+from hsrws.visual.data_utils import fetch_data_orm
+
+
+@pytest.fixture
+def characters_database(temp_database):
+    """Database holding characters of several versions, elements and paths."""
+    load_to_sqlite(
+        pd.DataFrame(
+            {
+                "Character": ["Himeko", "Asta", "Seele", "Topaz", "Kafka"],
+                "Path": ["Erudition", "Harmony", "Hunt", "Hunt", "Nihility"],
+                "Element": ["Fire", "Fire", "Quantum", "Fire", "Lightning"],
+                "Rarity": ["5", "4", "5", "5", "5"],
+                "Version": [1.0, 1.0, 1.0, 1.4, 1.2],
+            }
+        )
+    )
+    return temp_database
+
+
+@pytest.mark.parametrize(
+    "get_stmt",
+    [
+        character_stats.get_element_path_heatmap_stmt,
+        character_stats.get_latest_patch_stmt,
+        character_stats.get_character_cube_stmt,
+    ],
+)
+def test_statements_are_memoized_per_shape(get_stmt):
+    """Test that filters differing only in their values share one construct."""
+    fire = get_stmt(CharacterFilter(element="Fire"))
+
+    assert get_stmt() is get_stmt()
+    assert get_stmt(CharacterFilter(element="Ice")) is fire
+    assert get_stmt(CharacterFilter(path="Hunt")) is not fire
+    assert get_stmt() is not fire
+
+
+def test_selections_are_memoized_per_shape():
+    """Test that selections differing only in their values share one construct."""
+    stmt = get_selection_stmt(CharacterSelection(paths=("Hunt",), min_version=1.0))
+
+    assert (
+        get_selection_stmt(CharacterSelection(paths=("Erudition", "Nihility")))
+        is not stmt
+    )
+    assert (
+        get_selection_stmt(CharacterSelection(paths=("Abundance",), min_version=2.0))
+        is stmt
+    )
+
+
+def test_cleared_statements_are_built_again():
+    """Test that clearing the statement caches drops the memoized constructs."""
+    stmt = character_stats.get_character_cube_stmt()
+
+    clear_statement_caches()
+
+    assert character_stats.get_character_cube_stmt() is not stmt
+
+
+def test_filter_values_are_bound_at_execute_time():
+    """Test that filter values are execute-time parameters, not in the statement."""
+    filters = CharacterFilter(min_version=1.1, path="Hunt")
+    compiled = character_stats.get_path_distribution_stmt(filters).compile()
+
+    assert "Hunt" not in str(compiled)
+    assert compiled.params == {"min_version": None, "path": None}
+    assert filter_params(filters) == {"min_version": 1.1, "path": "Hunt"}
+
+
+def test_filters_restrict_counts(characters_database):
+    """Test that each filter restricts the counted characters."""
+    filters = CharacterFilter(min_version=1.0, max_version=1.2, path="Hunt")
+    result = fetch_data_orm(
+        character_stats.get_element_distribution_stmt(filters), filter_params(filters)
+    )
+
+    assert result.to_dict("records") == [{"category": "Quantum", "count": 1}]
+
+
+def test_filtered_evolution_accumulates_filtered_characters(characters_database):
+    """Test that cumulative evolution only counts the filtered characters."""
+    filters = CharacterFilter(element="Fire")
+    result = fetch_data_orm(
+        character_stats.get_version_path_evolution_stmt(filters), filter_params(filters)
+    )
+
+    assert result.to_dict("records") == [
+        {"Version": 1.0, "Path": "Erudition", "count": 1},
+        {"Version": 1.0, "Path": "Harmony", "count": 1},
+        {"Version": 1.4, "Path": "Hunt", "count": 1},
+    ]
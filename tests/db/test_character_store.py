@@ -0,0 +1,200 @@
+"""Tests for the in-process columnar character store."""
+
+import pandas as pd
+import pytest
+
+from hsrws.db import character_store
+from hsrws.db.character_store import CharacterStore, get_character_store
+from hsrws.db.queries import CharacterFilter, character_stats, filter_params
+from hsrws.db.sqlite import load_to_sqlite
+from hsrws.visual.data_utils import (
+    fetch_data_orm,
+    get_character_counts,
+    get_character_crosstab,
+)
+
+CHARACTERS = pd.DataFrame(
+    {
+        "Character": ["Himeko", "Asta", "Seele", "Topaz", "Kafka", "Lost", "Ghost"],
+        "Path": ["Erudition", "Harmony", "Hunt", "Hunt", "Nihility", None, "Hunt"],
+        "Element": ["Fire", "Fire", "Quantum", "Fire", "Lightning", "Fire", None],
+        "Rarity": [5, 4, 5, 5, 5, None, 4],
+        "Version": [1.0, 1.0, 1.0, 1.4, 1.2, 1.2, None],
+    }
+)
+
+# Each character_stats statement with the store arguments computing it.
+PRESETS = [
+    (
+        character_stats.get_character_cube_stmt,
+        (("Version", "Element", "Path", "Rarity"),),
+        {},
+    ),
+    (
+        character_stats.get_path_distribution_stmt,
+        (("Path",),),
+        {"dimension_labels": ("category",), "order_by_value": True},
+    ),
+    (
+        character_stats.get_element_distribution_stmt,
+        (("Element",),),
+        {"dimension_labels": ("category",), "order_by_value": True},
+    ),
+    (
+        character_stats.get_rarity_distribution_stmt,
+        (("Rarity",),),
+        {"dimension_labels": ("category",), "order_by_value": True},
+    ),
+    (character_stats.get_element_path_heatmap_stmt, (("Element", "Path"),), {}),
+    (
+        character_stats.get_rarity_element_distribution_stmt,
+        (("Rarity", "Element"),),
+        {},
+    ),
+    (
+        character_stats.get_version_release_timeline_stmt,
+        (("Version",),),
+        {"value_label": "character_count"},
+    ),
+    (
+        character_stats.get_version_element_evolution_stmt,
+        (("Version", "Element"),),
+        {"cumulative": True},
+    ),
+    (character_stats.get_path_rarity_distribution_stmt, (("Path", "Rarity"),), {}),
+    (
+        character_stats.get_version_path_evolution_stmt,
+        (("Version", "Path"),),
+        {"cumulative": True},
+    ),
+]
+
+FILTERS = [
+    None,
+    CharacterFilter(element="Fire"),
+    CharacterFilter(min_version=1.1, path="Hunt"),
+    CharacterFilter(max_version=1.2),
+    CharacterFilter(element="Wind"),
+]
+
+
+@pytest.fixture
+def store(temp_database):
+    """Character store of a database with NULL dimension values."""
+    load_to_sqlite(CHARACTERS)
+    return get_character_store()
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("builder, args, options", PRESETS)
+def test_aggregates_match_sql(store, builder, args, options, filters):
+    """Test that every statistic matches its SQL statement."""
+    expected = fetch_data_orm(builder(filters), filter_params(filters))
+
+    result = store.aggregate(*args, filters, **options)
+
+    if options.get("order_by_value"):
+        assert result.iloc[:, -1].is_monotonic_decreasing
+        columns = list(result.columns)
+        expected = expected.sort_values(columns, ignore_index=True)
+        result = result.sort_values(columns, ignore_index=True)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_latest_version_matches_sql(store, filters):
+    """Test that the latest version matches get_latest_patch_stmt."""
+    expected = fetch_data_orm(
+        character_stats.get_latest_patch_stmt(filters), filter_params(filters)
+    )
+
+    latest = store.latest_version(filters)
+
+    if latest is None:
+        assert pd.isna(expected["latest_version"].iloc[0])
+    else:
+        assert latest == expected["latest_version"].iloc[0]
+
+
+def test_crosstab_matches_pivot(store):
+    """Test that the crosstab equals the pivoted heatmap counts."""
+    filters = CharacterFilter(min_version=1.0)
+    heatmap = fetch_data_orm(
+        character_stats.get_element_path_heatmap_stmt(filters), filter_params(filters)
+    )
+    expected = (
+        heatmap.pivot(index="Element", columns="Path", values="count")
+        .fillna(0)
+        .astype("int64")
+    )
+
+    table = store.crosstab("Element", "Path", filters)
+
+    pd.testing.assert_frame_equal(table, expected, check_names=False)
+    assert (table.index.name, table.columns.name) == ("Element", "Path")
+
+
+def test_crosstab_keeps_null_values(store):
+    """Test that NULL values get their own row and column, like a GROUP BY."""
+    table = store.crosstab("Element", "Path")
+
+    assert table.index.isna().tolist() == [True, False, False, False]
+    assert table.columns.isna().tolist() == [True, False, False, False, False]
+    assert table.loc["Fire"].iloc[0] == 1
+    assert table.to_numpy().sum() == len(CHARACTERS)
+
+
+def test_invalid_arguments(store):
+    """Test that unknown dimensions and unsupported options are rejected."""
+    with pytest.raises(ValueError):
+        store.aggregate(("Name",))
+    with pytest.raises(ValueError):
+        store.aggregate(("Element",), cumulative=True)
+    with pytest.raises(ValueError):
+        store.crosstab("Path", "Path")
+
+
+def test_store_is_refreshed_on_new_generation(store, monkeypatch):
+    """Test that a load by another process is picked up after the interval."""
+    monkeypatch.setenv("HSR_STORE_REFRESH_SECONDS", "3600")
+    load_to_sqlite(CHARACTERS.iloc[:2])
+    reloaded = get_character_store()
+
+    # Simulate a load by another process, which cannot reset this store.
+    other = CharacterStore(CHARACTERS.astype(object), reloaded.generation - 1)
+    monkeypatch.setattr(character_store, "_store", other)
+
+    assert len(reloaded) == 2
+    assert get_character_store() is other
+    monkeypatch.setenv("HSR_STORE_REFRESH_SECONDS", "0")
+    assert get_character_store().generation == reloaded.generation
+    assert len(get_character_store()) == 2
+
+
+def test_reads_do_not_query_between_checks(store, monkeypatch):
+    """Test that reads within the refresh interval do not touch the database."""
+    monkeypatch.setenv("HSR_STORE_REFRESH_SECONDS", "3600")
+    get_character_store()
+
+    def fail(engine):
+        raise AssertionError("store was read again")
+
+    monkeypatch.setattr(CharacterStore, "from_engine", fail)
+
+    assert get_character_counts(("Element",))["count"].sum() == len(CHARACTERS)
+
+
+def test_sql_fallback(store, monkeypatch):
+    """Test that disabling the store and other aggregates read SQL."""
+    expected = get_character_counts(("Element", "Path"))
+    crosstab = get_character_crosstab("Rarity", "Element", CharacterFilter(path="Hunt"))
+    monkeypatch.setenv("HSR_CHARACTER_STORE", "false")
+
+    pd.testing.assert_frame_equal(get_character_counts(("Element", "Path")), expected)
+    pd.testing.assert_frame_equal(
+        get_character_crosstab("Rarity", "Element", CharacterFilter(path="Hunt")),
+        crosstab,
+        check_names=False,
+    )
+    average = get_character_counts(("Element",), aggregate="avg", stat="ATK Lvl 80")
+    assert average.columns.tolist() == ["Element", "avg"]
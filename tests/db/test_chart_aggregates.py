@@ -0,0 +1,206 @@
+"""Tests for the chart datasets and their materialization at load time."""
+
+import pandas as pd
+import pytest
+from sqlalchemy import event
+
+from hsrws.db import columnar
+from hsrws.db.chart_aggregates import compute_chart_datasets, refresh_chart_aggregates
+from hsrws.db.export import ARROW_FILE_NAME, get_export_dir
+from hsrws.db.queries import character_stats
+from hsrws.db.result_cache import query_cache
+from hsrws.db.sqlite import load_to_sqlite
+from hsrws.visual.data_utils import fetch_data_orm, get_chart_datasets
+
+# Chart dataset names mapped to the statement computing them in SQL.
+DATASET_STMTS = {
+    "path_distribution": character_stats.get_path_distribution_stmt,
+    "element_distribution": character_stats.get_element_distribution_stmt,
+    "rarity_distribution": character_stats.get_rarity_distribution_stmt,
+    "element_path_heatmap": character_stats.get_element_path_heatmap_stmt,
+    "rarity_element_distribution": (
+        character_stats.get_rarity_element_distribution_stmt
+    ),
+    "version_release_timeline": character_stats.get_version_release_timeline_stmt,
+    "element_balance_evolution": character_stats.get_version_element_evolution_stmt,
+    "path_rarity_distribution": character_stats.get_path_rarity_distribution_stmt,
+    "path_balance_evolution": character_stats.get_version_path_evolution_stmt,
+}
+
+
+@pytest.fixture
+def characters_database(temp_database):
+    """Database holding characters spread over several versions."""
+    load_to_sqlite(
+        pd.DataFrame(
+            {
+                "Character": ["Himeko", "Asta", "March 7th", "Seele", "Topaz", "Kafka"],
+                "Path": [
+                    "Erudition",
+                    "Harmony",
+                    "Preservation",
+                    "Hunt",
+                    "Hunt",
+                    "Nihility",
+                ],
+                "Element": ["Fire", "Fire", "Ice", "Quantum", "Fire", "Lightning"],
+                "Rarity": ["5", "4", "4", "5", "5", "5"],
+                "Version": [1.0, 1.0, 1.0, 1.0, 1.4, 1.2],
+            }
+        )
+    )
+    return temp_database
+
+
+@pytest.mark.parametrize("name", DATASET_STMTS)
+def test_datasets_match_queries(characters_database, name):
+    """Test that every rollup equals the result of its own query."""
+    datasets = get_chart_datasets()
+
+    expected = fetch_data_orm(DATASET_STMTS[name]())
+    actual = getattr(datasets, name)
+    if name.endswith("_distribution") and "category" in expected:
+        # Ties between equal counts have no defined order in SQL
+        expected = expected.sort_values(["count", "category"], ascending=[False, True])
+        actual = actual.sort_values(["count", "category"], ascending=[False, True])
+    pd.testing.assert_frame_equal(
+        actual.reset_index(drop=True),
+        expected.reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+def test_latest_version(characters_database):
+    """Test that the latest version comes from the same pass."""
+    assert get_chart_datasets().latest_version == 1.4
+
+
+def record_statements(engine):
+    """Collect the SQL statements executed by an engine."""
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    return statements
+
+
+@pytest.fixture
+def without_export(monkeypatch, tmp_path):
+    """Look for the columnar export in an empty directory."""
+    monkeypatch.setenv("HSR_EXPORT_DIR", str(tmp_path / "no-export"))
+
+
+def test_reads_export_without_sql(characters_database):
+    """Test that the charts read the columnar export, only checking its generation."""
+    statements = record_statements(characters_database)
+
+    datasets = get_chart_datasets()
+
+    assert any("DataGeneration" in stmt for stmt in statements)
+    assert not any(
+        table in stmt
+        for stmt in statements
+        for table in ("HsrCharacters", "CharacterFacts", "ChartAggregates")
+    )
+    assert datasets.latest_version == 1.4
+
+
+def test_stale_export_is_ignored(characters_database):
+    """Test that an export older than the database is not read."""
+    arrow_path = get_export_dir() / ARROW_FILE_NAME
+    stale = arrow_path.read_bytes()
+    load_to_sqlite(
+        pd.DataFrame(
+            {
+                "Character": ["Welt"],
+                "Path": ["Nihility"],
+                "Element": ["Imaginary"],
+                "Rarity": ["5"],
+                "Version": [1.0],
+            }
+        )
+    )
+    arrow_path.write_bytes(stale)
+
+    datasets = get_chart_datasets()
+
+    assert datasets.latest_version == 1.0
+    assert datasets.element_distribution["category"].tolist() == ["Imaginary"]
+
+
+def test_reads_materialized_datasets(characters_database, without_export):
+    """Test that the charts read the aggregates without touching characters."""
+    statements = record_statements(characters_database)
+
+    get_chart_datasets()
+
+    assert any('FROM "ChartAggregates"' in stmt for stmt in statements)
+    assert not any("HsrCharacters" in stmt for stmt in statements)
+
+
+def test_aggregates_follow_each_load(characters_database):
+    """Test that a load rebuilds the aggregates in its transaction."""
+    load_to_sqlite(
+        pd.DataFrame(
+            {
+                "Character": ["Himeko", "Welt"],
+                "Path": ["Erudition", "Nihility"],
+                "Element": ["Fire", "Imaginary"],
+                "Rarity": ["5", "5"],
+                "Version": [1.0, 1.0],
+            }
+        )
+    )
+
+    datasets = get_chart_datasets()
+
+    assert datasets.latest_version == 1.0
+    assert datasets.element_distribution["count"].tolist() == [1, 1]
+    assert datasets.element_balance_evolution.to_dict("records") == [
+        {"Version": 1.0, "Element": "Fire", "count": 1},
+        {"Version": 1.0, "Element": "Imaginary", "count": 1},
+    ]
+
+
+def test_fallback_single_table_scan(characters_database, without_export):
+    """Test that a database without aggregates is read in a single query."""
+    with characters_database.begin() as conn:
+        conn.exec_driver_sql('DROP TABLE "ChartAggregates"')
+    expected = fetch_data_orm(character_stats.get_version_path_evolution_stmt())
+    statements = record_statements(characters_database)
+
+    datasets = get_chart_datasets()
+
+    assert len([stmt for stmt in statements if "CharacterFacts" in stmt]) == 1
+    assert not [stmt for stmt in statements if "HsrCharacters" in stmt]
+    pd.testing.assert_frame_equal(
+        datasets.path_balance_evolution, expected, check_dtype=False
+    )
+
+
+def test_refresh_without_column_types(characters_database, without_export, monkeypatch):
+    """Test that the cube is read as rows when its column types are unknown."""
+    expected = get_chart_datasets()
+    monkeypatch.setattr(columnar, "get_column_dtypes", lambda stmt, dialect: None)
+
+    with characters_database.begin() as conn:
+        assert refresh_chart_aggregates(conn) > 0
+    query_cache.clear()
+
+    pd.testing.assert_frame_equal(
+        get_chart_datasets().element_balance_evolution,
+        expected.element_balance_evolution,
+    )
+
+
+def test_empty_cube():
+    """Test that an empty table gives empty datasets."""
+    cube = pd.DataFrame(columns=["Version", "Element", "Path", "Rarity", "count"])
+
+    datasets = compute_chart_datasets(cube)
+
+    assert datasets.latest_version is None
+    assert datasets.element_path_heatmap.empty
+    assert datasets.path_balance_evolution.empty
@@ -0,0 +1,63 @@
+"""Tests for the columnar read path."""
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import literal_column, select
+
+from hsrws.db.columnar import fetch_columnar, get_column_dtypes
+from hsrws.db.models import HsrCharacter
+from hsrws.db.queries import get_character_cube_stmt
+from hsrws.db.sqlite import load_to_sqlite
+from hsrws.visual.data_utils import fetch_data_orm
+
+
+def test_dtypes_from_statement(temp_database):
+    """Test that column dtypes are derived from the statement."""
+    dtypes = get_column_dtypes(get_character_cube_stmt(), temp_database.dialect)
+
+    assert dtypes == {
+        "Version": np.float64,
+        "Element": object,
+        "Path": object,
+        "Rarity": np.int64,
+        "count": np.int64,
+    }
+
+
+def test_untyped_statement_not_columnar(temp_database):
+    """Test that statements with untyped columns use the row path."""
+    stmt = select(literal_column("1").label("one"))
+
+    assert get_column_dtypes(stmt, temp_database.dialect) is None
+    assert fetch_data_orm(stmt)["one"].tolist() == [1]
+
+
+def test_chunks_match_row_path(sample_character_df, temp_database):
+    """Test that chunked columnar reads equal the row-based reads."""
+    load_to_sqlite(sample_character_df.assign(Version=[1.0, 1.1]))
+    stmt = get_character_cube_stmt()
+    with temp_database.connect() as conn:
+        expected = pd.DataFrame(
+            conn.execute(stmt).all(), columns=list(stmt.selected_columns.keys())
+        )
+        actual = fetch_columnar(
+            conn, stmt, get_column_dtypes(stmt, conn.dialect), chunk_size=1
+        )
+
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_nulls_use_nullable_dtypes(sample_character_df, temp_database):
+    """Test that NULL integers and floats keep their numeric dtype."""
+    df = sample_character_df.astype({"ATK Lvl 80": object})
+    df.loc[1, "ATK Lvl 80"] = None
+    load_to_sqlite(df)
+    stmt = select(HsrCharacter.ATK_Lvl_80, HsrCharacter.Version).order_by(
+        HsrCharacter.Character
+    )
+
+    result = fetch_data_orm(stmt)
+
+    assert str(result["ATK Lvl 80"].dtype) == "Int64"
+    assert result["ATK Lvl 80"].isna().tolist() == [True, False]
+    assert result["Version"].dtype == np.float64
@@ -0,0 +1,105 @@
+"""Tests for the process-wide engine and session factory."""
+
+import pytest
+from sqlalchemy import text
+
+from hsrws.db import database
+from hsrws.db.database import (
+    DEFAULT_DATABASE_URL,
+    dispose_engine,
+    get_database_url,
+    get_engine,
+    get_engine_options,
+    get_session,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_engine(monkeypatch, tmp_path):
+    """Point the engine at a temporary database and reset it around each test."""
+    monkeypatch.setenv("HSR_DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+    dispose_engine()
+    yield
+    dispose_engine()
+
+
+def test_default_database_url(monkeypatch):
+    """Test that the local hsr.db file is used when no URL is configured."""
+    monkeypatch.delenv("HSR_DATABASE_URL")
+    assert get_database_url() == DEFAULT_DATABASE_URL
+
+
+def test_engine_is_singleton(tmp_path):
+    """Test that repeated calls share one engine."""
+    engine = get_engine()
+
+    assert get_engine() is engine
+    assert str(engine.url) == f"sqlite:///{tmp_path / 'test.db'}"
+
+
+def test_sessions_share_engine():
+    """Test that sessions come from one factory bound to the singleton."""
+    with get_session() as first, get_session() as second:
+        assert first is not second
+        assert first.get_bind() is second.get_bind() is get_engine()
+        assert first.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_dispose_engine_recreates_from_settings(monkeypatch, tmp_path):
+    """Test that disposing picks up a new URL on the next call."""
+    first = get_engine()
+    monkeypatch.setenv("HSR_DATABASE_URL", f"sqlite:///{tmp_path / 'other.db'}")
+    dispose_engine()
+
+    second = get_engine()
+
+    assert second is not first
+    assert second.url.database.endswith("other.db")
+
+
+def test_failed_migration_keeps_no_engine(monkeypatch):
+    """Test that an engine whose upgrade failed is not reused."""
+
+    migrate = database.migrate
+    calls = []
+
+    def fail_once(engine):
+        calls.append(engine)
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        return migrate(engine)
+
+    monkeypatch.setattr(database, "migrate", fail_once)
+    with pytest.raises(RuntimeError):
+        get_engine()
+
+    with get_session() as session:
+        assert session.execute(text('SELECT count(*) FROM "SchemaVersion"')).scalar()
+    assert len(calls) == 2
+
+
+def test_pool_options_from_environment(monkeypatch):
+    """Test that pool settings are read from the environment."""
+    monkeypatch.setenv("HSR_DB_POOL_SIZE", "3")
+    monkeypatch.setenv("HSR_DB_MAX_OVERFLOW", "7")
+    monkeypatch.setenv("HSR_DB_POOL_PRE_PING", "true")
+
+    assert get_engine_options("sqlite:///hsr.db") == {
+        "pool_pre_ping": True,
+        "pool_size": 3,
+        "max_overflow": 7,
+    }
+    assert get_engine_options("sqlite://") == {"pool_pre_ping": True}
+    assert get_engine().pool.size() == 3
+
+
+def test_dispose_after_fork_keeps_engine():
+    """Test that the fork hook drops inherited connections but keeps the engine."""
+    engine = get_engine()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    database._dispose_after_fork()
+
+    assert get_engine() is engine
+    assert engine.pool.checkedin() == 0
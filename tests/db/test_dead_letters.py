@@ -0,0 +1,75 @@
+"""Tests for the dead-letter store and reprocessing."""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+
+from hsrws.core.reprocess import reprocess_dead_letters
+from hsrws.db.dead_letters import (
+    fetch_dead_letters,
+    resolve_dead_letters,
+    store_dead_letters,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Create an engine on a temporary SQLite file."""
+    return create_engine(f"sqlite:///{tmp_path / 'dead_letters.db'}")
+
+
+def test_store_and_fetch(engine):
+    """Test that rejected entries round-trip through the store."""
+    stored = store_dead_letters(
+        "run-1", [({"display_field": {}}, "Character: Field required")], engine
+    )
+
+    assert stored == 1
+    assert fetch_dead_letters(engine=engine) == [(1, {"display_field": {}})]
+    assert fetch_dead_letters("run-2", engine) == []
+
+
+def test_store_nothing(engine):
+    """Test that an empty batch is a no-op."""
+    assert store_dead_letters("run-1", [], engine) == 0
+
+
+def test_resolve(engine):
+    """Test that resolved entries are deleted and the rest kept."""
+    store_dead_letters("run-1", [({"a": 1}, "r1"), ({"b": 2}, "r2")], engine)
+
+    resolve_dead_letters([1], [(2, "still broken")], engine)
+
+    assert fetch_dead_letters(engine=engine) == [(2, {"b": 2})]
+
+
+def test_reprocess_dead_letters(engine):
+    """Test that fixed entries are loaded and broken ones remain."""
+    store_dead_letters(
+        "run-1",
+        [
+            ({"name": "Firefly", "filter_values": {}}, "old reason"),
+            ({"filter_values": {}}, "Character: Field required"),
+        ],
+        engine,
+    )
+
+    with patch("hsrws.core.reprocess.load_to_sqlite") as mock_load:
+        result = reprocess_dead_letters(engine=engine)
+
+    assert result == {"recovered": 1, "remaining": 1}
+    loaded = mock_load.call_args[0][0]
+    assert list(loaded["Character"]) == ["firefly"]
+    assert mock_load.call_args[1] == {"prune": False, "engine": engine}
+    assert [row_id for row_id, _ in fetch_dead_letters(engine=engine)] == [2]
+
+
+def test_reprocess_without_dead_letters(engine):
+    """Test that reprocessing an empty store does nothing."""
+    with patch("hsrws.core.reprocess.load_to_sqlite") as mock_load:
+        assert reprocess_dead_letters(engine=engine) == {
+            "recovered": 0,
+            "remaining": 0,
+        }
+    mock_load.assert_not_called()
@@ -0,0 +1,158 @@
+"""Tests for the streaming snapshot diff."""
+
+import json
+
+import pandas as pd
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from hsrws import cli
+from hsrws.db.diff import ColumnChange, ModifiedRow, diff_snapshots, merge_snapshots
+from hsrws.db.history import get_as_of_stmt, parse_run_reference
+from hsrws.db.sqlite import load_to_sqlite
+
+
+def roster(*characters):
+    """Build a character DataFrame from (name, element, ATK, version) tuples."""
+    return pd.DataFrame(
+        [
+            {
+                "Character": name,
+                "Path": "Hunt",
+                "Element": element,
+                "Rarity": "5",
+                "ATK Lvl 80": atk,
+                "Version": version,
+            }
+            for name, element, atk, version in characters
+        ]
+    )
+
+
+@pytest.fixture
+def runs_database(temp_database):
+    """Database loaded by three runs that add, change and remove characters."""
+    load_to_sqlite(
+        roster(("Seele", "Quantum", 640, 1.0), ("Himeko", "Fire", 756, 1.0)),
+        run_id="run-1",
+    )
+    load_to_sqlite(
+        roster(
+            ("Seele", "Quantum", 640, 1.0),
+            ("Himeko", "Fire", 756, 1.0),
+            ("Kafka", "Lightning", 679, 1.2),
+        ),
+        run_id="run-2",
+    )
+    load_to_sqlite(
+        roster(("Seele", "Imaginary", 660, 1.0), ("Kafka", "Lightning", 679, 1.2)),
+        run_id="run-3",
+    )
+    return temp_database
+
+
+def test_merge_snapshots():
+    """Test the sort-merge join of two ordered snapshots."""
+    old = [("a", 1), ("b", 2), ("d", 4)]
+    new = [("b", 2), ("c", 3), ("d", 5), ("e", 6)]
+
+    assert list(merge_snapshots(iter(old), iter(new))) == [
+        ("removed", ("a", 1), None),
+        ("added", ("c", 3), None),
+        ("modified", ("d", 4), ("d", 5)),
+        ("added", ("e", 6), None),
+    ]
+
+
+def test_diff_runs(runs_database):
+    """Test the added, removed and modified characters between runs."""
+    diff = diff_snapshots(1, 3)
+
+    assert (diff.old_run, diff.new_run) == (1, 3)
+    assert [row["Character"] for row in diff.added] == ["Kafka"]
+    assert [row["Character"] for row in diff.removed] == ["Himeko"]
+    assert diff.modified == [
+        ModifiedRow(
+            "Seele",
+            [
+                ColumnChange("Element", "Quantum", "Imaginary"),
+                ColumnChange("ATK Lvl 80", 640, 660),
+            ],
+        )
+    ]
+
+
+def test_diff_defaults_to_last_two_runs(runs_database):
+    """Test that the latest run is compared with the one before it."""
+    assert diff_snapshots() == diff_snapshots("run-2", 3)
+
+
+def test_diff_identical_runs(runs_database):
+    """Test that a run compared with itself has no changes."""
+    diff = diff_snapshots(2, 2)
+
+    assert diff.added == diff.removed == diff.modified == []
+
+
+def test_diff_unknown_run(runs_database):
+    """Test that unknown runs are rejected."""
+    with pytest.raises(ValueError):
+        diff_snapshots(1, 42)
+
+
+def test_diff_mixed_case_names(temp_database):
+    """Test that names are merged in the order Python compares them."""
+    names = ["Zed", "amber", "\u00c4mber", "Bea", "bea"]
+    load_to_sqlite(roster(*((name, "Fire", 600, 1.0) for name in names)))
+    load_to_sqlite(roster(*((name, "Ice", 600, 1.0) for name in names[1:])))
+
+    diff = diff_snapshots()
+
+    assert [row["Character"] for row in diff.removed] == ["Zed"]
+    assert diff.added == []
+    assert [row.character for row in diff.modified] == sorted(names[1:])
+
+
+def test_postgresql_snapshots_use_binary_order():
+    """Test that PostgreSQL snapshots are ordered by the C collation."""
+    sql = str(get_as_of_stmt(3, collation="C").compile(dialect=postgresql.dialect()))
+
+    assert sql.endswith('ORDER BY "HsrCharacterHistory"."Character" COLLATE "C"')
+
+
+def test_diff_single_run(temp_database):
+    """Test that the default diff needs two recorded runs."""
+    load_to_sqlite(roster(("Seele", "Quantum", 640, 1.0)))
+
+    with pytest.raises(ValueError):
+        diff_snapshots()
+
+
+@pytest.mark.parametrize(
+    "value, expected", [("3", 3), ("2.3", 2.3), ("0f3a9c", "0f3a9c")]
+)
+def test_parse_run_reference(value, expected):
+    """Test parsing run numbers, patch versions and run ids."""
+    assert parse_run_reference(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", " ", "nan", "inf", "-Infinity"])
+def test_parse_invalid_run_reference(value):
+    """Test that empty references and non-finite versions are rejected."""
+    with pytest.raises(ValueError):
+        parse_run_reference(value)
+
+
+def test_diff_command(runs_database, capsys):
+    """Test the diff command printing the diff as JSON."""
+    assert cli.main(["diff", "run-2", "3"]) == 0
+
+    output = json.loads(capsys.readouterr().out)
+    assert [row["Character"] for row in output["removed"]] == ["Himeko"]
+    assert output["modified"][0]["changes"]["ATK Lvl 80"] == {"old": 640, "new": 660}
+
+
+def test_diff_command_unknown_run(runs_database, capsys):
+    """Test the diff command exit code for an unknown run."""
+    assert cli.main(["diff", "42"]) == 1
+    assert "42" in capsys.readouterr().err
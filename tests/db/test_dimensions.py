@@ -0,0 +1,153 @@
+"""Tests for the normalized dimension and fact tables."""
+
+import pandas as pd
+import pytest
+from sqlalchemy import select, text, update
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.exc import IntegrityError
+
+from hsrws.db.dimensions import (
+    FACT_TABLE,
+    PATH_TABLE,
+    RARITY_TABLE,
+    get_fact_rows_stmt,
+    refresh_dimensions,
+)
+from hsrws.db.models import HsrCharacter
+from hsrws.db.queries import (
+    CharacterFilter,
+    build_aggregate_stmt,
+    filter_params,
+    get_character_cube_stmt,
+)
+from hsrws.db.sqlite import load_to_sqlite
+
+
+def roster(*characters):
+    """Build a character DataFrame from (name, path, element, rarity) tuples."""
+    return pd.DataFrame(
+        [
+            {
+                "Character": name,
+                "Path": path,
+                "Element": element,
+                "Rarity": rarity,
+                "ATK Lvl 80": 600,
+                "Version": 1.0,
+            }
+            for name, path, element, rarity in characters
+        ]
+    )
+
+
+@pytest.fixture
+def normalized_database(temp_database):
+    """Database loaded with characters sharing paths and elements."""
+    load_to_sqlite(
+        roster(
+            ("Seele", "Hunt", "Quantum", 5),
+            ("Topaz", "Hunt", "Fire", 5),
+            ("Asta", "Harmony", "Fire", 4),
+            ("Unknown", None, None, None),
+        )
+    )
+    return temp_database
+
+
+def read_all(engine, stmt):
+    """Read every row of a statement."""
+    with engine.connect() as conn:
+        return conn.execute(stmt).all()
+
+
+def test_dimension_keys(normalized_database):
+    """Test that each distinct value is stored once with an integer key."""
+    assert read_all(normalized_database, select(PATH_TABLE)) == [
+        (1, "Harmony"),
+        (2, "Hunt"),
+    ]
+    assert read_all(normalized_database, select(RARITY_TABLE)) == [
+        (4, "4-Star"),
+        (5, "5-Star"),
+    ]
+    assert read_all(
+        normalized_database,
+        select(FACT_TABLE.c.Character, FACT_TABLE.c.PathId).order_by(
+            FACT_TABLE.c.Character
+        ),
+    ) == [("Asta", 1), ("Seele", 2), ("Topaz", 2), ("Unknown", None)]
+
+
+def test_keys_are_stable(normalized_database):
+    """Test that later loads keep existing keys and append new values."""
+    load_to_sqlite(roster(("Kafka", "Nihility", "Lightning", 5)))
+
+    assert read_all(normalized_database, select(PATH_TABLE)) == [
+        (1, "Harmony"),
+        (2, "Hunt"),
+        (3, "Nihility"),
+    ]
+    assert read_all(normalized_database, select(FACT_TABLE.c.Character)) == [("Kafka",)]
+
+
+def test_only_changed_facts_are_written(normalized_database):
+    """Test that a refresh rewrites only the facts of changed characters."""
+    rowids = select(text("rowid"), FACT_TABLE.c.Character).select_from(FACT_TABLE)
+    before = dict(read_all(normalized_database, rowids))
+    with normalized_database.begin() as conn:
+        assert refresh_dimensions(conn) == 0
+        conn.execute(
+            update(HsrCharacter)
+            .where(HsrCharacter.Character == "Asta")
+            .values(Path="Hunt")
+        )
+        assert refresh_dimensions(conn) == 1
+
+    after = dict(read_all(normalized_database, rowids))
+    assert {rowid: name for rowid, name in after.items() if name != "Asta"} == {
+        rowid: name for rowid, name in before.items() if name != "Asta"
+    }
+    assert sorted(read_all(normalized_database, select(FACT_TABLE))) == sorted(
+        read_all(normalized_database, get_fact_rows_stmt())
+    )
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        None,
+        CharacterFilter(element="Fire"),
+        CharacterFilter(path="Hunt", min_version=1.0),
+        CharacterFilter(element="Wind"),
+    ],
+)
+def test_fact_cube_matches_character_table(normalized_database, filters):
+    """Test that grouping on integer keys gives the string-based counts."""
+    dimensions = ("Version", "Element", "Path", "Rarity")
+    params = filter_params(filters)
+    with normalized_database.connect() as conn:
+        facts = conn.execute(get_character_cube_stmt(filters), params).all()
+        characters = conn.execute(
+            build_aggregate_stmt(dimensions, filters), params
+        ).all()
+
+    assert facts == characters
+
+
+def test_fact_cube_groups_on_covering_index(normalized_database):
+    """Test that the cube reads only the facts, grouped in covering index order."""
+    sql = get_character_cube_stmt().compile(dialect=sqlite.dialect())
+    with normalized_database.connect() as conn:
+        plan = [row[3] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+    fact_steps = [step for step in plan if "CharacterFacts" in step]
+    assert fact_steps and all("COVERING INDEX" in step for step in fact_steps)
+    assert not any(HsrCharacter.__tablename__ in step for step in plan), plan
+    assert not any("FOR GROUP BY" in step for step in plan), plan
+
+
+def test_foreign_keys_enforced(normalized_database):
+    """Test that facts must reference existing dimension values."""
+    with pytest.raises(IntegrityError):
+        with normalized_database.begin() as conn:
+            conn.execute(FACT_TABLE.insert().values(Character="Ghost", PathId=42))
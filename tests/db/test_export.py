@@ -0,0 +1,162 @@
+"""Tests for the columnar Parquet and Arrow export."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from hsrws import cli
+from hsrws.db import columnar, export
+from hsrws.db.export import (
+    ARROW_FILE_NAME,
+    PARQUET_FILE_NAME,
+    export_table_to_frame,
+    get_export_dir,
+    get_export_generation,
+    read_character_export,
+    read_export_table,
+)
+from hsrws.db.generation import get_data_generation
+from hsrws.db.sqlite import load_to_sqlite
+
+CHARACTERS = pd.DataFrame(
+    {
+        "Character": ["Himeko", "Asta", "Seele", "Lost"],
+        "Path": ["Erudition", "Harmony", "Hunt", None],
+        "Element": ["Fire", "Fire", "Quantum", "Fire"],
+        "Rarity": [5, 4, 5, None],
+        "ATK Lvl 80": [756, 511, 640, 600],
+        "DEF Lvl 80": [396, 463, 363, None],
+        "Version": [1.0, 1.0, 1.0, 1.2],
+    }
+)
+
+
+@pytest.fixture
+def export_dir(temp_database, tmp_path):
+    """Directory of the export written by a load of the characters."""
+    load_to_sqlite(CHARACTERS)
+    return tmp_path
+
+
+def test_load_writes_export(export_dir, temp_database):
+    """Test that a load writes both files at the current data generation."""
+    table = read_export_table(export_dir / ARROW_FILE_NAME)
+
+    assert get_export_dir() == export_dir
+    assert table.num_rows == 4
+    assert pa.types.is_dictionary(table.schema.field("Path").type)
+    assert table.schema.field("Rarity").type == pa.int16()
+    with temp_database.connect() as conn:
+        assert get_export_generation(table) == get_data_generation(conn)
+
+    parquet = pq.read_table(export_dir / PARQUET_FILE_NAME)
+    assert parquet.equals(table)
+    assert pa.types.is_dictionary(parquet.schema.field("Element").type)
+
+
+def test_read_typed_frame(export_dir):
+    """Test that the reader rebuilds categoricals and nullable integers."""
+    frame = read_character_export()
+
+    assert frame["Character"].tolist() == ["Asta", "Himeko", "Lost", "Seele"]
+    assert isinstance(frame["Element"].dtype, pd.CategoricalDtype)
+    assert sorted(frame["Element"].cat.categories) == ["Fire", "Quantum"]
+    assert frame["Path"].isna().tolist() == [False, False, True, False]
+    assert str(frame["Rarity"].dtype) == "Int16"
+    assert frame["Rarity"].isna().sum() == 1
+    assert frame["ATK Lvl 80"].dtype == np.int64
+    assert str(frame["DEF Lvl 80"].dtype) == "Int64"
+
+
+def test_numeric_columns_are_not_copied(export_dir):
+    """Test that columns without NULLs are views of the mapped file."""
+    table = read_export_table()
+
+    frame = export_table_to_frame(table)
+
+    chunk = table.column("ATK Lvl 80").chunk(0)
+    mapped = np.frombuffer(chunk.buffers()[1], dtype=np.int64)
+    assert np.shares_memory(frame["ATK Lvl 80"].to_numpy(), mapped)
+
+
+def test_mapped_table_survives_replacement(export_dir):
+    """Test that a mapped export stays readable after the next load."""
+    table = read_export_table()
+
+    load_to_sqlite(CHARACTERS.iloc[:1])
+
+    assert table.column("Character").to_pylist() == ["Asta", "Himeko", "Lost", "Seele"]
+    assert read_export_table().num_rows == 1
+
+
+def test_failed_export_removes_stale_files(export_dir, monkeypatch):
+    """Test that a failed export leaves no file older than the database."""
+
+    def fail(conn, directory):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(export, "write_character_export", fail)
+
+    assert load_to_sqlite(CHARACTERS.iloc[:1])["deleted"] == 3
+    assert not (export_dir / ARROW_FILE_NAME).exists()
+    assert not (export_dir / PARQUET_FILE_NAME).exists()
+
+
+def test_missing_pyarrow_removes_stale_files(export_dir, monkeypatch):
+    """Test that a load without pyarrow deletes the previous export."""
+    monkeypatch.setattr(export, "pyarrow_available", lambda: False)
+
+    load_to_sqlite(CHARACTERS.iloc[:1])
+
+    assert not (export_dir / ARROW_FILE_NAME).exists()
+    assert read_export_table(export_dir / ARROW_FILE_NAME) is None
+
+
+def test_export_without_column_types(export_dir, temp_database, monkeypatch):
+    """Test that the export reads rows when the column types are unknown."""
+    monkeypatch.setattr(columnar, "get_column_dtypes", lambda stmt, dialect: None)
+
+    with temp_database.connect() as conn:
+        written = export.write_character_export(conn, export_dir)
+
+    assert written.rows == 4
+    pd.testing.assert_frame_equal(
+        read_character_export(written.arrow_path),
+        read_character_export(export_dir / ARROW_FILE_NAME),
+    )
+
+
+def test_export_dir_setting(monkeypatch, tmp_path):
+    """Test the export directory of each kind of database."""
+    monkeypatch.delenv("HSR_EXPORT_DIR", raising=False)
+    assert get_export_dir("sqlite:///data/hsr.db").as_posix() == "data"
+    assert get_export_dir("sqlite://") is None
+    assert get_export_dir("postgresql://localhost/hsr") is None
+
+    monkeypatch.setenv("HSR_EXPORT_DIR", str(tmp_path))
+    assert get_export_dir("sqlite://") == tmp_path
+
+
+def test_missing_export(temp_database, tmp_path):
+    """Test that reading a missing export raises FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        read_character_export(tmp_path / ARROW_FILE_NAME)
+
+
+def test_export_command(export_dir, tmp_path, capsys):
+    """Test the export command writing the files to another directory."""
+    target = tmp_path / "exports"
+
+    assert cli.main(["export", "--dir", str(target)]) == 0
+
+    output = json.loads(capsys.readouterr().out)
+    assert output["rows"] == 4
+    assert output["arrow_path"] == str(target / ARROW_FILE_NAME)
+    assert read_character_export(target / ARROW_FILE_NAME).equals(
+        read_character_export(export_dir / ARROW_FILE_NAME)
+    )
@@ -0,0 +1,123 @@
+"""Tests for the run-versioned character history."""
+
+import pandas as pd
+import pytest
+from sqlalchemy import func, select
+
+from hsrws.db import columnar
+from hsrws.db.history import as_of, get_as_of_stmt
+from hsrws.db.models import HsrCharacterHistory
+from hsrws.db.sqlite import load_to_sqlite
+
+
+def roster(*characters):
+    """Build a character DataFrame from (name, element, ATK, version) tuples."""
+    return pd.DataFrame(
+        [
+            {
+                "Character": name,
+                "Path": "Hunt",
+                "Element": element,
+                "Rarity": "5",
+                "ATK Lvl 80": atk,
+                "Version": version,
+            }
+            for name, element, atk, version in characters
+        ]
+    )
+
+
+@pytest.fixture
+def history_database(temp_database):
+    """Database loaded by three runs that add, change and remove characters."""
+    load_to_sqlite(
+        roster(("Seele", "Quantum", 640, 1.0), ("Himeko", "Fire", 756, 1.0)),
+        run_id="run-1",
+    )
+    load_to_sqlite(
+        roster(
+            ("Seele", "Quantum", 640, 1.0),
+            ("Himeko", "Fire", 756, 1.0),
+            ("Kafka", "Lightning", 679, 1.2),
+        ),
+        run_id="run-2",
+    )
+    load_to_sqlite(
+        roster(("Seele", "Quantum", 660, 1.0), ("Kafka", "Lightning", 679, 1.2)),
+        run_id="run-3",
+    )
+    return temp_database
+
+
+def count_history_rows(engine):
+    """Count every row of the history table."""
+    with engine.connect() as conn:
+        return conn.execute(
+            select(func.count()).select_from(HsrCharacterHistory)
+        ).scalar()
+
+
+def test_only_changes_are_written(history_database):
+    """Test that unchanged characters add no history rows."""
+    # Seele and Himeko (run 1), Kafka (run 2), Seele's new ATK (run 3)
+    assert count_history_rows(history_database) == 4
+
+    load_to_sqlite(
+        roster(("Seele", "Quantum", 660, 1.0), ("Kafka", "Lightning", 679, 1.2))
+    )
+
+    assert count_history_rows(history_database) == 4
+
+
+def test_as_of_run_number(history_database):
+    """Test reading the roster as it was after each run."""
+    assert as_of(1)["Character"].tolist() == ["Himeko", "Seele"]
+    assert as_of(2)["Character"].tolist() == ["Himeko", "Kafka", "Seele"]
+    assert as_of(3)["Character"].tolist() == ["Kafka", "Seele"]
+    assert as_of(1).set_index("Character")["ATK Lvl 80"]["Seele"] == 640
+    assert as_of(3).set_index("Character")["ATK Lvl 80"]["Seele"] == 660
+
+
+def test_as_of_run_id(history_database):
+    """Test resolving a run by its scrape run id."""
+    pd.testing.assert_frame_equal(as_of("run-2"), as_of(2))
+
+
+def test_as_of_patch_version(history_database):
+    """Test reading the roster as of a patch version."""
+    assert as_of(1.1)["Character"].tolist() == ["Himeko", "Seele"]
+    assert as_of(1.2)["Character"].tolist() == ["Kafka", "Seele"]
+    assert as_of(0.9).empty
+
+
+def test_latest_run_reads_current_table(history_database):
+    """Test that the latest run is served by the current table."""
+    history = as_of(3).reset_index(drop=True)
+    with history_database.connect() as conn:
+        expected = pd.DataFrame(
+            conn.execute(get_as_of_stmt(3)).all(), columns=history.columns
+        )
+
+    pd.testing.assert_frame_equal(history, expected, check_dtype=False)
+
+
+def test_as_of_without_column_types(history_database, monkeypatch):
+    """Test that the roster is read as rows when its column types are unknown."""
+    expected = as_of(2)
+    monkeypatch.setattr(columnar, "get_column_dtypes", lambda stmt, dialect: None)
+
+    pd.testing.assert_frame_equal(as_of(2), expected, check_dtype=False)
+
+
+def test_unknown_run(history_database):
+    """Test that unknown runs are rejected."""
+    with pytest.raises(ValueError):
+        as_of(42)
+    with pytest.raises(ValueError):
+        as_of("missing")
+
+
+def test_no_runs(temp_database):
+    """Test that time travel needs a recorded run."""
+    with pytest.raises(ValueError):
+        as_of(1)
@@ -1,35 +1,103 @@
 """Tests for the load_to_sqlite function."""
 
-import sqlite3
 from unittest.mock import patch
 
+import pandas as pd
 import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError, OperationalError
 
 from hsrws.db.sqlite import load_to_sqlite
 
 
-def test_successful_load(sample_character_df, mock_sqlite_connection):
+def read_table(engine):
+    """Read the HsrCharacters table ordered by character."""
+    with engine.connect() as conn:
+        return pd.read_sql(
+            text('SELECT * FROM "HsrCharacters" ORDER BY "Character"'), conn
+        )
+
+
+def test_successful_load(sample_character_df, temp_database):
     """Test successful loading of DataFrame to SQLite."""
-    # Mock pandas to_sql method
-    with (
-        patch("pandas.DataFrame.to_sql") as mock_to_sql,
-        patch("sqlite3.connect", return_value=mock_sqlite_connection),
-        # Instead of patching non-existent functions, create mock functions
-        patch.object(mock_sqlite_connection, "cursor"),
-    ):
-        # Call the function you're testing
-        from hsrws.db.sqlite import load_to_sqlite
+    counts = load_to_sqlite(sample_character_df)
 
-        load_to_sqlite(sample_character_df)
+    assert counts == {"inserted": 2, "updated": 0, "unchanged": 0, "deleted": 0}
+    table = read_table(temp_database)
+    assert list(table["Character"]) == ["Another Character", "Test Character"]
+    assert "index" not in table.columns
 
-        # Assert that to_sql was called with the expected arguments
-        mock_to_sql.assert_called_once()
 
+def test_table_created_from_model(sample_character_df, temp_database):
+    """Test that the table keeps the model's primary key."""
+    load_to_sqlite(sample_character_df)
 
-def test_operational_error(sample_character_df):
-    """Test error handling when SQLite operation fails."""
-    with patch("hsrws.db.sqlite.sqlite3.connect") as mock_connect:
-        mock_connect.side_effect = sqlite3.OperationalError("Test error")
+    pk = inspect(temp_database).get_pk_constraint("HsrCharacters")
+    assert pk["constrained_columns"] == ["Character"]
+
+
+def test_reload_reports_updates(sample_character_df, temp_database):
+    """Test that reloading reports updated, unchanged and deleted rows."""
+    load_to_sqlite(sample_character_df)
+
+    changed = sample_character_df.copy()
+    changed.loc[0, "ATK Lvl 80"] = 999
+    changed.loc[1, "Character"] = "New Character"
+    counts = load_to_sqlite(changed)
+
+    assert counts == {"inserted": 1, "updated": 1, "unchanged": 0, "deleted": 1}
+    table = read_table(temp_database)
+    assert list(table["Character"]) == ["New Character", "Test Character"]
+    assert table.loc[1, "ATK Lvl 80"] == 999
+
+    assert load_to_sqlite(changed)["unchanged"] == 2
+
+
+def test_partial_load_keeps_other_rows(sample_character_df, temp_database):
+    """Test that prune=False leaves characters missing from the frame."""
+    load_to_sqlite(sample_character_df)
+
+    counts = load_to_sqlite(sample_character_df.iloc[:1], prune=False)
+
+    assert counts["deleted"] == 0
+    assert len(read_table(temp_database)) == 2
 
-        with pytest.raises(sqlite3.OperationalError):
+
+def test_missing_values_stored_as_null(temp_database):
+    """Test that missing stats are stored as NULL."""
+    df = pd.DataFrame({"Character": ["a"], "ATK Lvl 80": [None]})
+    load_to_sqlite(df)
+
+    assert read_table(temp_database)["ATK Lvl 80"].isna().all()
+
+
+def test_unknown_rarity_stored_as_null(sample_character_df, temp_database):
+    """Test that rarities that are not numbers are stored as NULL."""
+    load_to_sqlite(sample_character_df.assign(Rarity=["5", "Unknown"]))
+
+    # Ordered by character: Another Character, then Test Character
+    table = read_table(temp_database)
+    assert table["Rarity"].isna().tolist() == [True, False]
+    assert table["Rarity"][1] == 5
+
+
+@pytest.mark.parametrize(
+    "column, value", [("Rarity", 9), ("ATK Lvl 80", -1), ("Version", 0.0)]
+)
+def test_check_constraints(sample_character_df, temp_database, column, value):
+    """Test that out-of-range values are rejected by the table."""
+    df = sample_character_df.assign(Version=1.0)
+    df.loc[0, column] = value
+
+    with pytest.raises(IntegrityError):
+        load_to_sqlite(df)
+
+
+def test_operational_error(sample_character_df, temp_database):
+    """Test error handling when SQLite operation fails."""
+    with patch(
+        "hsrws.db.sqlite.upsert_characters",
+        side_effect=OperationalError("INSERT", {}, Exception("Test error")),
+    ):
+        with pytest.raises(OperationalError):
             load_to_sqlite(sample_character_df)
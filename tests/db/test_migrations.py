@@ -0,0 +1,253 @@
+"""Tests for the versioned schema migrations."""
+
+import json
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, func, inspect, select, text
+from sqlalchemy.pool import NullPool
+
+from hsrws import cli
+from hsrws.db.database import dispose_engine, get_engine
+from hsrws.db.migrations import (
+    MIGRATIONS,
+    Migration,
+    get_schema_version,
+    migrate,
+    upgrade_schema,
+)
+from hsrws.db.migrations.versions import v0002_rebuild_character_tables
+from hsrws.db.models import Base, HsrCharacter, SchemaVersion
+from hsrws.db.pragmas import install_sqlite_pragmas
+from hsrws.db.queries import build_aggregate_stmt, get_character_cube_stmt
+from hsrws.db.result_cache import query_cache
+from hsrws.db.schema import rebuild_table
+from hsrws.db.sqlite import load_to_sqlite
+
+
+@pytest.fixture
+def existing_database(monkeypatch, tmp_path):
+    """Open the application database after preparing the file with sqlite3."""
+    path = tmp_path / "hsr.db"
+    monkeypatch.setenv("HSR_DATABASE_URL", f"sqlite:///{path}")
+    dispose_engine()
+    query_cache.clear()
+
+    def open_database(prepare):
+        with closing(sqlite3.connect(path)) as conn:
+            prepare(conn)
+            conn.commit()
+        return get_engine()
+
+    yield open_database
+    dispose_engine()
+
+
+def read_rarities(engine):
+    """Read the characters with their rarity and its storage class."""
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(
+            'SELECT "Character", "Rarity", typeof("Rarity") FROM "HsrCharacters" '
+            'ORDER BY "Character"'
+        ).all()
+
+
+def test_migrations_are_ordered():
+    """Test that migration versions start at 1 and have no gaps."""
+    assert [migration.version for migration in MIGRATIONS] == list(
+        range(1, len(MIGRATIONS) + 1)
+    )
+
+
+def test_new_database_is_current(temp_database):
+    """Test that the engine creates every table at the latest version."""
+    with temp_database.connect() as conn:
+        assert get_schema_version(conn) == MIGRATIONS[-1].version
+        tables = set(inspect(conn).get_table_names())
+
+    assert set(Base.metadata.tables) <= tables
+    assert inspect(temp_database).get_view_names() == []
+
+
+def test_migrate_is_idempotent(temp_database):
+    """Test that an up-to-date schema applies nothing."""
+    assert migrate(temp_database) == MIGRATIONS[-1].version
+
+    with temp_database.connect() as conn:
+        applied = conn.execute(select(func.count()).select_from(SchemaVersion))
+        assert applied.scalar() == len(MIGRATIONS)
+
+
+def test_legacy_table_is_rebuilt(existing_database, sample_character_df):
+    """Test that a table written by to_sql is rebuilt with the model schema."""
+    legacy = sample_character_df.assign(Version=1.0)
+    engine = existing_database(lambda conn: legacy.to_sql("HsrCharacters", conn))
+
+    pk = inspect(engine).get_pk_constraint("HsrCharacters")
+    assert pk["constrained_columns"] == ["Character"]
+    assert load_to_sqlite(legacy)["unchanged"] == 2
+    with engine.connect() as conn:
+        table = pd.read_sql(text('SELECT * FROM "HsrCharacters"'), conn)
+    assert "index" not in table.columns
+
+
+def test_legacy_characters_get_facts(existing_database, sample_character_df):
+    """Test that the fact tables are filled from a legacy character table."""
+    legacy = sample_character_df.assign(Version=1.0)
+    engine = existing_database(lambda conn: legacy.to_sql("HsrCharacters", conn))
+    dimensions = ("Version", "Element", "Path", "Rarity")
+
+    with engine.connect() as conn:
+        cube = conn.execute(get_character_cube_stmt()).all()
+        expected = conn.execute(build_aggregate_stmt(dimensions)).all()
+
+    assert cube == expected
+    assert sum(row.count for row in cube) == len(legacy)
+
+
+def test_character_view_is_dropped(existing_database):
+    """Test that the view of earlier schema versions is dropped."""
+    engine = existing_database(
+        lambda conn: conn.execute('CREATE VIEW "HsrCharactersView" AS SELECT 1')
+    )
+
+    assert inspect(engine).get_view_names() == []
+
+
+def test_memo_position_is_added(existing_database):
+    """Test that a memo table from before the recency column gets it."""
+
+    def prepare(conn):
+        conn.execute(
+            'CREATE TABLE "TransformMemo" ("Transform" VARCHAR, "Raw" VARCHAR, '
+            '"Fingerprint" VARCHAR NOT NULL, "Normalized" VARCHAR NOT NULL, '
+            'PRIMARY KEY ("Transform", "Raw"))'
+        )
+        conn.execute("INSERT INTO \"TransformMemo\" VALUES ('t', 'x', 'v1', '1')")
+
+    engine = existing_database(prepare)
+
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql(
+            'SELECT "Raw", "Position" FROM "TransformMemo"'
+        ).all() == [("x", 0)]
+
+
+def test_text_rarity_table_is_rebuilt(existing_database):
+    """Test that text rarities are converted to integers in place."""
+
+    def prepare(conn):
+        conn.execute(
+            'CREATE TABLE "HsrCharacters" ("Character" VARCHAR PRIMARY KEY, '
+            '"Rarity" VARCHAR, "Version" FLOAT)'
+        )
+        conn.execute(
+            'CREATE INDEX "ix_HsrCharacters_Path_Rarity" ON "HsrCharacters" ("Rarity")'
+        )
+        conn.execute(
+            "INSERT INTO \"HsrCharacters\" VALUES ('Seele', '5', 1.0), "
+            "('Lost', 'Unknown', 1.0)"
+        )
+
+    engine = existing_database(prepare)
+
+    assert read_rarities(engine) == [
+        ("Lost", None, "null"),
+        ("Seele", 5, "integer"),
+    ]
+
+
+def test_rebuild_is_sqlite_only():
+    """Test that only SQLite character tables are rebuilt."""
+    conn = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+    with pytest.raises(ValueError, match="only SQLite"):
+        rebuild_table(conn, HsrCharacter.__table__)
+    assert v0002_rebuild_character_tables.upgrade(conn) is None
+
+
+def test_missing_indexes_are_added(existing_database):
+    """Test that a database from before the index migration gets the indexes."""
+
+    def prepare(conn):
+        conn.execute(
+            'CREATE TABLE "HsrCharacters" ("Character" VARCHAR NOT NULL PRIMARY KEY, '
+            '"Path" VARCHAR, "Element" VARCHAR, "Rarity" SMALLINT, '
+            '"ATK Lvl 80" INTEGER, "DEF Lvl 80" INTEGER, "HP Lvl 80" INTEGER, '
+            '"SPD Lvl 80" INTEGER, "Version" FLOAT, '
+            'CONSTRAINT "ck_HsrCharacters_Rarity" CHECK ("Rarity" BETWEEN 1 AND 5), '
+            'CONSTRAINT "ck_HsrCharacters_Stats" CHECK ("ATK Lvl 80" >= 0), '
+            'CONSTRAINT "ck_HsrCharacters_Version" CHECK ("Version" > 0))'
+        )
+        conn.execute(
+            'INSERT INTO "HsrCharacters" ("Character", "Rarity") VALUES (\'Seele\', 5)'
+        )
+
+    engine = existing_database(prepare)
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("HsrCharacters")}
+    assert indexes == {index.name for index in HsrCharacter.__table__.indexes}
+    assert read_rarities(engine) == [("Seele", 5, "integer")]
+
+
+def test_failed_upgrade_rolls_back(temp_database):
+    """Test that a failing migration leaves no partial schema change behind."""
+
+    def create_table(conn):
+        conn.exec_driver_sql('CREATE TABLE "Partial" ("Id" INTEGER)')
+
+    def fail(conn):
+        raise RuntimeError("broken migration")
+
+    migrations = [
+        *MIGRATIONS,
+        Migration(MIGRATIONS[-1].version + 1, "create_partial", create_table),
+        Migration(MIGRATIONS[-1].version + 2, "fail", fail),
+    ]
+    with pytest.raises(RuntimeError):
+        with temp_database.begin() as conn:
+            upgrade_schema(conn, migrations)
+
+    assert not inspect(temp_database).has_table("Partial")
+    with temp_database.connect() as conn:
+        assert get_schema_version(conn) == MIGRATIONS[-1].version
+
+
+def test_migrate_command(temp_database, capsys):
+    """Test the migrate command printing the schema version."""
+    assert cli.main(["migrate"]) == 0
+
+    assert json.loads(capsys.readouterr().out) == {
+        "schema_version": MIGRATIONS[-1].version
+    }
+
+
+def test_concurrent_migrations(tmp_path):
+    """Test that processes starting together migrate a new database once."""
+    url = f"sqlite:///{tmp_path / 'hsr.db'}"
+    workers = 6
+    barrier = threading.Barrier(workers)
+
+    def start_worker(_):
+        engine = create_engine(url, poolclass=NullPool)
+        install_sqlite_pragmas(engine)
+        barrier.wait()
+        try:
+            return migrate(engine)
+        finally:
+            engine.dispose()
+
+    with ThreadPoolExecutor(workers) as executor:
+        versions = list(executor.map(start_worker, range(workers)))
+
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        applied = conn.execute(select(SchemaVersion.Version)).scalars().all()
+    engine.dispose()
+    assert versions == [MIGRATIONS[-1].version] * workers
+    assert sorted(applied) == [migration.version for migration in MIGRATIONS]
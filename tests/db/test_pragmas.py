@@ -0,0 +1,192 @@
+"""Tests for the shared SQLite connection settings and snapshot swap loads."""
+
+import shutil
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from hsrws.db import sqlite as sqlite_module
+from hsrws.db.export import ARROW_FILE_NAME, PARQUET_FILE_NAME
+from hsrws.db.pragmas import DatabaseReplacedError, install_sqlite_pragmas
+from hsrws.db.sqlite import load_to_sqlite
+
+
+def read_pragma(engine, pragma):
+    """Read a PRAGMA value through a pooled connection."""
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(f"PRAGMA {pragma}").scalar()
+
+
+def test_application_engine_uses_wal(temp_database):
+    """Test that the application engine applies the performance profile."""
+    assert read_pragma(temp_database, "journal_mode") == "wal"
+    assert read_pragma(temp_database, "synchronous") == 1  # NORMAL
+    assert read_pragma(temp_database, "temp_store") == 2  # MEMORY
+    assert read_pragma(temp_database, "cache_size") == -65536
+    assert read_pragma(temp_database, "busy_timeout") == 5000
+    assert read_pragma(temp_database, "foreign_keys") == 1
+
+
+def test_journal_mode_from_environment(monkeypatch, tmp_path):
+    """Test that the journal mode can be configured."""
+    monkeypatch.setenv("HSR_SQLITE_JOURNAL_MODE", "delete")
+    engine = create_engine(f"sqlite:///{tmp_path / 'x.db'}")
+    install_sqlite_pragmas(engine)
+
+    assert read_pragma(engine, "journal_mode") == "delete"
+
+
+def test_wal_reader_not_blocked_by_writer(sample_character_df, temp_database):
+    """Test that an open write transaction does not block readers."""
+    load_to_sqlite(sample_character_df)
+    database = temp_database.url.database
+
+    writer = sqlite3.connect(database, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    writer.execute('DELETE FROM "HsrCharacters"')
+
+    with temp_database.connect() as conn:
+        count = conn.execute(text('SELECT count(*) FROM "HsrCharacters"')).scalar()
+    writer.execute("ROLLBACK")
+    writer.close()
+
+    assert count == 2
+
+
+@pytest.fixture
+def rollback_database(monkeypatch, temp_database):
+    """Application database in rollback-journal mode, as swap loads require."""
+    monkeypatch.setenv("HSR_SQLITE_JOURNAL_MODE", "DELETE")
+    from hsrws.db.database import dispose_engine, get_engine
+
+    dispose_engine()
+    return get_engine()
+
+
+def test_swap_load_replaces_file(sample_character_df, rollback_database, tmp_path):
+    """Test that a swap load keeps other tables and leaves no temp files."""
+    load_to_sqlite(sample_character_df)
+    with rollback_database.begin() as conn:
+        conn.execute(text("CREATE TABLE Other (x INTEGER)"))
+
+    reader = sqlite3.connect(rollback_database.url.database)
+    reader.execute("BEGIN")
+    before = reader.execute('SELECT count(*) FROM "HsrCharacters"').fetchone()[0]
+
+    counts = load_to_sqlite(sample_character_df.iloc[:1], mode="swap")
+
+    # The open reader still sees its snapshot, new connections see the new file.
+    assert (
+        reader.execute('SELECT count(*) FROM "HsrCharacters"').fetchone()[0] == before
+    )
+    reader.close()
+    assert counts["deleted"] == 1
+    with rollback_database.connect() as conn:
+        assert conn.execute(text('SELECT count(*) FROM "HsrCharacters"')).scalar() == 1
+        assert conn.execute(text("SELECT count(*) FROM Other")).scalar() == 0
+    names = {p.name for p in tmp_path.iterdir()}
+    assert names - {PARQUET_FILE_NAME, ARROW_FILE_NAME} == {"hsr.db"}
+
+
+def test_swap_load_creates_missing_database(sample_character_df, rollback_database):
+    """Test that a swap load works before the database file exists."""
+    assert load_to_sqlite(sample_character_df, mode="swap")["inserted"] == 2
+
+
+def test_failed_swap_load_disposes_snapshot(
+    sample_character_df, rollback_database, tmp_path, monkeypatch
+):
+    """Test that a failed swap load closes the snapshot and keeps the live file."""
+    load_to_sqlite(sample_character_df)
+    disposed = []
+
+    def create_snapshot_engine(*args, **kwargs):
+        engine = create_engine(*args, **kwargs)
+        dispose = engine.dispose
+        engine.dispose = lambda: disposed.append(dispose())
+        return engine
+
+    def fail(conn, rows, prune, run_id):
+        conn.execute(text("SELECT 1"))
+        raise RuntimeError("load failed")
+
+    monkeypatch.setattr(sqlite_module, "create_engine", create_snapshot_engine)
+    monkeypatch.setattr(sqlite_module, "write_load", fail)
+
+    with pytest.raises(RuntimeError):
+        load_to_sqlite(sample_character_df.iloc[:1], mode="swap")
+
+    assert len(disposed) == 1
+    assert count_characters(rollback_database) == 2
+    names = {p.name for p in tmp_path.iterdir()}
+    assert names - {PARQUET_FILE_NAME, ARROW_FILE_NAME} == {"hsr.db"}
+
+
+def count_characters(engine):
+    """Count the characters through a pooled connection."""
+    with engine.connect() as conn:
+        return conn.execute(text('SELECT count(*) FROM "HsrCharacters"')).scalar()
+
+
+def test_swap_load_reconnects_other_engines(sample_character_df, rollback_database):
+    """Test that engines of other processes read the new file after a swap."""
+    load_to_sqlite(sample_character_df)
+    other = create_engine(rollback_database.url)
+    install_sqlite_pragmas(other)
+    assert count_characters(other) == 2
+
+    load_to_sqlite(sample_character_df.iloc[:1], mode="swap")
+
+    assert count_characters(other) == 1
+    other.dispose()
+
+
+def test_swap_load_holds_write_lock(
+    sample_character_df, rollback_database, monkeypatch
+):
+    """Test that the live file cannot be written while it is being swapped."""
+    load_to_sqlite(sample_character_df)
+    write_load = sqlite_module.write_load
+    attempts = []
+
+    def write_during_swap(*args):
+        writer = sqlite3.connect(rollback_database.url.database, timeout=0)
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            writer.execute("BEGIN IMMEDIATE")
+        writer.close()
+        attempts.append(True)
+        return write_load(*args)
+
+    monkeypatch.setattr(sqlite_module, "write_load", write_during_swap)
+    load_to_sqlite(sample_character_df, mode="swap")
+
+    assert attempts == [True]
+
+
+def test_write_to_replaced_file_fails(sample_character_df, rollback_database, tmp_path):
+    """Test that a transaction writing to a replaced file is not committed."""
+    load_to_sqlite(sample_character_df)
+    database = rollback_database.url.database
+    shutil.copy(database, tmp_path / "copy.db")
+
+    with pytest.raises(DatabaseReplacedError):
+        with rollback_database.begin() as conn:
+            conn.execute(text('DELETE FROM "HsrCharacters"'))
+            shutil.move(tmp_path / "copy.db", database)
+
+    assert count_characters(rollback_database) == 2
+
+
+def test_swap_load_refuses_wal(sample_character_df, temp_database):
+    """Test that WAL databases cannot be swapped."""
+    load_to_sqlite(sample_character_df)
+
+    with pytest.raises(ValueError, match="WAL"):
+        load_to_sqlite(sample_character_df, mode="swap")
+
+
+def test_unknown_load_mode(sample_character_df, temp_database):
+    """Test that unknown load modes are rejected."""
+    with pytest.raises(ValueError, match="Unknown load mode"):
+        load_to_sqlite(sample_character_df, mode="truncate")
@@ -0,0 +1,80 @@
+"""Tests that the character statistics queries are served by covering indexes."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import sqlite
+
+from hsrws.db.models import HsrCharacter
+from hsrws.db.queries import build_aggregate_stmt, character_stats
+from hsrws.db.sqlite import load_to_sqlite
+
+# Statements whose ORDER BY follows an index, so they never sort.
+UNSORTED_STMTS = [
+    character_stats.get_latest_patch_stmt,
+    character_stats.get_element_path_heatmap_stmt,
+    character_stats.get_rarity_element_distribution_stmt,
+    character_stats.get_path_rarity_distribution_stmt,
+    character_stats.get_version_release_timeline_stmt,
+]
+
+# Statements ordered by an aggregate, which may sort the aggregated rows once.
+SORTED_STMTS = [
+    character_stats.get_path_distribution_stmt,
+    character_stats.get_element_distribution_stmt,
+    character_stats.get_rarity_distribution_stmt,
+    character_stats.get_version_element_evolution_stmt,
+    character_stats.get_version_path_evolution_stmt,
+]
+
+
+def query_plan(engine, stmt):
+    """Return the EXPLAIN QUERY PLAN details of a statement."""
+    sql = stmt.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        return [row[3] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+@pytest.fixture
+def loaded_database(sample_character_df, temp_database):
+    """Database holding the sample characters."""
+    load_to_sqlite(sample_character_df)
+    return temp_database
+
+
+def assert_covering_scan(plan):
+    """Assert that the character table is only read through covering indexes."""
+    table_steps = [step for step in plan if HsrCharacter.__tablename__ in step]
+    assert table_steps
+    assert all("USING COVERING INDEX" in step for step in table_steps), plan
+    assert not any("FOR GROUP BY" in step or "DISTINCT" in step for step in plan)
+
+
+@pytest.mark.parametrize("build_stmt", UNSORTED_STMTS)
+def test_query_without_sort(loaded_database, build_stmt):
+    """Test that index-ordered queries use no temporary B-tree."""
+    plan = query_plan(loaded_database, build_stmt())
+
+    assert_covering_scan(plan)
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+@pytest.mark.parametrize("build_stmt", SORTED_STMTS)
+def test_query_sorts_only_final_rows(loaded_database, build_stmt):
+    """Test that aggregate-ordered queries sort only their final output."""
+    plan = query_plan(loaded_database, build_stmt())
+
+    assert_covering_scan(plan)
+    sorts = [step for step in plan if "TEMP B-TREE" in step]
+    assert sorts == ["USE TEMP B-TREE FOR ORDER BY"]
+    assert plan[-1] == sorts[0]
+
+
+@pytest.mark.parametrize("dimension", ["Element", "Path"])
+@pytest.mark.parametrize("aggregate", ["sum", "avg"])
+def test_stat_aggregates_use_covering_index(loaded_database, dimension, aggregate):
+    """Test that stat aggregations read the stats from a covering index."""
+    stmt = build_aggregate_stmt((dimension,), aggregate=aggregate, stat="HP Lvl 80")
+    plan = query_plan(loaded_database, stmt)
+
+    assert_covering_scan(plan)
+    assert not any("TEMP B-TREE" in step for step in plan), plan
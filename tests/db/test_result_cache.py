@@ -0,0 +1,112 @@
+"""Tests for the generation-keyed query result cache."""
+
+import pandas as pd
+from sqlalchemy import event
+
+from hsrws.db.generation import get_data_generation
+from hsrws.db.queries import (
+    CharacterFilter,
+    filter_params,
+    get_element_distribution_stmt,
+)
+from hsrws.db.result_cache import QueryResultCache, estimate_size
+from hsrws.db.sqlite import load_to_sqlite
+from hsrws.visual.data_utils import fetch_data_orm
+
+
+def frame(rows):
+    """Build a DataFrame with the given number of rows."""
+    return pd.DataFrame({"value": range(rows)})
+
+
+def test_hit_returns_copy():
+    """Test that cached results are returned as independent copies."""
+    cache = QueryResultCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return frame(3)
+
+    first = cache.get_or_compute("key", 1, compute)
+    first["value"] = 0
+    second = cache.get_or_compute("key", 1, compute)
+
+    assert len(calls) == 1
+    assert second["value"].tolist() == [0, 1, 2]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_new_generation_drops_entries():
+    """Test that a newer data generation invalidates every entry."""
+    cache = QueryResultCache()
+    cache.get_or_compute("a", 1, lambda: frame(1))
+    cache.get_or_compute("b", 1, lambda: frame(1))
+
+    result = cache.get_or_compute("a", 2, lambda: frame(2))
+
+    assert len(result) == 2
+    assert len(cache) == 1
+
+
+def test_memory_cap_evicts_least_recently_used():
+    """Test that entries are evicted in LRU order once over the memory cap."""
+    cache = QueryResultCache(max_bytes=estimate_size(frame(100)) * 2)
+    cache.get_or_compute("a", 1, lambda: frame(100))
+    cache.get_or_compute("b", 1, lambda: frame(100))
+    cache.get_or_compute("a", 1, lambda: frame(100))
+
+    cache.get_or_compute("c", 1, lambda: frame(100))
+
+    assert len(cache) == 2
+    assert cache.size <= cache.max_bytes
+    misses = cache.misses
+    cache.get_or_compute("a", 1, lambda: frame(100))
+    assert cache.misses == misses
+
+
+def test_oversized_result_not_cached():
+    """Test that a result larger than the cap is returned but not cached."""
+    cache = QueryResultCache(max_bytes=10)
+
+    result = cache.get_or_compute("a", 1, lambda: frame(100))
+
+    assert len(result) == 100
+    assert len(cache) == 0
+
+
+def test_fetch_skips_query_until_next_load(sample_character_df, temp_database):
+    """Test that repeated fetches only run the query again after a load."""
+    load_to_sqlite(sample_character_df)
+    statements = []
+    event.listen(
+        temp_database,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    fetch_data_orm(get_element_distribution_stmt())
+    fetch_data_orm(get_element_distribution_stmt())
+    assert len([stmt for stmt in statements if "HsrCharacters" in stmt]) == 1
+
+    load_to_sqlite(sample_character_df.iloc[:1])
+    result = fetch_data_orm(get_element_distribution_stmt())
+
+    assert result["category"].tolist() == ["Test Element"]
+    with temp_database.connect() as conn:
+        assert get_data_generation(conn) == 2
+
+
+def test_fetch_caches_per_parameters(sample_character_df, temp_database):
+    """Test that one statement fetched with other parameters is not a hit."""
+    load_to_sqlite(sample_character_df)
+    filters = [CharacterFilter(path="Test Path"), CharacterFilter(path="Another Path")]
+    stmt = get_element_distribution_stmt(filters[0])
+
+    results = [fetch_data_orm(stmt, filter_params(path)) for path in filters]
+
+    assert get_element_distribution_stmt(filters[1]) is stmt
+    assert [result["category"].tolist() for result in results] == [
+        ["Test Element"],
+        ["Another Element"],
+    ]
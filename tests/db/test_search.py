@@ -0,0 +1,141 @@
+"""Tests for the FTS5 character search."""
+
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+import pytest
+from sqlalchemy import inspect
+
+from hsrws.db.database import dispose_engine, get_engine
+from hsrws.db.result_cache import query_cache
+from hsrws.db.search import (
+    SEARCH_TABLE_NAME,
+    build_match_query,
+    display_name,
+    search_characters,
+)
+from hsrws.db.sqlite import load_to_sqlite
+
+CHARACTERS = pd.DataFrame(
+    {
+        "Character": [
+            "dan-heng",
+            "dan-heng-imbibitor-lunae",
+            "himeko",
+            "march-7th",
+            "topaz-numby",
+        ],
+        "Path": ["Hunt", "Destruction", "Erudition", "Preservation", "Hunt"],
+        "Element": ["Wind", "Imaginary", "Fire", "Ice", "Fire"],
+    }
+)
+
+
+@pytest.fixture
+def characters_database(temp_database):
+    """Database holding characters indexed for search."""
+    load_to_sqlite(CHARACTERS)
+    return temp_database
+
+
+def search(engine, query, **kwargs):
+    """Search characters and return their keys."""
+    with engine.connect() as conn:
+        return [row["Character"] for row in search_characters(conn, query, **kwargs)]
+
+
+def test_display_name():
+    """Test that normalized keys are turned back into names."""
+    assert display_name("march-7th") == "March 7th"
+    assert display_name("dan-heng-imbibitor-lunae") == "Dan Heng Imbibitor Lunae"
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("dan heng", '"dan" "heng"*'),
+        ('"hime*" OR', '"hime" "OR"*'),
+        ("  -- ", None),
+    ],
+)
+def test_build_match_query(query, expected):
+    """Test that user input is quoted into a safe MATCH expression."""
+    assert build_match_query(query) == expected
+
+
+def test_prefix_search(characters_database):
+    """Test autocomplete on the beginning of a name."""
+    assert search(characters_database, "hime") == ["himeko"]
+    assert search(characters_database, "dan h") == [
+        "dan-heng",
+        "dan-heng-imbibitor-lunae",
+    ]
+    assert search(characters_database, "hime", prefix=False) == []
+
+
+def test_search_paths_and_elements(characters_database):
+    """Test matching paths and elements, with every word required."""
+    assert search(characters_database, "hunt") == ["dan-heng", "topaz-numby"]
+    assert search(characters_database, "fire hunt") == ["topaz-numby"]
+    assert search(characters_database, "march-7th") == ["march-7th"]
+
+
+def test_name_matches_rank_first(characters_database):
+    """Test that a name match ranks above a path or element match."""
+    load_to_sqlite(
+        pd.concat(
+            [
+                CHARACTERS,
+                pd.DataFrame(
+                    {"Character": ["fire-maiden"], "Path": ["Hunt"], "Element": ["Ice"]}
+                ),
+            ]
+        )
+    )
+
+    assert search(characters_database, "fire")[0] == "fire-maiden"
+    assert search(characters_database, "fire", limit=1) == ["fire-maiden"]
+
+
+def test_index_follows_loads(characters_database):
+    """Test that the loader keeps the index in sync with the table."""
+    load_to_sqlite(CHARACTERS.iloc[:1])
+
+    assert search(characters_database, "hime") == []
+    assert search(characters_database, "dan") == ["dan-heng"]
+
+
+def test_search_uses_fts_index(characters_database):
+    """Test that a search is answered by the FTS5 index."""
+    with characters_database.connect() as conn:
+        plan = conn.exec_driver_sql(
+            f'EXPLAIN QUERY PLAN SELECT "Character" FROM "{SEARCH_TABLE_NAME}" '
+            f"WHERE \"{SEARCH_TABLE_NAME}\" MATCH 'dan*'"
+        ).all()
+
+    assert any("VIRTUAL TABLE INDEX" in row[-1] for row in plan)
+
+
+def test_migration_indexes_existing_characters(monkeypatch, tmp_path):
+    """Test that upgrading a database indexes the characters it holds."""
+    path = tmp_path / "hsr.db"
+    with closing(sqlite3.connect(path)) as conn:
+        conn.execute(
+            'CREATE TABLE "HsrCharacters" ("Character" VARCHAR PRIMARY KEY, '
+            '"Path" VARCHAR, "Element" VARCHAR)'
+        )
+        conn.execute(
+            "INSERT INTO \"HsrCharacters\" VALUES ('himeko', 'Erudition', 'Fire')"
+        )
+        conn.commit()
+    monkeypatch.setenv("HSR_DATABASE_URL", f"sqlite:///{path}")
+    dispose_engine()
+    query_cache.clear()
+    try:
+        engine = get_engine()
+
+        assert SEARCH_TABLE_NAME in inspect(engine).get_table_names()
+        assert search(engine, "erud") == ["himeko"]
+    finally:
+        dispose_engine()
@@ -1,35 +1,42 @@
 """Tests for the SQLite database functions."""
 
-import pytest
-import sqlite3
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
 
-from hsrws.db.sqlite import load_to_sqlite
+from hsrws.db.sqlite import dataframe_to_rows, load_to_sqlite, upsert_characters
 
 
-def test_connection_error_handling(sample_character_df):
+def test_connection_error_handling(sample_character_df, tmp_path):
     """Test error handling when connection fails."""
-    with patch("sqlite3.connect") as mock_connect:
-        mock_connect.side_effect = sqlite3.OperationalError("Test error")
+    engine = create_engine(f"sqlite:///{tmp_path / 'missing' / 'hsr.db'}")
+
+    with pytest.raises(OperationalError):
+        # Attempt to connect and perform an operation
+        load_to_sqlite(sample_character_df, engine=engine)
+
+
+def test_dataframe_to_rows_uses_model_columns():
+    """Test that rows only contain model columns with Python scalars."""
+    df = pd.DataFrame(
+        {"Character": ["a"], "ATK Lvl 80": [100], "Extra": [1], "Version": [None]}
+    )
 
-        with pytest.raises(sqlite3.OperationalError):
-            # Attempt to connect and perform an operation
-            load_to_sqlite(sample_character_df)
+    rows = dataframe_to_rows(df)
 
+    assert rows == [{"Character": "a", "ATK Lvl 80": 100, "Version": None}]
+    assert type(rows[0]["ATK Lvl 80"]) is int
 
-def test_load_to_sqlite(sample_character_df):
-    """Test loading dataframe to SQLite database."""
-    with patch("sqlite3.connect") as mock_connect:
-        mock_conn = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
 
-        # Mock the to_sql method on the DataFrame class, not the instance
-        with patch("pandas.DataFrame.to_sql") as mock_to_sql:
-            # Call the function
-            load_to_sqlite(sample_character_df)
+def test_upsert_executemany_in_batches(sample_character_df, temp_database):
+    """Test that changed rows are sent in batches of executemany calls."""
+    rows = dataframe_to_rows(sample_character_df)
+    with temp_database.begin() as conn:
+        load_to_sqlite(sample_character_df.iloc[:0])  # create the table
+        with patch("hsrws.db.sqlite.BATCH_SIZE", 1):
+            counts = upsert_characters(conn, rows)
 
-            # Verify that to_sql was called with the correct arguments
-            mock_to_sql.assert_called_once_with(
-                "HsrCharacters", mock_conn, if_exists="replace"
-            )
+    assert counts["inserted"] == 2
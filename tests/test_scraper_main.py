@@ -27,9 +27,13 @@ def test_scrape_route_success(client):
             "Element": ["Wind"],
         }
     )
+    mock_df.attrs["run_id"] = "run-1"
 
-    with patch("main.scrape_data", return_value=mock_df) as mock_scrape_data:
-        with patch("main.load_to_sqlite") as mock_load_sqlite:
+    with patch("main.scrape_data_async", return_value=mock_df) as mock_scrape_data:
+        load_counts = {"inserted": 1, "updated": 0, "unchanged": 0, "deleted": 0}
+        with patch(
+            "main.load_to_sqlite_async", return_value=load_counts
+        ) as mock_load_sqlite:
             response = client.get("/scrape")
 
             # Assert response is successful
@@ -37,15 +41,16 @@ def test_scrape_route_success(client):
             json_data = response.get_json()
             assert json_data["status"] == "success"
             assert "data_shape" in json_data
+            assert json_data["load"] == load_counts
 
             # Verify function calls
-            mock_scrape_data.assert_called_once()
-            mock_load_sqlite.assert_called_once_with(mock_df)
+            mock_scrape_data.assert_awaited_once()
+            mock_load_sqlite.assert_awaited_once_with(mock_df, run_id="run-1")
 
 
 def test_scrape_route_error(client):
     """Test the /scrape API endpoint with error handling."""
-    with patch("main.scrape_data", side_effect=Exception("API Scraping error")):
+    with patch("main.scrape_data_async", side_effect=Exception("API Scraping error")):
         response = client.get("/scrape")
 
         # Assert response indicates error
@@ -82,5 +87,197 @@ def test_visualize_route_error(client):
         assert "An internal error has occurred." in json_data["message"]
 
 
+def test_diff_route(client):
+    """Test the /diff API endpoint returning the diff of two runs."""
+    with patch("main.diff_snapshots") as mock_diff:
+        mock_diff.return_value.to_dict.return_value = {"old_run": 1, "new_run": 2}
+        response = client.get("/diff?old=1&new=run-2")
+
+        assert response.status_code == 200
+        assert response.get_json() == {
+            "status": "success",
+            "diff": {"old_run": 1, "new_run": 2},
+        }
+        mock_diff.assert_called_once_with(1, "run-2")
+
+
+def test_diff_route_unknown_run(client):
+    """Test the /diff API endpoint with a run that was not recorded."""
+    with patch("main.diff_snapshots", side_effect=ValueError("No recorded run")):
+        response = client.get("/diff?old=42")
+
+        assert response.status_code == 404
+        assert response.get_json()["status"] == "error"
+
+
+@pytest.mark.parametrize("query", ["old=nan", "old=1&new=inf", "new="])
+def test_diff_route_invalid_reference(client, query):
+    """Test the /diff API endpoint with a malformed run reference."""
+    with patch("main.diff_snapshots") as mock_diff:
+        response = client.get(f"/diff?{query}")
+
+        assert response.status_code == 400
+        assert response.get_json()["status"] == "error"
+        mock_diff.assert_not_called()
+
+
+def test_search_route(client, temp_database):
+    """Test the /search API endpoint with a name prefix."""
+    from hsrws.db.sqlite import load_to_sqlite
+
+    load_to_sqlite(
+        pd.DataFrame(
+            {
+                "Character": ["dan-heng", "dan-heng-imbibitor-lunae", "himeko"],
+                "Path": ["Hunt", "Destruction", "Erudition"],
+                "Element": ["Wind", "Imaginary", "Fire"],
+            }
+        )
+    )
+
+    response = client.get("/search?q=dan%20he&limit=1")
+
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "status": "success",
+        "results": [
+            {
+                "Character": "dan-heng",
+                "Name": "Dan Heng",
+                "Path": "Hunt",
+                "Element": "Wind",
+            }
+        ],
+    }
+
+
+def test_search_route_missing_query(client):
+    """Test the /search API endpoint without a query."""
+    response = client.get("/search?q=%20")
+
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "error"
+
+
+def test_search_route_unsupported_database(client, temp_database):
+    """Test the /search API endpoint on a database without FTS5."""
+    message = "Character search requires SQLite FTS5, not postgresql"
+    with patch("main.search_characters", side_effect=ValueError(message)):
+        response = client.get("/search?q=seele")
+
+        assert response.status_code == 501
+        assert response.get_json() == {"status": "error", "message": message}
+
+
+def test_stats_routes(client, temp_database):
+    """Test the /stats and /stats/crosstab API endpoints with filters."""
+    from hsrws.db.sqlite import load_to_sqlite
+
+    load_to_sqlite(
+        pd.DataFrame(
+            {
+                "Character": ["himeko", "asta", "seele", "kafka"],
+                "Path": ["Erudition", "Harmony", "Hunt", None],
+                "Element": ["Fire", "Fire", "Quantum", "Lightning"],
+                "Rarity": [5, 4, 5, 5],
+                "Version": [1.0, 1.0, 1.0, 1.2],
+            }
+        )
+    )
+
+    stats = client.get("/stats?dimensions=Element,Rarity&max_version=1.0")
+    crosstab = client.get("/stats/crosstab?index=Rarity&columns=Path")
+
+    assert stats.get_json()["results"] == [
+        {"Element": "Fire", "Rarity": 4, "count": 1},
+        {"Element": "Fire", "Rarity": 5, "count": 1},
+        {"Element": "Quantum", "Rarity": 5, "count": 1},
+    ]
+    assert crosstab.get_json() == {
+        "status": "success",
+        "index": [4, 5],
+        "columns": [None, "Erudition", "Harmony", "Hunt"],
+        "counts": [[0, 0, 1, 0], [1, 1, 0, 1]],
+    }
+
+
+def test_stats_route_invalid_dimension(client, temp_database):
+    """Test the /stats API endpoint with an unknown dimension."""
+    response = client.get("/stats?dimensions=Name")
+
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "error"
+
+
+def test_characters_route(client, temp_database):
+    """Test the /characters API endpoint with several values per dimension."""
+    from hsrws.db.sqlite import load_to_sqlite
+
+    load_to_sqlite(
+        pd.DataFrame(
+            {
+                "Character": ["herta", "acheron", "himeko", "jiaoqiu"],
+                "Path": ["Erudition", "Nihility", "Erudition", "Nihility"],
+                "Element": ["Ice", "Lightning", "Fire", "Fire"],
+                "Rarity": [5, 5, 5, 5],
+                "Version": [2.5, 2.1, 1.0, 2.4],
+            }
+        )
+    )
+
+    query = "path=Erudition,Nihility&element=Ice,Fire&rarity=5&min_version=2.0"
+    response = client.get(f"/characters?{query}")
+    count = client.get(f"/characters?{query}&count_only=true")
+
+    assert response.get_json() == {
+        "status": "success",
+        "count": 2,
+        "characters": [
+            {
+                "Character": "herta",
+                "Path": "Erudition",
+                "Element": "Ice",
+                "Rarity": 5,
+                "Version": 2.5,
+            },
+            {
+                "Character": "jiaoqiu",
+                "Path": "Nihility",
+                "Element": "Fire",
+                "Rarity": 5,
+                "Version": 2.4,
+            },
+        ],
+    }
+    assert count.get_json() == {"status": "success", "count": 2}
+
+
+def test_characters_route_invalid_rarity(client):
+    """Test the /characters API endpoint with a rarity that is not a number."""
+    response = client.get("/characters?rarity=five")
+
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "error"
+
+
+@pytest.mark.parametrize("version", ["nan", "inf", "-Infinity"])
+def test_characters_route_non_finite_version(client, version):
+    """Test the /characters API endpoint with a version that is not finite."""
+    response = client.get(f"/characters?min_version={version}")
+
+    assert response.status_code == 400
+    assert "min_version" in response.get_json()["message"]
+
+
+@pytest.mark.parametrize("route", ["/stats?dimensions=Element", "/stats/crosstab"])
+def test_stats_routes_non_finite_version(client, route):
+    """Test the /stats and /stats/crosstab API endpoints with a NaN version."""
+    separator = "&" if "?" in route else "?"
+    response = client.get(f"{route}{separator}max_version=nan")
+
+    assert response.status_code == 400
+    assert "max_version" in response.get_json()["message"]
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -1,8 +1,10 @@
 """Tests for chart creation functionality."""
 
+import pandas as pd
 import pytest
 from unittest.mock import patch, MagicMock
 
+from hsrws.db.chart_aggregates import ChartDatasets
 from hsrws.visual.charts import create_advanced_charts, save_figure
 
 
@@ -25,58 +27,33 @@ def mock_sns():
 
 @pytest.fixture
 def mock_data_utils():
-    """Mock all data_utils functions."""
-    with (
-        patch("hsrws.visual.charts.get_latest_patch") as mock_latest_patch,
-        patch("hsrws.visual.charts.get_element_path_heatmap_data") as mock_heatmap_data,
-        patch(
-            "hsrws.visual.charts.get_rarity_element_distribution_data"
-        ) as mock_rarity_data,
-        patch(
-            "hsrws.visual.charts.get_version_release_timeline_data"
-        ) as mock_timeline_data,
-        patch(
-            "hsrws.visual.charts.get_element_balance_evolution_data"
-        ) as mock_evolution_data,
-        patch(
-            "hsrws.visual.charts.get_path_rarity_distribution_data"
-        ) as mock_path_data,
-        patch(
-            "hsrws.visual.charts.get_path_balance_evolution_data"
-        ) as mock_path_evolution_data,
-    ):
-        # Configure mock returns
-        import pandas as pd
-
-        mock_latest_patch.return_value = "Patch (1.6)"
-        mock_heatmap_data.return_value = pd.DataFrame(
-            {"Element": ["Fire"], "Destruction": [2], "Hunt": [1]}
-        )
-        mock_rarity_data.return_value = pd.DataFrame(
-            {"Rarity": [5], "Element": ["Fire"], "Count": [2]}
-        )
-        mock_timeline_data.return_value = pd.DataFrame(
-            {"Version": ["1.0"], "New_Characters": [5], "Cumulative_Total": [5]}
-        )
-        mock_evolution_data.return_value = pd.DataFrame(
-            {"Version": ["1.0"], "Fire": [1], "Ice": [1]}
-        )
-        mock_path_data.return_value = pd.DataFrame(
-            {"Path": ["Hunt"], "5-star": [2], "4-star": [1]}
-        )
-        mock_path_evolution_data.return_value = pd.DataFrame(
-            {"Version": ["1.0"], "Path": ["Hunt"], "count": [2]}
+    """Mock the chart dataset bundle."""
+    with patch("hsrws.visual.charts.get_chart_datasets") as mock_chart_datasets:
+        mock_chart_datasets.return_value = ChartDatasets(
+            latest_version=1.6,
+            path_distribution=pd.DataFrame({"category": ["Hunt"], "count": [2]}),
+            element_distribution=pd.DataFrame({"category": ["Fire"], "count": [2]}),
+            rarity_distribution=pd.DataFrame({"category": ["5"], "count": [2]}),
+            element_path_heatmap=pd.DataFrame(
+                {"Element": ["Fire"], "Path": ["Hunt"], "count": [2]}
+            ),
+            rarity_element_distribution=pd.DataFrame(
+                {"Rarity": ["5"], "Element": ["Fire"], "count": [2]}
+            ),
+            version_release_timeline=pd.DataFrame(
+                {"Version": [1.0], "character_count": [5]}
+            ),
+            element_balance_evolution=pd.DataFrame(
+                {"Version": [1.0], "Element": ["Fire"], "count": [1]}
+            ),
+            path_rarity_distribution=pd.DataFrame(
+                {"Path": ["Hunt"], "Rarity": ["5"], "count": [2]}
+            ),
+            path_balance_evolution=pd.DataFrame(
+                {"Version": [1.0], "Path": ["Hunt"], "count": [2]}
+            ),
         )
-
-        yield {
-            "latest_patch": mock_latest_patch,
-            "heatmap_data": mock_heatmap_data,
-            "rarity_data": mock_rarity_data,
-            "timeline_data": mock_timeline_data,
-            "evolution_data": mock_evolution_data,
-            "path_data": mock_path_data,
-            "path_evolution_data": mock_path_evolution_data,
-        }
+        yield {"chart_datasets": mock_chart_datasets}
 
 
 @pytest.fixture
@@ -158,9 +135,8 @@ def test_create_advanced_charts(mock_plt, mock_sns, mock_data_utils, mock_plotti
         # Execute
         create_advanced_charts()
 
-        # Verify all data functions were called
-        for mock_func in mock_data_utils.values():
-            assert mock_func.called
+        # Verify the datasets were read once for all charts
+        mock_data_utils["chart_datasets"].assert_called_once_with()
 
         # Verify all plotting functions were called
         for mock_plot in mock_plotting.values():
@@ -168,3 +144,7 @@ def test_create_advanced_charts(mock_plt, mock_sns, mock_data_utils, mock_plotti
 
         # Verify figures were saved
         assert mock_save_figure.call_count == 6
+        title_patches = {
+            call.args[1] for call in mock_plotting["heatmap_plot"].mock_calls
+        }
+        assert title_patches == {"Patch (1.6)"}
@@ -4,6 +4,8 @@ import pandas as pd
 import pytest
 from unittest.mock import patch, MagicMock, PropertyMock
 
+from hsrws.db.queries import get_element_distribution_stmt
+from hsrws.db.sqlite import load_to_sqlite
 from hsrws.visual.data_utils import (
     fetch_data_orm,
     get_latest_patch,
@@ -21,7 +23,7 @@ from hsrws.visual.data_utils import (
 @pytest.fixture
 def mock_session():
     """Create a mock database session."""
-    with patch("hsrws.visual.data_utils.get_session") as mock_get_session:
+    with patch("hsrws.visual.data_utils.get_query_session") as mock_get_session:
         mock_session = MagicMock()
         mock_execute = MagicMock()
         mock_session.execute.return_value = mock_execute
@@ -44,31 +46,15 @@ def mock_execute_result():
 
 
 @pytest.mark.visual
-def test_fetch_data_orm(mock_session):
+def test_fetch_data_orm(sample_character_df, temp_database):
     """Test fetch_data_orm function."""
-    # Setup
-    mock_result = MagicMock()
-    mock_result.all.return_value = [("Fire", 5), ("Ice", 3)]
-    mock_session.execute.return_value = mock_result
+    load_to_sqlite(sample_character_df)
 
-    # Create a mock stmt with column names
-    mock_stmt = MagicMock()
-    # Fix this part - return actual column names instead of using keys()
-    mock_columns = MagicMock()
-    type(mock_columns).keys = MagicMock(return_value=["element", "count"])
-    type(mock_stmt).columns = mock_columns
-
-    # Execute
-    with patch(
-        "pandas.DataFrame",
-        return_value=pd.DataFrame(
-            [("Fire", 5), ("Ice", 3)], columns=["element", "count"]
-        ),
-    ):
-        result = fetch_data_orm(mock_stmt)
+    result = fetch_data_orm(get_element_distribution_stmt())
 
     assert isinstance(result, pd.DataFrame)
-    assert list(result.columns) == ["element", "count"]
+    assert list(result.columns) == ["category", "count"]
+    assert sorted(result["category"]) == ["Another Element", "Test Element"]
 
 
 @pytest.mark.visual